@@ -25,23 +25,62 @@ Provides comprehensive action tools for equipment and asset management including
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Union, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import asyncio
-import json
+import bisect
+import itertools
+import time
 
-from src.api.services.llm.nim_client import get_nim_client
-from src.retrieval.structured.inventory_queries import InventoryItem
-from src.retrieval.structured.sql_retriever import SQLRetriever
-from src.api.services.wms.integration_service import get_wms_service
-from src.api.services.erp.integration_service import get_erp_service
-from src.api.services.scanning.integration_service import get_scanning_service
+from src.retrieval.structured.sql_retriever import get_sql_retriever
+from src.api.services.cache.ttl_cache import TTLCache
+from src.api.utils.json_utils import json_dumps
 
 logger = logging.getLogger(__name__)
 
+# Default windows (timedelta is immutable, so module-level instances are shared)
+_DEFAULT_RESERVATION_HOLD = timedelta(days=7)
+_DEFAULT_PURCHASE_LEAD_TIME = timedelta(days=14)
+_CYCLE_COUNT_DUE_WINDOW = timedelta(days=7)
+_RECENT_ACTIVITY_WINDOW = timedelta(days=7)
 
-@dataclass
+# Reslotting: picks/day above each threshold moves a SKU one zone closer to shipping
+_VELOCITY_THRESHOLDS = (50, 100)
+_SLOTTING_ZONES = ("C", "B", "A")  # Low, medium, high velocity
+_SLOTTING_AISLES = ("03", "02", "01")
+_ZONE_TRAVEL_TIME_SECONDS = {"A": 120, "B": 180, "C": 240}
+_DEFAULT_TRAVEL_TIME_SECONDS = 240
+
+# Process-wide sequence that keeps locally generated IDs unique within a second
+_fallback_id_counter = itertools.count()
+
+
+def _fallback_id(prefix: str) -> str:
+    """Build a process-unique ID for records created without a backend ID."""
+    return f"{prefix}_{time.time_ns():x}_{next(_fallback_id_counter):04x}"
+
+
+def serialize_result(result: Any) -> str:
+    """Serialize an action result dataclass to JSON without an asdict() copy."""
+    return json_dumps(result)
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Normalize a WMS timestamp (datetime or ISO string) to a naive local datetime."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+@dataclass(slots=True, frozen=True)
 class StockInfo:
     """Stock information for a SKU."""
 
@@ -56,7 +95,7 @@ class StockInfo:
     safety_stock: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReservationResult:
     """Result of inventory reservation."""
 
@@ -68,7 +107,7 @@ class ReservationResult:
     message: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReplenishmentTask:
     """Replenishment task details."""
 
@@ -83,7 +122,7 @@ class ReplenishmentTask:
     assigned_to: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PurchaseRequisition:
     """Purchase requisition details."""
 
@@ -99,7 +138,7 @@ class PurchaseRequisition:
     total_cost: Optional[float]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CycleCountTask:
     """Cycle count task details."""
 
@@ -114,7 +153,7 @@ class CycleCountTask:
     due_date: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DiscrepancyInvestigation:
     """Discrepancy investigation details."""
 
@@ -129,6 +168,9 @@ class DiscrepancyInvestigation:
     assigned_to: Optional[str]
     findings: List[str]
     resolution: Optional[str]
+    transaction_count: int = 0  # Transactions in the 30-day history window
+    recent_pick_count: int = 0  # Picks in the recent activity window
+    recent_move_count: int = 0  # Moves in the recent activity window
 
 
 class EquipmentActionTools:
@@ -145,26 +187,66 @@ class EquipmentActionTools:
     - Discrepancy investigation
     """
 
+    # Fixed statement shapes so asyncpg reuses the prepared statements
+    _STOCK_QUERY = """
+        SELECT sku, name, quantity, location, reorder_point, updated_at
+        FROM inventory_items
+        WHERE sku = ANY($1::text[])
+        """
+    _STOCK_AT_LOCATION_QUERY = """
+        SELECT sku, name, quantity, location, reorder_point, updated_at
+        FROM inventory_items
+        WHERE sku = ANY($1::text[]) AND location LIKE $2
+        """
+    _STOCK_BY_LOCATION_QUERY = """
+        SELECT sku, name, quantity, location, reorder_point, updated_at
+        FROM inventory_items
+        WHERE sku = ANY($1::text[]) AND location LIKE ANY($2::text[])
+        """
+
     def __init__(self):
         self.nim_client = None
         self.sql_retriever = None
         self.wms_service = None
         self.erp_service = None
         self.scanning_service = None
+        # Short-lived caches so repeated lookups within one agent turn are free
+        self._stock_cache = TTLCache(ttl_seconds=2.0, max_entries=1024)
+        self._item_details_cache = TTLCache(ttl_seconds=60.0, max_entries=1024)
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self) -> None:
-        """Initialize action tools with required services."""
-        try:
-            self.nim_client = await get_nim_client()
-            self.sql_retriever = SQLRetriever()
-            await self.sql_retriever.initialize()
-            self.wms_service = await get_wms_service()
-            self.erp_service = await get_erp_service()
-            self.scanning_service = await get_scanning_service()
-            logger.info("Inventory Action Tools initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Inventory Action Tools: {e}")
-            raise
+        """Initialize action tools with required services (idempotent)."""
+        async with self._init_lock:
+            if self._initialized:
+                return
+            try:
+                # Deferred so importing this module doesn't load the LLM and
+                # integration clients until the tools are actually used
+                from src.api.services.llm.nim_client import get_nim_client
+                from src.api.services.wms.integration_service import get_wms_service
+                from src.api.services.erp.integration_service import get_erp_service
+                from src.api.services.scanning.integration_service import (
+                    get_scanning_service,
+                )
+
+                self.nim_client = await get_nim_client()
+                # Share the process-wide connection pool instead of opening our own
+                self.sql_retriever = await get_sql_retriever()
+                self.wms_service = await get_wms_service()
+                self.erp_service = await get_erp_service()
+                self.scanning_service = await get_scanning_service()
+                self._initialized = True
+                logger.info("Inventory Action Tools initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize Inventory Action Tools: {e}")
+                raise
+
+    async def _ensure_initialized(self) -> None:
+        """Initialize on first use; concurrent first calls share one initialization."""
+        if not self._initialized:
+            await self.initialize()
 
     async def check_stock(
         self,
@@ -175,6 +257,10 @@ class EquipmentActionTools:
         """
         Check stock levels for a SKU with ATP calculation.
 
+        Results are cached briefly so repeated checks within one agent turn
+        share a single database round-trip. Successful reservations drop the
+        SKU's cached entries.
+
         Args:
             sku: SKU to check
             site: Optional site filter
@@ -184,71 +270,129 @@ class EquipmentActionTools:
             StockInfo with on_hand, ATP, and location details
         """
         try:
-            if not self.sql_retriever:
-                await self.initialize()
+            await self._ensure_initialized()
 
-            # Get stock data directly from database
-            query = """
-            SELECT sku, name, quantity, location, reorder_point, updated_at
-            FROM inventory_items 
-            WHERE sku = $1
-            """
-            params = [sku]
+            cache_key = (sku, site, tuple(locations or ()))
+            return await self._stock_cache.get_or_load(
+                cache_key, lambda: self._fetch_single_stock(sku, locations)
+            )
 
-            if locations:
-                location_conditions = []
-                for i, loc in enumerate(locations, start=2):
-                    location_conditions.append(f"location LIKE ${i}")
-                    params.append(f"%{loc}%")
-                query += f" AND ({' OR '.join(location_conditions)})"
+        except Exception as e:
+            logger.error(f"Failed to check stock for SKU {sku}: {e}")
+            return self._empty_stock_info(sku)
 
-            results = await self.sql_retriever.fetch_all(query, *params)
+    async def check_stock_many(
+        self,
+        skus: List[str],
+        site: Optional[str] = None,
+        locations: Optional[List[str]] = None,
+    ) -> Dict[str, StockInfo]:
+        """
+        Check stock levels for several SKUs with a single database round-trip.
 
-            if not results:
-                return StockInfo(
-                    sku=sku,
-                    on_hand=0,
-                    available_to_promise=0,
-                    locations=[],
-                    last_updated=datetime.now(),
-                    reorder_point=0,
-                    safety_stock=0,
-                )
+        Args:
+            skus: SKUs to check
+            site: Optional site filter
+            locations: Optional location filter
+
+        Returns:
+            Dict mapping each requested SKU to its StockInfo. SKUs with no
+            matching rows map to an empty StockInfo.
+        """
+        try:
+            await self._ensure_initialized()
+
+            stock = await self._query_stock(skus, locations)
+
+            location_key = tuple(locations or ())
+            for sku, stock_info in stock.items():
+                self._stock_cache.set((sku, site, location_key), stock_info)
+
+            return stock
+
+        except Exception as e:
+            logger.error(f"Failed to check stock for SKUs {skus}: {e}")
+            return {sku: self._empty_stock_info(sku) for sku in skus}
+
+    async def _fetch_single_stock(
+        self, sku: str, locations: Optional[List[str]]
+    ) -> StockInfo:
+        """Query stock for one SKU, raising on database errors."""
+        stock = await self._query_stock([sku], locations)
+        return stock[sku]
+
+    async def _query_stock(
+        self, skus: List[str], locations: Optional[List[str]]
+    ) -> Dict[str, StockInfo]:
+        """Query stock for the given SKUs, raising on database errors."""
+        # Get stock data directly from database
+        if not locations:
+            results = await self.sql_retriever.fetch_all(
+                self._STOCK_QUERY, list(skus)
+            )
+        elif len(locations) == 1:
+            results = await self.sql_retriever.fetch_all(
+                self._STOCK_AT_LOCATION_QUERY, list(skus), f"%{locations[0]}%"
+            )
+        else:
+            location_patterns = [f"%{loc}%" for loc in locations]
+            results = await self.sql_retriever.fetch_all(
+                self._STOCK_BY_LOCATION_QUERY, list(skus), location_patterns
+            )
+
+        rows_by_sku: Dict[str, Dict[str, Any]] = {}
+        for row in results:
+            rows_by_sku.setdefault(row["sku"], row)
+
+        # One timestamp for every miss/NULL in this batch rather than one per row
+        fetched_at = datetime.now()
+        stock: Dict[str, StockInfo] = {}
+        for sku in skus:
+            item = rows_by_sku.get(sku)
+            if item is None:
+                stock[sku] = self._empty_stock_info(sku, fetched_at)
+                continue
+
+            # Every column is selected explicitly, so index the row directly
+            on_hand = item["quantity"]
+            location = item["location"]
+            reorder_point = item["reorder_point"]
+            updated_at = item["updated_at"]
 
             # Calculate ATP (Available to Promise)
             # For now, we'll use the basic quantity as ATP (simplified)
             # In a real system, this would consider reservations, incoming orders, etc.
-            item = results[0]
-            on_hand = item.get("quantity", 0)
             reserved = 0  # Would come from reservations table in real implementation
             atp = max(0, on_hand - reserved)
 
-            reorder_point = item.get("reorder_point", 0)
-            safety_stock = (
-                0  # Would come from item configuration in real implementation
-            )
+            safety_stock = 0  # Would come from item configuration in real implementation
 
-            return StockInfo(
+            stock[sku] = StockInfo(
                 sku=sku,
                 on_hand=on_hand,
                 available_to_promise=atp,
-                locations=[{"location": item.get("location", ""), "quantity": on_hand}],
-                last_updated=item.get("updated_at", datetime.now()),
-                reorder_point=reorder_point,
+                locations=[{"location": location or "", "quantity": on_hand}],
+                last_updated=updated_at or fetched_at,
+                reorder_point=reorder_point or 0,
                 safety_stock=safety_stock,
             )
 
-        except Exception as e:
-            logger.error(f"Failed to check stock for SKU {sku}: {e}")
-            return StockInfo(
-                sku=sku,
-                on_hand=0,
-                available_to_promise=0,
-                locations=[],
-                last_updated=datetime.now(),
-                reorder_point=0,
-                safety_stock=0,
-            )
+        return stock
+
+    @staticmethod
+    def _empty_stock_info(
+        sku: str, last_updated: Optional[datetime] = None
+    ) -> StockInfo:
+        """Build the StockInfo returned for SKUs with no stock records."""
+        return StockInfo(
+            sku=sku,
+            on_hand=0,
+            available_to_promise=0,
+            locations=[],
+            last_updated=last_updated or datetime.now(),
+            reorder_point=0,
+            safety_stock=0,
+        )
 
     async def reserve_inventory(
         self, sku: str, qty: int, order_id: str, hold_until: Optional[datetime] = None
@@ -265,36 +409,53 @@ class EquipmentActionTools:
         Returns:
             ReservationResult with success status and details
         """
+        effective_hold = (
+            hold_until if hold_until is not None else datetime.now() + _DEFAULT_RESERVATION_HOLD
+        )
         try:
-            if not self.wms_service:
-                await self.initialize()
+            await self._ensure_initialized()
 
-            # Check if sufficient stock is available
-            stock_info = await self.check_stock(sku)
-            if stock_info.available_to_promise < qty:
-                return ReservationResult(
-                    success=False,
-                    reservation_id=None,
-                    reserved_quantity=0,
-                    hold_until=hold_until or datetime.now() + timedelta(days=7),
+            reserve_if_available = getattr(
+                self.wms_service, "reserve_if_available", None
+            )
+            if reserve_if_available is not None:
+                # WMS checks availability and reserves in a single round-trip
+                reservation_data = await reserve_if_available(
+                    sku=sku,
+                    quantity=qty,
                     order_id=order_id,
-                    message=f"Insufficient stock. Available: {stock_info.available_to_promise}, Requested: {qty}",
+                    hold_until=effective_hold,
+                )
+            else:
+                # Check if sufficient stock is available. Read uncached: a
+                # reservation made moments ago must count against this one.
+                stock_info = await self._fetch_single_stock(sku, None)
+                if stock_info.available_to_promise < qty:
+                    return ReservationResult(
+                        success=False,
+                        reservation_id=None,
+                        reserved_quantity=0,
+                        hold_until=effective_hold,
+                        order_id=order_id,
+                        message=f"Insufficient stock. Available: {stock_info.available_to_promise}, Requested: {qty}",
+                    )
+
+                # Create reservation in WMS
+                reservation_data = await self.wms_service.create_reservation(
+                    sku=sku,
+                    quantity=qty,
+                    order_id=order_id,
+                    hold_until=effective_hold,
                 )
-
-            # Create reservation in WMS
-            reservation_data = await self.wms_service.create_reservation(
-                sku=sku,
-                quantity=qty,
-                order_id=order_id,
-                hold_until=hold_until or datetime.now() + timedelta(days=7),
-            )
 
             if reservation_data and reservation_data.get("success"):
+                # Cached stock for this SKU no longer reflects what is available
+                self._stock_cache.invalidate_where(lambda key: key[0] == sku)
                 return ReservationResult(
                     success=True,
                     reservation_id=reservation_data.get("reservation_id"),
                     reserved_quantity=qty,
-                    hold_until=hold_until or datetime.now() + timedelta(days=7),
+                    hold_until=effective_hold,
                     order_id=order_id,
                     message=f"Successfully reserved {qty} units of {sku} for order {order_id}",
                 )
@@ -303,7 +464,7 @@ class EquipmentActionTools:
                     success=False,
                     reservation_id=None,
                     reserved_quantity=0,
-                    hold_until=hold_until or datetime.now() + timedelta(days=7),
+                    hold_until=effective_hold,
                     order_id=order_id,
                     message=f"Failed to create reservation: {reservation_data.get('error', 'Unknown error')}",
                 )
@@ -314,7 +475,7 @@ class EquipmentActionTools:
                 success=False,
                 reservation_id=None,
                 reserved_quantity=0,
-                hold_until=hold_until or datetime.now() + timedelta(days=7),
+                hold_until=effective_hold,
                 order_id=order_id,
                 message=f"Reservation failed: {str(e)}",
             )
@@ -340,9 +501,9 @@ class EquipmentActionTools:
         Returns:
             ReplenishmentTask with task details
         """
+        now = datetime.now()
         try:
-            if not self.wms_service:
-                await self.initialize()
+            await self._ensure_initialized()
 
             # Create replenishment task in WMS
             task_data = await self.wms_service.create_replenishment_task(
@@ -362,40 +523,42 @@ class EquipmentActionTools:
                     quantity=qty,
                     priority=priority,
                     status="pending",
-                    created_at=datetime.now(),
+                    created_at=now,
                     assigned_to=task_data.get("assigned_to"),
                 )
             else:
-                # Create fallback task
-                task_id = f"REPL_{sku}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                return ReplenishmentTask(
-                    task_id=task_id,
-                    sku=sku,
-                    from_location=from_location,
-                    to_location=to_location,
-                    quantity=qty,
-                    priority=priority,
-                    status="pending",
-                    created_at=datetime.now(),
-                    assigned_to=None,
+                return self._build_fallback_replenishment(
+                    sku, from_location, to_location, qty, priority, now
                 )
 
         except Exception as e:
             logger.error(f"Failed to create replenishment task for SKU {sku}: {e}")
-            # Create fallback task
-            task_id = f"REPL_{sku}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            return ReplenishmentTask(
-                task_id=task_id,
-                sku=sku,
-                from_location=from_location,
-                to_location=to_location,
-                quantity=qty,
-                priority=priority,
-                status="pending",
-                created_at=datetime.now(),
-                assigned_to=None,
+            return self._build_fallback_replenishment(
+                sku, from_location, to_location, qty, priority, now
             )
 
+    @staticmethod
+    def _build_fallback_replenishment(
+        sku: str,
+        from_location: str,
+        to_location: str,
+        qty: int,
+        priority: str,
+        now: datetime,
+    ) -> ReplenishmentTask:
+        """Build a locally tracked replenishment task when WMS creation fails."""
+        return ReplenishmentTask(
+            task_id=_fallback_id(f"REPL_{sku}"),
+            sku=sku,
+            from_location=from_location,
+            to_location=to_location,
+            quantity=qty,
+            priority=priority,
+            status="pending",
+            created_at=now,
+            assigned_to=None,
+        )
+
     async def generate_purchase_requisition(
         self,
         sku: str,
@@ -421,12 +584,17 @@ class EquipmentActionTools:
         Returns:
             PurchaseRequisition with PR details
         """
+        now = datetime.now()
+        effective_need_by = (
+            need_by_date if need_by_date is not None else now + _DEFAULT_PURCHASE_LEAD_TIME
+        )
         try:
-            if not self.erp_service:
-                await self.initialize()
+            await self._ensure_initialized()
 
             # Get item cost and supplier info
-            item_info = await self.erp_service.get_item_details(sku)
+            item_info = await self._item_details_cache.get_or_load(
+                sku, lambda: self.erp_service.get_item_details(sku)
+            )
             cost_per_unit = item_info.get("cost", 0.0) if item_info else 0.0
             total_cost = cost_per_unit * qty
 
@@ -439,7 +607,7 @@ class EquipmentActionTools:
                 quantity=qty,
                 supplier=supplier,
                 contract_id=contract_id,
-                need_by_date=need_by_date or datetime.now() + timedelta(days=14),
+                need_by_date=effective_need_by,
                 total_cost=total_cost,
                 created_by=user_id,
                 auto_approve=(tier == 2),
@@ -452,45 +620,65 @@ class EquipmentActionTools:
                     quantity=qty,
                     supplier=supplier,
                     contract_id=contract_id,
-                    need_by_date=need_by_date or datetime.now() + timedelta(days=14),
+                    need_by_date=effective_need_by,
                     status=status,
-                    created_at=datetime.now(),
+                    created_at=now,
                     created_by=user_id,
                     total_cost=total_cost,
                 )
             else:
-                # Create fallback PR
-                pr_id = f"PR_{sku}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                return PurchaseRequisition(
-                    pr_id=pr_id,
-                    sku=sku,
-                    quantity=qty,
-                    supplier=supplier,
-                    contract_id=contract_id,
-                    need_by_date=need_by_date or datetime.now() + timedelta(days=14),
-                    status=status,
-                    created_at=datetime.now(),
-                    created_by=user_id,
-                    total_cost=total_cost,
+                return self._build_fallback_purchase_requisition(
+                    sku,
+                    qty,
+                    supplier,
+                    contract_id,
+                    effective_need_by,
+                    status,
+                    now,
+                    user_id,
+                    total_cost,
                 )
 
         except Exception as e:
             logger.error(f"Failed to generate purchase requisition for SKU {sku}: {e}")
-            # Create fallback PR
-            pr_id = f"PR_{sku}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            return PurchaseRequisition(
-                pr_id=pr_id,
-                sku=sku,
-                quantity=qty,
-                supplier=supplier,
-                contract_id=contract_id,
-                need_by_date=need_by_date or datetime.now() + timedelta(days=14),
-                status="pending_approval",
-                created_at=datetime.now(),
-                created_by=user_id,
-                total_cost=0.0,
+            return self._build_fallback_purchase_requisition(
+                sku,
+                qty,
+                supplier,
+                contract_id,
+                effective_need_by,
+                "pending_approval",
+                now,
+                user_id,
+                0.0,
             )
 
+    @staticmethod
+    def _build_fallback_purchase_requisition(
+        sku: str,
+        qty: int,
+        supplier: Optional[str],
+        contract_id: Optional[str],
+        need_by_date: datetime,
+        status: str,
+        now: datetime,
+        user_id: str,
+        total_cost: Optional[float],
+    ) -> PurchaseRequisition:
+        """Build a locally tracked purchase requisition when ERP creation fails."""
+        return PurchaseRequisition(
+            pr_id=_fallback_id(f"PR_{sku}"),
+            sku=sku,
+            quantity=qty,
+            supplier=supplier,
+            contract_id=contract_id,
+            need_by_date=need_by_date,
+            status=status,
+            created_at=now,
+            created_by=user_id,
+            total_cost=total_cost,
+        )
+
     async def adjust_reorder_point(
         self,
         sku: str,
@@ -512,9 +700,9 @@ class EquipmentActionTools:
         Returns:
             Dict with adjustment result
         """
+        now = datetime.now()
         try:
-            if not self.wms_service:
-                await self.initialize()
+            await self._ensure_initialized()
 
             # Get current reorder point
             current_info = await self.wms_service.get_item_info(sku)
@@ -527,7 +715,7 @@ class EquipmentActionTools:
                 "new_reorder_point": new_rp,
                 "rationale": rationale,
                 "user_id": user_id,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "requires_approval": requires_approval,
             }
 
@@ -571,8 +759,7 @@ class EquipmentActionTools:
             Dict with reslotting recommendations
         """
         try:
-            if not self.wms_service:
-                await self.initialize()
+            await self._ensure_initialized()
 
             # Get velocity data
             velocity_data = await self.wms_service.get_item_velocity(
@@ -592,29 +779,17 @@ class EquipmentActionTools:
             picks_per_day = velocity_data.get("picks_per_day", 0)
 
             # Simple slotting logic (can be enhanced with ML)
-            if picks_per_day > 100:
-                recommended_zone = "A"  # High velocity - close to shipping
-                recommended_aisle = "01"
-            elif picks_per_day > 50:
-                recommended_zone = "B"  # Medium velocity
-                recommended_aisle = "02"
-            else:
-                recommended_zone = "C"  # Low velocity - further away
-                recommended_aisle = "03"
+            velocity_class = bisect.bisect_left(_VELOCITY_THRESHOLDS, picks_per_day)
+            recommended_zone = _SLOTTING_ZONES[velocity_class]
+            recommended_aisle = _SLOTTING_AISLES[velocity_class]
 
             new_location = f"{recommended_zone}{recommended_aisle}"
 
             # Calculate travel time delta (simplified)
-            current_travel_time = (
-                120
-                if current_location.startswith("A")
-                else 180 if current_location.startswith("B") else 240
-            )
-            new_travel_time = (
-                120
-                if new_location.startswith("A")
-                else 180 if new_location.startswith("B") else 240
+            current_travel_time = _ZONE_TRAVEL_TIME_SECONDS.get(
+                current_location[:1], _DEFAULT_TRAVEL_TIME_SECONDS
             )
+            new_travel_time = _ZONE_TRAVEL_TIME_SECONDS[recommended_zone]
             travel_time_delta = new_travel_time - current_travel_time
 
             return {
@@ -664,9 +839,9 @@ class EquipmentActionTools:
         Returns:
             CycleCountTask with task details
         """
+        now = datetime.now()
         try:
-            if not self.wms_service:
-                await self.initialize()
+            await self._ensure_initialized()
 
             # Create cycle count task
             task_data = await self.wms_service.create_cycle_count_task(
@@ -681,41 +856,42 @@ class EquipmentActionTools:
                     class_name=class_name,
                     priority=priority,
                     status="pending",
-                    created_at=datetime.now(),
+                    created_at=now,
                     assigned_to=task_data.get("assigned_to"),
-                    due_date=datetime.now() + timedelta(days=7),
+                    due_date=now + _CYCLE_COUNT_DUE_WINDOW,
                 )
             else:
-                # Create fallback task
-                task_id = f"CC_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                return CycleCountTask(
-                    task_id=task_id,
-                    sku=sku,
-                    location=location,
-                    class_name=class_name,
-                    priority=priority,
-                    status="pending",
-                    created_at=datetime.now(),
-                    assigned_to=None,
-                    due_date=datetime.now() + timedelta(days=7),
+                return self._build_fallback_cycle_count(
+                    sku, location, class_name, priority, now
                 )
 
         except Exception as e:
             logger.error(f"Failed to start cycle count task: {e}")
-            # Create fallback task
-            task_id = f"CC_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            return CycleCountTask(
-                task_id=task_id,
-                sku=sku,
-                location=location,
-                class_name=class_name,
-                priority=priority,
-                status="pending",
-                created_at=datetime.now(),
-                assigned_to=None,
-                due_date=datetime.now() + timedelta(days=7),
+            return self._build_fallback_cycle_count(
+                sku, location, class_name, priority, now
             )
 
+    @staticmethod
+    def _build_fallback_cycle_count(
+        sku: Optional[str],
+        location: Optional[str],
+        class_name: Optional[str],
+        priority: str,
+        now: datetime,
+    ) -> CycleCountTask:
+        """Build a locally tracked cycle count task when WMS creation fails."""
+        return CycleCountTask(
+            task_id=_fallback_id("CC"),
+            sku=sku,
+            location=location,
+            class_name=class_name,
+            priority=priority,
+            status="pending",
+            created_at=now,
+            assigned_to=None,
+            due_date=now + _CYCLE_COUNT_DUE_WINDOW,
+        )
+
     async def investigate_discrepancy(
         self, sku: str, location: str, expected_quantity: int, actual_quantity: int
     ) -> DiscrepancyInvestigation:
@@ -731,39 +907,54 @@ class EquipmentActionTools:
         Returns:
             DiscrepancyInvestigation with investigation details
         """
+        now = datetime.now()
         try:
-            if not self.wms_service:
-                await self.initialize()
+            await self._ensure_initialized()
 
             discrepancy_amount = actual_quantity - expected_quantity
 
-            # Get recent transaction history
-            transaction_history = await self.wms_service.get_transaction_history(
-                sku=sku, location=location, days=30
-            )
-
-            # Get recent picks and moves
-            recent_activity = await self.wms_service.get_recent_activity(
-                sku=sku, location=location, days=7
-            )
-
             # Create investigation
-            investigation_id = f"INV_{sku}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            investigation_id = _fallback_id(f"INV_{sku}")
 
             # Analyze potential causes
             findings = []
-            if transaction_history:
-                findings.append(
-                    f"Found {len(transaction_history)} transactions in last 30 days"
+            transaction_count = pick_count = move_count = 0
+
+            # Recent picks/moves are a subset of the 30-day history, so fetch
+            # the history once and derive recent activity client-side
+            try:
+                transaction_history = await self.wms_service.get_transaction_history(
+                    sku=sku, location=location, days=30
                 )
+            except Exception as e:
+                logger.warning(f"Transaction history unavailable for SKU {sku}: {e}")
+                findings.append(f"Transaction history unavailable: {str(e)}")
+                transaction_history = None
 
-            if recent_activity:
-                picks = [a for a in recent_activity if a.get("type") == "pick"]
-                moves = [a for a in recent_activity if a.get("type") == "move"]
+            if transaction_history:
+                transaction_count = len(transaction_history)
                 findings.append(
-                    f"Recent activity: {len(picks)} picks, {len(moves)} moves"
+                    f"Found {transaction_count} transactions in last 30 days"
                 )
 
+                recent_cutoff = now - _RECENT_ACTIVITY_WINDOW
+                recent_count = 0
+                for transaction in transaction_history:
+                    timestamp = _parse_timestamp(transaction.get("timestamp"))
+                    if timestamp is None or timestamp < recent_cutoff:
+                        continue
+                    recent_count += 1
+                    transaction_type = transaction.get("type")
+                    if transaction_type == "pick":
+                        pick_count += 1
+                    elif transaction_type == "move":
+                        move_count += 1
+
+                if recent_count:
+                    findings.append(
+                        f"Recent activity: {pick_count} picks, {move_count} moves"
+                    )
+
             if abs(discrepancy_amount) > 10:
                 findings.append(
                     "Large discrepancy detected - may require physical recount"
@@ -777,15 +968,18 @@ class EquipmentActionTools:
                 actual_quantity=actual_quantity,
                 discrepancy_amount=discrepancy_amount,
                 status="open",
-                created_at=datetime.now(),
+                created_at=now,
                 assigned_to=None,
                 findings=findings,
                 resolution=None,
+                transaction_count=transaction_count,
+                recent_pick_count=pick_count,
+                recent_move_count=move_count,
             )
 
         except Exception as e:
             logger.error(f"Failed to investigate discrepancy for SKU {sku}: {e}")
-            investigation_id = f"INV_{sku}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            investigation_id = _fallback_id(f"INV_{sku}")
             return DiscrepancyInvestigation(
                 investigation_id=investigation_id,
                 sku=sku,
@@ -794,7 +988,7 @@ class EquipmentActionTools:
                 actual_quantity=actual_quantity,
                 discrepancy_amount=actual_quantity - expected_quantity,
                 status="open",
-                created_at=datetime.now(),
+                created_at=now,
                 assigned_to=None,
                 findings=[f"Investigation failed: {str(e)}"],
                 resolution=None,
@@ -811,8 +1005,7 @@ class EquipmentActionTools:
             Equipment status with telemetry data and operational state
         """
         try:
-            if not self.sql_retriever:
-                await self.initialize()
+            await self._ensure_initialized()
 
             # Query equipment telemetry for the last 24 hours
             query = """
@@ -916,8 +1109,7 @@ class EquipmentActionTools:
             Charger status with charging information
         """
         try:
-            if not self.sql_retriever:
-                await self.initialize()
+            await self._ensure_initialized()
 
             # Get equipment status first
             equipment_status_result = await self.get_equipment_status(equipment_id)
@@ -995,12 +1187,16 @@ class EquipmentActionTools:
 
 # Global action tools instance
 _action_tools: Optional[EquipmentActionTools] = None
+_action_tools_lock = asyncio.Lock()
 
 
 async def get_equipment_action_tools() -> EquipmentActionTools:
     """Get or create the global equipment action tools instance."""
     global _action_tools
     if _action_tools is None:
-        _action_tools = EquipmentActionTools()
-        await _action_tools.initialize()
+        async with _action_tools_lock:
+            if _action_tools is None:
+                action_tools = EquipmentActionTools()
+                await action_tools.initialize()
+                _action_tools = action_tools
     return _action_tools
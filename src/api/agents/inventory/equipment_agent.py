@@ -30,7 +30,9 @@ Provides intelligent equipment and asset management capabilities including:
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Union
+import os
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
 import json
 from datetime import datetime, timedelta
@@ -40,12 +42,127 @@ from src.api.services.llm.nim_client import get_nim_client, LLMResponse
 from src.retrieval.hybrid_retriever import get_hybrid_retriever, SearchContext
 from src.memory.memory_manager import get_memory_manager
 from src.api.services.agent_config import load_agent_config, AgentConfig
+from src.api.services.cache.semantic_cache import SemanticCache
+from src.api.services.cache.ttl_cache import TTLCache
+from src.api.services.memory.session_history_store import SessionHistoryStore
+from src.api.utils.json_utils import json_dumps, json_loads
+from src.api.utils.prompt_utils import embed_query, stream_natural_language
 from .equipment_asset_tools import get_equipment_asset_tools, EquipmentAssetTools
 
 logger = logging.getLogger(__name__)
 
+# Read-only intents whose responses may be replayed for similar queries
+_CACHEABLE_INTENTS = frozenset(
+    {"equipment_lookup", "availability", "utilization", "telemetry"}
+)
+
+# Intents that run a state-changing action tool
+_ACTION_INTENTS = frozenset({"assignment", "maintenance", "release"})
+
+# A cached response is only reused when the session's most recent intents
+# match, so a follow-up ("Is it available?") is never answered from a
+# different conversation thread
+_CONTEXT_CHAIN_TURNS = 3
+
+# Search hits of each kind passed to the response prompt
+_MAX_CONTEXT_RESULTS = 3
+
+# Conversation turns kept per session
+_MAX_HISTORY_TURNS = 10
+
+# One line pair per prior exchange in the understanding prompt
+_HISTORY_LINE_TEMPLATE = "Q: {0[query]}\nA: {1}".format
+
+# Keyword buckets for local intent detection, checked in order
+_INTENT_KEYWORDS = (
+    ("maintenance", ("maintenance", "repair", "service", "inspection")),
+    ("assignment", ("assign", "allocate", "dispatch")),
+    ("release", ("release", "unassign", "return")),
+    ("telemetry", ("telemetry", "battery", "temperature", "sensor", "speed")),
+    ("utilization", ("utilization", "utilisation", "usage", "idle")),
+    ("availability", ("available", "availability", "free")),
+    ("equipment_lookup", ("status", "where is", "show", "list", "equipment")),
+)
+
+_EQUIPMENT_TYPES = ("forklift", "amr", "agv", "scanner", "charger", "conveyor")
+
+# All keywords compiled into one whole-word alternation (longest first) so a
+# query is scanned once; each match maps back to its bucket's priority.
+# Plural and inflected endings are allowed, but "free" never matches "freezer".
+_INTENT_RANK = {
+    word: rank
+    for rank, (_, keywords) in enumerate(_INTENT_KEYWORDS)
+    for word in keywords
+}
+_INTENT_PATTERN = re.compile(
+    r"\b("
+    + "|".join(re.escape(w) for w in sorted(_INTENT_RANK, key=len, reverse=True))
+    + r")(?:s|es|d|ed|ing)?\b"
+)
+_EQUIPMENT_TYPE_PATTERN = re.compile(r"\b(" + "|".join(_EQUIPMENT_TYPES) + r")s?\b")
+
+_ASSET_ID_PATTERN = re.compile(r"[A-Z]{2,3}-\d+")
+
+_ZONE_PATTERN = re.compile(r"\bzone\s+([a-z0-9][\w-]*)")
+
+# Response type reported for each intent
+_RESPONSE_TYPE_MAP = {
+    "equipment_lookup": "equipment_info",
+    "assignment": "assignment_status",
+    "utilization": "utilization_report",
+    "maintenance": "maintenance_plan",
+    "availability": "availability_status",
+    "release": "release_status",
+    "telemetry": "telemetry_data",
+}
+
+# Replies larger than this are parsed in a worker thread; below it the
+# thread hand-off costs more than the parse itself
+_OFFLOAD_PARSE_BYTES = 256 * 1024
+
+_JSON_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+
+def _asset_ids(text: str) -> frozenset:
+    """Asset identifiers (FL-01, AMR-001, ...) mentioned in text."""
+    return frozenset(_ASSET_ID_PATTERN.findall(text.upper()))
+
+
+def _cache_partition(query: str) -> Tuple[frozenset, frozenset, frozenset]:
+    """Asset IDs, equipment types and zones named in a query."""
+    query_lower = query.lower()
+    return (
+        _asset_ids(query),
+        frozenset(_EQUIPMENT_TYPE_PATTERN.findall(query_lower)),
+        frozenset(_ZONE_PATTERN.findall(query_lower)),
+    )
+
+
+def _parse_llm_json(content: str) -> Any:
+    """
+    Parse a JSON reply from the LLM, tolerating markdown code fences.
+
+    Raises:
+        json.JSONDecodeError: If the reply is not complete JSON
+    """
+    text = content.strip()
+    fenced = _JSON_FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    # A truncated reply cannot parse; skip the attempt
+    if not text or text[-1] not in "}]":
+        raise json.JSONDecodeError("Incomplete JSON content", text, len(text))
+    return json_loads(text)
+
+
+async def _parse_llm_json_async(content: str) -> Any:
+    """Parse an LLM reply, moving very large payloads off the event loop."""
+    if len(content) > _OFFLOAD_PARSE_BYTES:
+        return await asyncio.to_thread(_parse_llm_json, content)
+    return _parse_llm_json(content)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class EquipmentQuery:
     """Structured equipment query."""
 
@@ -57,7 +174,7 @@ class EquipmentQuery:
     user_query: str  # Original user query
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EquipmentResponse:
     """Structured equipment response."""
 
@@ -85,8 +202,20 @@ class EquipmentAssetOperationsAgent:
         self.nim_client = None
         self.hybrid_retriever = None
         self.asset_tools = None
-        self.conversation_context = {}  # Maintain conversation context
+        # Conversation history, shared across workers via Redis when available;
+        # idle sessions expire after an hour
+        self.history_store = SessionHistoryStore(
+            "equipment", max_turns=_MAX_HISTORY_TURNS, ttl_seconds=3600
+        )
         self.config: Optional[AgentConfig] = None  # Agent configuration
+        self._background_tasks: set = set()
+        self._search_cache = TTLCache(ttl_seconds=30.0, max_entries=256)
+        self._exact_response_cache = TTLCache(ttl_seconds=30.0, max_entries=2048)
+        self._response_cache = SemanticCache(similarity_threshold=0.92, ttl_seconds=60.0)
+        # Resolve read-only intents locally so those queries need a single LLM call
+        self.local_intent_enabled = (
+            os.getenv("EQUIPMENT_LOCAL_INTENT_ENABLED", "true").lower() == "true"
+        )
 
     async def initialize(self) -> None:
         """Initialize the agent with required services."""
@@ -98,6 +227,7 @@ class EquipmentAssetOperationsAgent:
             self.nim_client = await get_nim_client()
             self.hybrid_retriever = await get_hybrid_retriever()
             self.asset_tools = await get_equipment_asset_tools()
+            await self.history_store.initialize()
             logger.info("Equipment & Asset Operations Agent initialized successfully")
         except Exception as e:
             logger.error(
@@ -110,6 +240,7 @@ class EquipmentAssetOperationsAgent:
         query: str,
         session_id: str = "default",
         context: Optional[Dict[str, Any]] = None,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> EquipmentResponse:
         """
         Process an equipment/asset operations query.
@@ -118,47 +249,79 @@ class EquipmentAssetOperationsAgent:
             query: User's equipment/asset query
             session_id: Session identifier for context
             context: Additional context
+            on_text: Optional coroutine called with natural-language text as
+                it is generated, before the full response is available
 
         Returns:
             EquipmentResponse with structured data, natural language, and recommendations
         """
         try:
-            # Initialize if needed
-            if not self.nim_client or not self.hybrid_retriever:
-                await self.initialize()
-
-            # Update conversation context
-            if session_id not in self.conversation_context:
-                self.conversation_context[session_id] = {
-                    "history": [],
-                    "current_focus": None,
-                    "last_entities": {},
-                }
-
-            # Step 1: Understand intent and extract entities using LLM
-            equipment_query = await self._understand_query(query, session_id, context)
-
-            # Step 2: Retrieve relevant data using hybrid retriever
-            retrieved_data = await self._retrieve_equipment_data(equipment_query)
-
-            # Step 3: Execute action tools if needed
-            actions_taken = await self._execute_action_tools(equipment_query, context)
+            # Step 1: Understand intent and extract entities using LLM. The
+            # intent is resolved before any cache lookup, so an action query
+            # worded like a cached lookup still runs its action tool.
+            equipment_query, context_chain = await asyncio.gather(
+                self._understand_query(query, session_id, context),
+                self._context_chain(session_id),
+            )
+            cacheable = equipment_query.intent in _CACHEABLE_INTENTS
+
+            # L1: verbatim repeats of a recent read-only query (polling
+            # dashboards) are served without embedding or a response LLM call.
+            # Both tiers are keyed on the session's recent intents.
+            exact_key = (
+                " ".join(query.lower().split()),
+                json_dumps(context, sort_keys=True, default=str) if context else "",
+                context_chain,
+            )
+            if cacheable:
+                cached = self._exact_response_cache.get(exact_key)
+                if cached is not None:
+                    logger.info(f"Exact cache hit for equipment query: {query}")
+                    return await self._serve_cached_response(
+                        session_id, query, equipment_query, cached[1], on_text
+                    )
+
+            # L2: serve restatements of a recent read-only query from the semantic
+            # cache; caller-supplied context can change the answer, so skip it then.
+            # Entries are partitioned by the asset IDs, equipment types and zones
+            # named in the query, since near-identical wording can still refer
+            # to a different asset or area.
+            query_embedding = None
+            partition = (context_chain, _cache_partition(query))
+            if cacheable and not context:
+                query_embedding = await embed_query(self.nim_client, query)
+                cached = (
+                    self._response_cache.lookup(query_embedding, partition)
+                    if query_embedding is not None
+                    else None
+                )
+                if cached is not None:
+                    logger.info(f"Semantic cache hit for equipment query: {query}")
+                    return await self._serve_cached_response(
+                        session_id, query, equipment_query, cached[1], on_text
+                    )
+
+            # Steps 2 and 3: Retrieve relevant data and execute action tools.
+            # Both only depend on the parsed query, so run them concurrently.
+            retrieved_data, actions_taken = await asyncio.gather(
+                self._retrieve_equipment_data(equipment_query),
+                self._execute_action_tools(equipment_query, context),
+            )
 
             # Step 4: Generate response using LLM
             response = await self._generate_equipment_response(
-                equipment_query, retrieved_data, session_id, actions_taken
+                equipment_query, retrieved_data, session_id, actions_taken, on_text
             )
 
+            if cacheable and response.response_type != "error":
+                self._exact_response_cache.set(exact_key, (equipment_query, response))
+                if query_embedding is not None:
+                    self._response_cache.store(
+                        query_embedding, (equipment_query, response), partition
+                    )
+
             # Update conversation context
-            self.conversation_context[session_id]["history"].append(
-                {
-                    "query": query,
-                    "intent": equipment_query.intent,
-                    "entities": equipment_query.entities,
-                    "response_type": response.response_type,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+            self._record_turn_in_background(session_id, query, equipment_query, response)
 
             return response
 
@@ -166,15 +329,78 @@ class EquipmentAssetOperationsAgent:
             logger.error(f"Error processing equipment query: {e}")
             return await self._generate_fallback_response(query, session_id, str(e))
 
+    async def _record_turn(
+        self,
+        session_id: str,
+        query: str,
+        equipment_query: EquipmentQuery,
+        response: EquipmentResponse,
+    ) -> None:
+        """Append a query/response exchange to the session history."""
+        await self.history_store.append(
+            session_id,
+            {
+                "query": query,
+                "intent": equipment_query.intent,
+                "entities": equipment_query.entities,
+                "response_type": response.response_type,
+                "timestamp": datetime.now().isoformat(),
+            },
+        )
+
+    def _record_turn_in_background(
+        self,
+        session_id: str,
+        query: str,
+        equipment_query: EquipmentQuery,
+        response: EquipmentResponse,
+    ) -> None:
+        """Record the turn without delaying the response to the caller."""
+        task = asyncio.create_task(
+            self._record_turn(session_id, query, equipment_query, response)
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+
+    def _on_background_task_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to record conversation turn: {task.exception()}")
+
+    async def _context_chain(self, session_id: str) -> tuple:
+        """Intents of the session's most recent turns, oldest first."""
+        history = await self.history_store.get_recent(session_id, _CONTEXT_CHAIN_TURNS)
+        return tuple(turn.get("intent") for turn in history)
+
+    async def _serve_cached_response(
+        self,
+        session_id: str,
+        query: str,
+        equipment_query: EquipmentQuery,
+        response: EquipmentResponse,
+        on_text: Optional[Callable[[str], Awaitable[None]]],
+    ) -> EquipmentResponse:
+        """Record this turn and return a cached response."""
+        self._record_turn_in_background(session_id, query, equipment_query, response)
+        if on_text is not None:
+            await on_text(response.natural_language)
+        return response
+
     async def _understand_query(
         self, query: str, session_id: str, context: Optional[Dict[str, Any]]
     ) -> EquipmentQuery:
         """Understand the user's equipment query and extract entities."""
+        if self.local_intent_enabled and "zone" not in query.lower():
+            local_query = self._fallback_intent_detection(query)
+            if local_query.intent in _CACHEABLE_INTENTS and local_query.context.get(
+                "keyword_match"
+            ):
+                return local_query
+
         try:
             # Build context for LLM
-            conversation_history = self.conversation_context.get(session_id, {}).get(
-                "history", []
-            )
+            # Last 3 exchanges
+            conversation_history = await self.history_store.get_recent(session_id, 3)
             context_str = self._build_context_string(conversation_history, context)
 
             # Load prompt from configuration
@@ -195,7 +421,7 @@ class EquipmentAssetOperationsAgent:
 
             # Parse JSON response
             try:
-                parsed_response = json.loads(response.content.strip())
+                parsed_response = await _parse_llm_json_async(response.content)
                 return EquipmentQuery(
                     intent=parsed_response.get("intent", "equipment_lookup"),
                     entities=parsed_response.get("entities", {}),
@@ -204,15 +430,33 @@ class EquipmentAssetOperationsAgent:
                 )
             except json.JSONDecodeError:
                 logger.warning("Failed to parse LLM response as JSON, using fallback")
-                return EquipmentQuery(
-                    intent="equipment_lookup", entities={}, context={}, user_query=query
-                )
+                return self._fallback_intent_detection(query)
 
         except Exception as e:
             logger.error(f"Error understanding query: {e}")
-            return EquipmentQuery(
-                intent="equipment_lookup", entities={}, context={}, user_query=query
-            )
+            return self._fallback_intent_detection(query)
+
+    def _fallback_intent_detection(self, query: str) -> EquipmentQuery:
+        """Fallback intent detection using keyword matching."""
+        query_lower = query.lower()
+
+        ranks = [_INTENT_RANK[m.group(1)] for m in _INTENT_PATTERN.finditer(query_lower)]
+        intent = _INTENT_KEYWORDS[min(ranks)][0] if ranks else None
+
+        entities: Dict[str, Any] = {}
+        asset_match = _ASSET_ID_PATTERN.search(query.upper())
+        if asset_match:
+            entities["asset_id"] = asset_match.group()
+        type_match = _EQUIPMENT_TYPE_PATTERN.search(query_lower)
+        if type_match:
+            entities["equipment_type"] = type_match.group(1)
+
+        return EquipmentQuery(
+            intent=intent or "equipment_lookup",
+            entities=entities,
+            context={"keyword_match": intent is not None},
+            user_query=query,
+        )
 
     async def _retrieve_equipment_data(
         self, equipment_query: EquipmentQuery
@@ -231,15 +475,26 @@ class EquipmentAssetOperationsAgent:
                 limit=10,
             )
 
-            # Perform hybrid search
-            search_results = await self.hybrid_retriever.search(search_context)
-
-            return {
-                "search_results": search_results,
+            retrieved = {
                 "query_filters": search_context.filters,
                 "timestamp": datetime.now().isoformat(),
             }
 
+            # Action intents are answered from the tool results; the document
+            # and inventory search adds nothing for them
+            if equipment_query.intent in _ACTION_INTENTS:
+                return retrieved
+
+            # Perform hybrid search (memoized briefly for repeated lookups)
+            cache_key = (
+                search_context.query.strip().lower(),
+                json_dumps(search_context.filters, sort_keys=True),
+            )
+            retrieved["search_results"] = await self._search_cache.get_or_load(
+                cache_key, lambda: self.hybrid_retriever.search(search_context)
+            )
+            return retrieved
+
         except Exception as e:
             logger.error(f"Data retrieval failed: {e}")
             return {"error": str(e)}
@@ -262,11 +517,9 @@ class EquipmentAssetOperationsAgent:
 
             # If no asset_id in entities, try to extract from query text
             if not asset_id and equipment_query.user_query:
-                import re
-
                 # Look for patterns like FL-01, AMR-001, CHG-05, etc.
-                asset_match = re.search(
-                    r"[A-Z]{2,3}-\d+", equipment_query.user_query.upper()
+                asset_match = _ASSET_ID_PATTERN.search(
+                    equipment_query.user_query.upper()
                 )
                 if asset_match:
                     asset_id = asset_match.group()
@@ -405,11 +658,15 @@ class EquipmentAssetOperationsAgent:
         retrieved_data: Dict[str, Any],
         session_id: str,
         actions_taken: List[Dict[str, Any]],
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> EquipmentResponse:
         """Generate a comprehensive equipment response using LLM."""
         try:
-            # Build context for response generation
-            context_str = self._build_retrieved_context(retrieved_data, actions_taken)
+            # Build context for response generation; actions taken have their
+            # own section in the response prompt, so they are not repeated here
+            context_str = self._build_retrieved_context(
+                retrieved_data, equipment_query.entities
+            )
 
             # Load response prompt from configuration
             if self.config is None:
@@ -423,37 +680,57 @@ class EquipmentAssetOperationsAgent:
                 intent=equipment_query.intent,
                 entities=equipment_query.entities,
                 retrieved_data=context_str,
-                actions_taken=json.dumps(actions_taken, indent=2, default=str)
+                actions_taken=json_dumps(actions_taken, default=str),
             )
 
-            response = await self.nim_client.generate_response(
-                [{"role": "user", "content": prompt}], temperature=0.3
-            )
+            messages = [{"role": "user", "content": prompt}]
+            streamed = False
+            if on_text is None:
+                response = await self.nim_client.generate_response(
+                    messages, temperature=0.3
+                )
+                content = response.content
+            else:
+                content, streamed = await stream_natural_language(
+                    self.nim_client, messages, on_text, temperature=0.3
+                )
 
             # Determine response type based on intent
-            response_type_map = {
-                "equipment_lookup": "equipment_info",
-                "assignment": "assignment_status",
-                "utilization": "utilization_report",
-                "maintenance": "maintenance_plan",
-                "availability": "availability_status",
-                "release": "release_status",
-                "telemetry": "telemetry_data",
-            }
-
-            response_type = response_type_map.get(
+            response_type = _RESPONSE_TYPE_MAP.get(
                 equipment_query.intent, "equipment_info"
             )
 
-            # Extract recommendations from response
-            recommendations = self._extract_recommendations(response.content)
+            # The response prompt asks for a JSON object; fall back to treating
+            # the reply as plain text if the model did not comply
+            natural_language = content
+            recommendations: List[str] = []
+            confidence = 0.85  # High confidence for equipment queries
+            try:
+                parsed_response = await _parse_llm_json_async(content)
+                if isinstance(parsed_response, dict) and parsed_response.get(
+                    "natural_language"
+                ):
+                    natural_language = str(parsed_response["natural_language"])
+                    recommendations = [
+                        str(r) for r in parsed_response.get("recommendations") or []
+                    ][:5]
+                    confidence = float(parsed_response.get("confidence", confidence))
+            except (json.JSONDecodeError, TypeError, ValueError):
+                pass
+
+            # Extract recommendations from response text if none were given
+            if not recommendations:
+                recommendations = self._extract_recommendations(natural_language)
+
+            if on_text is not None and not streamed:
+                await on_text(natural_language)
 
             return EquipmentResponse(
                 response_type=response_type,
                 data=retrieved_data,
-                natural_language=response.content,
+                natural_language=natural_language,
                 recommendations=recommendations,
-                confidence=0.85,  # High confidence for equipment queries
+                confidence=confidence,
                 actions_taken=actions_taken,
             )
 
@@ -471,42 +748,79 @@ class EquipmentAssetOperationsAgent:
 
         if conversation_history:
             recent_history = conversation_history[-3:]  # Last 3 exchanges
-            history_str = "\n".join(
-                [
-                    f"Q: {h['query']}\nA: {h.get('response_type', 'equipment_info')}"
+            context_parts.append(
+                "Recent conversation:\n"
+                + "\n".join(
+                    _HISTORY_LINE_TEMPLATE(h, h.get("response_type", "equipment_info"))
                     for h in recent_history
-                ]
+                )
             )
-            context_parts.append(f"Recent conversation:\n{history_str}")
 
         if context:
-            context_parts.append(f"Additional context: {json.dumps(context, indent=2)}")
+            context_parts.append(f"Additional context: {json_dumps(context, default=str)}")
 
         return "\n\n".join(context_parts) if context_parts else "No additional context"
 
     def _build_retrieved_context(
-        self, retrieved_data: Dict[str, Any], actions_taken: List[Dict[str, Any]]
+        self, retrieved_data: Dict[str, Any], entities: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Build context string from retrieved data and actions."""
+        """Build context string from retrieved data."""
         context_parts = []
 
         if "search_results" in retrieved_data:
-            context_parts.append(
-                f"Search results: {json.dumps(retrieved_data['search_results'], indent=2, default=str)}"
+            search_results = self._serialize_search_results(
+                retrieved_data["search_results"], entities or {}
             )
-
-        if "query_filters" in retrieved_data:
             context_parts.append(
-                f"Query filters: {json.dumps(retrieved_data['query_filters'], indent=2)}"
+                f"Search results: {json_dumps(search_results, default=str)}"
             )
 
-        if actions_taken:
-            context_parts.append(
-                f"Actions taken: {json.dumps(actions_taken, indent=2, default=str)}"
-            )
+        # Only the filters that were actually set are worth prompt tokens
+        query_filters = {
+            k: v for k, v in retrieved_data.get("query_filters", {}).items() if v
+        }
+        if query_filters:
+            context_parts.append(f"Query filters: {json_dumps(query_filters, default=str)}")
 
         return "\n\n".join(context_parts) if context_parts else "No retrieved data"
 
+    @staticmethod
+    def _serialize_search_results(
+        search_results: Any, entities: Dict[str, Any]
+    ) -> Any:
+        """
+        Flatten a HybridSearchResult into plain dicts for the prompt.
+
+        Structured items are ranked by how many extracted entity values they
+        mention and only the top few are kept, as are the best vector hits.
+        """
+        structured = getattr(search_results, "structured_results", None)
+        if structured is None:
+            return search_results
+
+        entity_values = [str(v).lower() for v in entities.values() if v]
+
+        def relevance(item: Any) -> int:
+            haystack = f"{item.sku} {item.name} {item.location or ''}".lower()
+            return sum(1 for value in entity_values if value in haystack)
+
+        top_items = sorted(structured, key=relevance, reverse=True)[
+            :_MAX_CONTEXT_RESULTS
+        ]
+        top_vectors = sorted(
+            search_results.vector_results, key=lambda r: r.score, reverse=True
+        )[:_MAX_CONTEXT_RESULTS]
+
+        return {
+            "search_type": search_results.search_type,
+            "combined_score": search_results.combined_score,
+            "structured_results": [item.to_dict() for item in top_items],
+            "vector_results": [
+                {"content": result.content, "score": result.score}
+                for result in top_vectors
+            ],
+        }
+
     def _extract_recommendations(self, response_text: str) -> List[str]:
         """Extract actionable recommendations from response text."""
         recommendations = []
@@ -543,20 +857,29 @@ class EquipmentAssetOperationsAgent:
             actions_taken=[],
         )
 
+    async def close(self) -> None:
+        """Wait for pending history writes and release connections."""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.history_store.close()
+
     async def clear_conversation_context(self, session_id: str) -> None:
         """Clear conversation context for a session."""
-        if session_id in self.conversation_context:
-            del self.conversation_context[session_id]
+        await self.history_store.clear(session_id)
 
 
 # Global instance
 _equipment_agent: Optional[EquipmentAssetOperationsAgent] = None
+_equipment_agent_lock = asyncio.Lock()
 
 
 async def get_equipment_agent() -> EquipmentAssetOperationsAgent:
-    """Get the global equipment agent instance."""
+    """Get the global equipment agent instance (initialized exactly once)."""
     global _equipment_agent
     if _equipment_agent is None:
-        _equipment_agent = EquipmentAssetOperationsAgent()
-        await _equipment_agent.initialize()
+        async with _equipment_agent_lock:
+            if _equipment_agent is None:
+                equipment_agent = EquipmentAssetOperationsAgent()
+                await equipment_agent.initialize()
+                _equipment_agent = equipment_agent
     return _equipment_agent
@@ -21,12 +21,16 @@ dynamic tool discovery and execution for operations coordination and workforce m
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, asdict
-import json
+import re
+from collections import deque
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import asyncio
 
+from pydantic import BaseModel, Field
+
 from src.api.services.llm.nim_client import get_nim_client, LLMResponse
 from src.retrieval.hybrid_retriever import get_hybrid_retriever, SearchContext
 from src.memory.memory_manager import get_memory_manager
@@ -44,12 +48,174 @@ from src.api.services.reasoning import (
 from src.api.utils.log_utils import sanitize_prompt_input
 from src.api.services.agent_config import load_agent_config, AgentConfig
 from src.api.services.validation import get_response_validator
+from src.api.services.cache.semantic_cache import SemanticCache
+from src.api.services.cache.ttl_cache import TTLCache
+from src.api.utils.json_utils import json_dumps, json_loads
+from src.api.utils.prompt_utils import (
+    embed_query,
+    encode_prompt_results,
+    json_schema_format,
+    query_identifiers,
+    stream_natural_language,
+)
 from .action_tools import get_operations_action_tools
 
 logger = logging.getLogger(__name__)
 
+# Bounds for in-process history so a long-running server does not grow forever
+_MAX_SESSION_TURNS = 100
+_MAX_TOOL_EXECUTION_HISTORY = 1000
+_MAX_SESSIONS = 10_000
+_SESSION_TTL_SECONDS = 3600
+
+# Substrings that mark a query as complex enough for advanced reasoning,
+# matched in one pass by a single alternation
+_COMPLEX_QUERY_KEYWORDS = (
+    "analyze",
+    "compare",
+    "relationship",
+    "why",
+    "how",
+    "explain",
+    "investigate",
+    "evaluate",
+    "optimize",
+    "improve",
+    "what if",
+    "scenario",
+    "pattern",
+    "trend",
+    "cause",
+    "effect",
+    "because",
+    "result",
+    "consequence",
+    "due to",
+    "leads to",
+    "recommendation",
+    "suggestion",
+    "strategy",
+    "plan",
+    "alternative",
+    "option",
+)
+_COMPLEX_QUERY_PATTERN = re.compile("|".join(map(re.escape, _COMPLEX_QUERY_KEYWORDS)))
+
+# Tool results with more JSON values than this are compacted and encoded in a
+# worker thread; below it the thread hand-off costs more than the encoding
+_OFFLOAD_ENCODE_NODES = 2000
+
+# Outermost {...} span of an LLM reply, skipping markdown fences or prose
+# around the JSON object
+_JSON_OBJECT_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class _ParsedQuerySchema(BaseModel):
+    """Structured output requested from the query-parse LLM call."""
+
+    intent: str
+    entities: Dict[str, Any] = Field(default_factory=dict)
+    context: Dict[str, Any] = Field(default_factory=dict)
+
+
+class _OperationsResponseSchema(BaseModel):
+    """Structured output requested from the response-generation LLM call."""
+
+    response_type: str = "operations_info"
+    data: Dict[str, Any] = Field(default_factory=dict)
+    natural_language: str
+    recommendations: List[str] = Field(default_factory=list)
+    confidence: float = 0.7
+    actions_taken: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+# Built once; the NIM client only sends these when structured output is enabled
+_PARSE_RESPONSE_FORMAT = json_schema_format("operations_query", _ParsedQuerySchema)
+_RESPONSE_RESPONSE_FORMAT = json_schema_format(
+    "operations_response", _OperationsResponseSchema
+)
+
+
+# Operations prompts; the *_USER_PROMPT templates are bound str.format calls
+_PARSE_SYSTEM_PROMPT = """You are an operations coordination expert. Parse warehouse operations queries and extract intent, entities, and context.
+
+Return JSON format:
+{
+    "intent": "workforce_management",
+    "entities": {"worker_id": "W001", "zone": "A"},
+    "context": {"priority": "high", "shift": "morning"}
+}
+
+Intent options: workforce_management, task_assignment, shift_planning, kpi_analysis, performance_monitoring, resource_allocation, wave_creation, order_management, workflow_optimization
+
+Examples:
+- "Create a wave for orders 1001-1010" → {"intent": "wave_creation", "entities": {"order_range": "1001-1010", "zone": "A"}, "context": {"priority": "normal"}}
+- "Assign workers to Zone A" → {"intent": "workforce_management", "entities": {"zone": "A"}, "context": {"priority": "normal"}}
+- "Schedule pick operations" → {"intent": "task_assignment", "entities": {"operation_type": "pick"}, "context": {"priority": "normal"}}
+
+Return only valid JSON."""
+
+_PARSE_USER_PROMPT = 'Query: "{query}"\nContext: {context}'.format
+
+_JSON_ONLY_INSTRUCTION = (
+    "\n\nIMPORTANT: You MUST return ONLY valid JSON. "
+    "Do not include any text before or after the JSON."
+)
+
+_NATURAL_LANGUAGE_SYSTEM_PROMPT = """You are a warehouse operations expert. Generate a clear, natural, conversational response 
+that explains what was accomplished based on tool execution results. Write in a professional but friendly tone, 
+as if explaining to a colleague. Use complete sentences, vary your sentence structure, and make it sound natural and fluent."""
+
+_NATURAL_LANGUAGE_USER_PROMPT = """The user asked: "{user_query}"
+
+The following tools were executed successfully:
+{tool_results}
+
+Generate a natural, conversational response (2-4 sentences) that:
+1. Confirms what was accomplished
+2. Includes specific details (IDs, names, statuses) naturally woven into the explanation
+3. Sounds like a human expert explaining the results
+4. Is clear, professional, and easy to read
+
+Return ONLY the natural language response text (no JSON, no formatting, just the response).""".format
+
+_ENHANCE_SYSTEM_PROMPT = (
+    "You are a warehouse operations expert. Expand and improve the given response "
+    "to make it more natural, detailed, and conversational while keeping the same meaning."
+)
+
+_ENHANCE_USER_PROMPT = """Original response: "{natural_language}"
+
+User query: "{user_query}"
+
+Tool results: {successful_count} tools executed successfully
 
-@dataclass
+Expand this into a natural, conversational response (2-4 sentences) that explains what was accomplished in a clear, professional tone. Return ONLY the enhanced response text.""".format
+
+
+def _exceeds_node_count(value: Any, limit: int) -> bool:
+    """Whether value holds more than limit JSON values; stops counting at limit."""
+    stack = [value]
+    count = 0
+    while stack:
+        item = stack.pop()
+        count += 1
+        if count > limit:
+            return True
+        if isinstance(item, dict):
+            stack.extend(islice(item.values(), limit))
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item[:limit])
+    return False
+
+
+def _extract_json_object(text: str) -> str:
+    """Return the JSON object embedded in text, or text itself if none is found."""
+    match = _JSON_OBJECT_PATTERN.search(text)
+    return match.group(0) if match else text
+
+
+@dataclass(slots=True)
 class MCPOperationsQuery:
     """MCP-enabled operations query."""
 
@@ -61,7 +227,7 @@ class MCPOperationsQuery:
     tool_execution_plan: List[Dict[str, Any]] = None  # Planned tool executions
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPOperationsResponse:
     """MCP-enabled operations response."""
 
@@ -95,10 +261,22 @@ class MCPOperationsCoordinationAgent:
         self.mcp_manager = None
         self.tool_discovery = None
         self.reasoning_engine = None
-        self.conversation_context = {}
+        # Per-session history; idle sessions expire after an hour
+        self.conversation_context = TTLCache(
+            ttl_seconds=_SESSION_TTL_SECONDS, max_entries=_MAX_SESSIONS
+        )
         self.mcp_tools_cache = {}
-        self.tool_execution_history = []
+        self.tool_execution_history = deque(maxlen=_MAX_TOOL_EXECUTION_HISTORY)
         self.config: Optional[AgentConfig] = None  # Agent configuration
+        # Parsed intent/entities for repeated (exact) and restated (semantic)
+        # queries, so those skip the parse LLM call
+        self._parse_cache = TTLCache(ttl_seconds=300.0, max_entries=1024)
+        self._parse_semantic_cache = SemanticCache(
+            similarity_threshold=0.95, ttl_seconds=300.0
+        )
+        self._init_task: Optional[asyncio.Future] = None
+        # Health endpoints poll get_agent_status(); recompute at most once a second
+        self._status_cache = TTLCache(ttl_seconds=1.0, max_entries=1)
 
     async def initialize(self) -> None:
         """Initialize the agent with required services including MCP."""
@@ -107,19 +285,26 @@ class MCPOperationsCoordinationAgent:
             self.config = load_agent_config("operations")
             logger.info(f"Loaded agent configuration: {self.config.name}")
             
-            self.nim_client = await get_nim_client()
-            self.hybrid_retriever = await get_hybrid_retriever()
-            self.operations_tools = await get_operations_action_tools()
-
             # Initialize MCP components
             self.mcp_manager = MCPManager()
-            self.tool_discovery = ToolDiscoveryService()
-
-            # Start tool discovery
-            await self.tool_discovery.start_discovery()
-
-            # Initialize reasoning engine
-            self.reasoning_engine = await get_reasoning_engine()
+            tool_discovery = ToolDiscoveryService()
+
+            # The clients, the reasoning engine and tool discovery do not
+            # depend on each other, so bring them up concurrently
+            (
+                self.nim_client,
+                self.hybrid_retriever,
+                self.operations_tools,
+                self.reasoning_engine,
+                _,
+            ) = await asyncio.gather(
+                get_nim_client(),
+                get_hybrid_retriever(),
+                get_operations_action_tools(),
+                get_reasoning_engine(),
+                tool_discovery.start_discovery(),
+            )
+            self.tool_discovery = tool_discovery
 
             # Register MCP sources
             await self._register_mcp_sources()
@@ -131,6 +316,26 @@ class MCPOperationsCoordinationAgent:
             logger.error(f"Failed to initialize MCP Operations Coordination Agent: {e}")
             raise
 
+    def start_initialization(self) -> asyncio.Future:
+        """
+        Start initialize() in the background, once, and return its task.
+
+        A failed or cancelled initialization is restarted on the next call.
+        """
+        task = self._init_task
+        if task is None or (
+            task.done() and (task.cancelled() or task.exception() is not None)
+        ):
+            task = self._init_task = asyncio.ensure_future(self.initialize())
+            # initialize() logs its own failure; mark the exception as retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def ensure_initialized(self) -> None:
+        """Wait for initialization, sharing one run between concurrent callers."""
+        # Shielded so a caller's timeout does not abort the shared run
+        await asyncio.shield(self.start_initialization())
+
     async def _register_mcp_sources(self) -> None:
         """Register MCP sources for tool discovery."""
         try:
@@ -143,16 +348,18 @@ class MCPOperationsCoordinationAgent:
                 get_equipment_adapter,
             )
 
-            # Register the operations adapter as an MCP source
-            operations_adapter = await get_operations_adapter()
-            await self.tool_discovery.register_discovery_source(
-                "operations_action_tools", operations_adapter, "mcp_adapter"
+            # Operations adapter, plus the equipment adapter for equipment dispatch
+            operations_adapter, equipment_adapter = await asyncio.gather(
+                get_operations_adapter(), get_equipment_adapter()
             )
+            sources = [
+                ("operations_action_tools", operations_adapter, "mcp_adapter"),
+                ("equipment_asset_tools", equipment_adapter, "mcp_adapter"),
+            ]
 
-            # Register the equipment adapter as an MCP source for equipment dispatch
-            equipment_adapter = await get_equipment_adapter()
-            await self.tool_discovery.register_discovery_source(
-                "equipment_asset_tools", equipment_adapter, "mcp_adapter"
+            # Each registration runs its own discovery handshake; run them together
+            await asyncio.gather(
+                *(self.tool_discovery.register_discovery_source(*source) for source in sources)
             )
 
             logger.info("MCP sources registered successfully (operations + equipment)")
@@ -167,6 +374,7 @@ class MCPOperationsCoordinationAgent:
         mcp_results: Optional[Any] = None,
         enable_reasoning: bool = False,
         reasoning_types: Optional[List[str]] = None,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> MCPOperationsResponse:
         """
         Process an operations coordination query with MCP integration.
@@ -176,60 +384,41 @@ class MCPOperationsCoordinationAgent:
             session_id: Session identifier for context
             context: Additional context
             mcp_results: Optional MCP execution results from planner graph
+            on_text: Optional coroutine called with natural-language text as
+                it is generated, before the full response is available
 
         Returns:
             MCPOperationsResponse with MCP tool execution results
         """
         try:
-            # Initialize if needed
+            # Wait for (or start) the shared initialization if it has not finished
             if (
                 not self.nim_client
                 or not self.hybrid_retriever
                 or not self.tool_discovery
             ):
-                await self.initialize()
-
-            # Update conversation context
-            if session_id not in self.conversation_context:
-                self.conversation_context[session_id] = {
-                    "queries": [],
-                    "responses": [],
+                await self.ensure_initialized()
+
+            # Look the session up once (setdefault-style) and keep a local
+            # reference; a new session is registered immediately so concurrent
+            # queries in it append to the same history
+            session_context = self.conversation_context.get(session_id)
+            if session_context is None:
+                session_context = {
+                    "queries": deque(maxlen=_MAX_SESSION_TURNS),
+                    "responses": deque(maxlen=_MAX_SESSION_TURNS),
                     "context": {},
                 }
-
-            # Step 1: Advanced Reasoning Analysis (if enabled and query is complex)
-            reasoning_chain = None
-            if enable_reasoning and self.reasoning_engine and self._is_complex_query(query):
-                try:
-                    # Convert string reasoning types to ReasoningType enum if provided
-                    reasoning_type_enums = None
-                    if reasoning_types:
-                        reasoning_type_enums = []
-                        for rt_str in reasoning_types:
-                            try:
-                                rt_enum = ReasoningType(rt_str)
-                                reasoning_type_enums.append(rt_enum)
-                            except ValueError:
-                                logger.warning(f"Invalid reasoning type: {rt_str}, skipping")
-                    
-                    # Determine reasoning types if not provided
-                    if reasoning_type_enums is None:
-                        reasoning_type_enums = self._determine_reasoning_types(query, context)
-
-                    reasoning_chain = await self.reasoning_engine.process_with_reasoning(
-                        query=query,
-                        context=context or {},
-                        reasoning_types=reasoning_type_enums,
-                        session_id=session_id,
-                    )
-                    logger.info(f"Advanced reasoning completed: {len(reasoning_chain.steps)} steps")
-                except Exception as e:
-                    logger.warning(f"Advanced reasoning failed, continuing with standard processing: {e}")
-            else:
-                logger.info("Skipping advanced reasoning for simple query or reasoning disabled")
-
-            # Parse query and identify intent
-            parsed_query = await self._parse_operations_query(query, context)
+                self.conversation_context.set(session_id, session_context)
+
+            # Advanced reasoning (if enabled and query is complex) and query
+            # parsing are independent LLM calls, so run them concurrently
+            parsed_query, reasoning_chain = await asyncio.gather(
+                self._parse_operations_query(query, context),
+                self._run_reasoning(
+                    query, session_id, context, enable_reasoning, reasoning_types
+                ),
+            )
 
             # Use MCP results if provided, otherwise discover tools
             if mcp_results and hasattr(mcp_results, "tool_results"):
@@ -253,7 +442,7 @@ class MCPOperationsCoordinationAgent:
                         logger.warning(f"⚠️ No equipment tools found for dispatch query. All available tools: {[t.name for t in available_tools]}")
 
                 # Create tool execution plan
-                execution_plan = await self._create_tool_execution_plan(
+                execution_plan = self._create_tool_execution_plan(
                     parsed_query, available_tools
                 )
                 parsed_query.tool_execution_plan = execution_plan
@@ -271,19 +460,21 @@ class MCPOperationsCoordinationAgent:
                 if execution_plan:
                     logger.info(f"Executing {len(execution_plan)} tools for intent '{parsed_query.intent}': {[step.get('tool_name') for step in execution_plan]}")
                     tool_results = await self._execute_tool_plan(execution_plan)
-                    logger.info(f"Tool execution completed: {len([r for r in tool_results.values() if r.get('success')])} successful, {len([r for r in tool_results.values() if not r.get('success')])} failed")
+                    successful_count = sum(1 for r in tool_results.values() if r.get('success'))
+                    logger.info(f"Tool execution completed: {successful_count} successful, {len(tool_results) - successful_count} failed")
                 else:
                     logger.warning(f"No tools found for intent '{parsed_query.intent}' - query will be processed without tool execution")
                     tool_results = {}
 
             # Generate response using LLM with tool results (include reasoning chain)
             response = await self._generate_response_with_tools(
-                parsed_query, tool_results, reasoning_chain
+                parsed_query, tool_results, reasoning_chain, on_text
             )
 
-            # Update conversation context
-            self.conversation_context[session_id]["queries"].append(parsed_query)
-            self.conversation_context[session_id]["responses"].append(response)
+            # Update conversation context (re-storing refreshes the session's TTL)
+            session_context["queries"].append(parsed_query)
+            session_context["responses"].append(response)
+            self.conversation_context.set(session_id, session_context)
 
             return response
 
@@ -291,58 +482,100 @@ class MCPOperationsCoordinationAgent:
             logger.error(f"Error processing operations query: {e}")
             return self._create_error_response(str(e), "processing your request")
 
+    async def _run_reasoning(
+        self,
+        query: str,
+        session_id: str,
+        context: Optional[Dict[str, Any]],
+        enable_reasoning: bool,
+        reasoning_types: Optional[List[str]],
+    ) -> Optional[ReasoningChain]:
+        """Run advanced reasoning for complex queries; None when skipped or failed."""
+        if not (enable_reasoning and self.reasoning_engine and self._is_complex_query(query)):
+            logger.info("Skipping advanced reasoning for simple query or reasoning disabled")
+            return None
+
+        try:
+            # Convert string reasoning types to ReasoningType enum if provided
+            reasoning_type_enums = None
+            if reasoning_types:
+                reasoning_type_enums = []
+                for rt_str in reasoning_types:
+                    try:
+                        rt_enum = ReasoningType(rt_str)
+                        reasoning_type_enums.append(rt_enum)
+                    except ValueError:
+                        logger.warning(f"Invalid reasoning type: {rt_str}, skipping")
+
+            # Determine reasoning types if not provided
+            if reasoning_type_enums is None:
+                reasoning_type_enums = self._determine_reasoning_types(query, context)
+
+            reasoning_chain = await self.reasoning_engine.process_with_reasoning(
+                query=query,
+                context=context or {},
+                reasoning_types=reasoning_type_enums,
+                session_id=session_id,
+            )
+            logger.info(f"Advanced reasoning completed: {len(reasoning_chain.steps)} steps")
+            return reasoning_chain
+        except Exception as e:
+            logger.warning(f"Advanced reasoning failed, continuing with standard processing: {e}")
+            return None
+
     async def _parse_operations_query(
         self, query: str, context: Optional[Dict[str, Any]]
     ) -> MCPOperationsQuery:
         """Parse operations query and extract intent and entities."""
         try:
-            # Use LLM to parse the query
-            parse_prompt = [
-                {
-                    "role": "system",
-                    "content": """You are an operations coordination expert. Parse warehouse operations queries and extract intent, entities, and context.
-
-Return JSON format:
-{
-    "intent": "workforce_management",
-    "entities": {"worker_id": "W001", "zone": "A"},
-    "context": {"priority": "high", "shift": "morning"}
-}
+            # Serialized once: used both as part of the cache key and in the prompt
+            context_json = json_dumps(context, sort_keys=True, default=str) if context else ""
+            exact_key = (" ".join(query.lower().split()), context_json)
+            cached = self._parse_cache.get(exact_key)
+
+            # Caller-supplied context can change the parse, so only context-free
+            # queries are matched semantically
+            query_embedding = None
+            if cached is None and not context:
+                query_embedding = await embed_query(self.nim_client, query)
+                if query_embedding is not None:
+                    cached = self._parse_semantic_cache.lookup(
+                        query_embedding, query_identifiers(query)
+                    )
 
-Intent options: workforce_management, task_assignment, shift_planning, kpi_analysis, performance_monitoring, resource_allocation, wave_creation, order_management, workflow_optimization
+            if cached is not None:
+                logger.info(f"Parse cache hit for operations query: {query}")
+                return self._build_parsed_query(query, cached)
 
-Examples:
-- "Create a wave for orders 1001-1010" → {"intent": "wave_creation", "entities": {"order_range": "1001-1010", "zone": "A"}, "context": {"priority": "normal"}}
-- "Assign workers to Zone A" → {"intent": "workforce_management", "entities": {"zone": "A"}, "context": {"priority": "normal"}}
-- "Schedule pick operations" → {"intent": "task_assignment", "entities": {"operation_type": "pick"}, "context": {"priority": "normal"}}
-
-Return only valid JSON.""",
-                },
+            # Use LLM to parse the query
+            parse_prompt = [
+                {"role": "system", "content": _PARSE_SYSTEM_PROMPT},
                 {
                     "role": "user",
-                    "content": f'Query: "{query}"\nContext: {context or {}}',
+                    "content": _PARSE_USER_PROMPT(query=query, context=context_json or "{}"),
                 },
             ]
 
-            response = await self.nim_client.generate_response(parse_prompt)
+            response = await self.nim_client.generate_response(
+                parse_prompt, response_format=_PARSE_RESPONSE_FORMAT
+            )
 
-            # Parse JSON response
+            # Parse JSON response (the fallback still covers endpoints that
+            # do not enforce response_format)
             try:
-                parsed_data = json.loads(response.content)
-            except json.JSONDecodeError:
+                parsed_data = json_loads(_extract_json_object(response.content))
+            except ValueError:
                 # Fallback parsing
                 parsed_data = {
                     "intent": "workforce_management",
                     "entities": {},
                     "context": {},
                 }
+            else:
+                # Only successful parses are worth replaying
+                self._cache_parse(exact_key, query, query_embedding, parsed_data)
 
-            return MCPOperationsQuery(
-                intent=parsed_data.get("intent", "workforce_management"),
-                entities=parsed_data.get("entities", {}),
-                context=parsed_data.get("context", {}),
-                user_query=query,
-            )
+            return self._build_parsed_query(query, parsed_data)
 
         except Exception as e:
             logger.error(f"Error parsing operations query: {e}", exc_info=True)
@@ -352,6 +585,34 @@ Return only valid JSON.""",
                 intent="workforce_management", entities={}, context={}, user_query=query
             )
 
+    @staticmethod
+    def _build_parsed_query(
+        query: str, parsed_data: Dict[str, Any]
+    ) -> MCPOperationsQuery:
+        """Build a fresh query object; process_query mutates it per request."""
+        return MCPOperationsQuery(
+            intent=parsed_data.get("intent", "workforce_management"),
+            entities=dict(parsed_data.get("entities", {})),
+            context=dict(parsed_data.get("context", {})),
+            user_query=query,
+        )
+
+    def _cache_parse(
+        self,
+        exact_key: tuple,
+        query: str,
+        query_embedding: Optional[List[float]],
+        parsed_data: Any,
+    ) -> None:
+        """Remember an LLM parse for exact repeats and restatements of query."""
+        if not isinstance(parsed_data, dict):
+            return
+        self._parse_cache.set(exact_key, parsed_data)
+        if query_embedding is not None:
+            self._parse_semantic_cache.store(
+                query_embedding, parsed_data, query_identifiers(query)
+            )
+
     async def _discover_relevant_tools(
         self, query: MCPOperationsQuery
     ) -> List[DiscoveredTool]:
@@ -450,10 +711,10 @@ Return only valid JSON.""",
                 }
             )
     
-    async def _create_tool_execution_plan(
+    def _create_tool_execution_plan(
         self, query: MCPOperationsQuery, tools: List[DiscoveredTool]
     ) -> List[Dict[str, Any]]:
-        """Create a plan for executing MCP tools."""
+        """Create a plan for executing MCP tools (pure CPU work, no I/O)."""
         try:
             execution_plan = []
             query_lower = query.user_query.lower()
@@ -975,8 +1236,8 @@ Return only valid JSON.""",
             tool_id, result_dict = await execute_single_tool(step, previous_results=results)
             results[tool_id] = result_dict
 
-        successful_count = len([r for r in results.values() if r.get('success')])
-        failed_count = len([r for r in results.values() if not r.get('success')])
+        successful_count = sum(1 for r in results.values() if r.get('success'))
+        failed_count = len(results) - successful_count
         logger.info(f"Executed {len(execution_plan)} tools ({len(independent_tools)} parallel, {len(dependent_tools)} sequential), {successful_count} successful, {failed_count} failed")
         # Log equipment tool execution results specifically
         equipment_results = {k: v for k, v in results.items() if "equipment" in v.get('tool_name', '').lower() or "dispatch" in v.get('tool_name', '').lower()}
@@ -985,17 +1246,20 @@ Return only valid JSON.""",
         return results
 
     async def _generate_response_with_tools(
-        self, query: MCPOperationsQuery, tool_results: Dict[str, Any], reasoning_chain: Optional[ReasoningChain] = None
+        self,
+        query: MCPOperationsQuery,
+        tool_results: Dict[str, Any],
+        reasoning_chain: Optional[ReasoningChain] = None,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> MCPOperationsResponse:
         """Generate response using LLM with tool execution results."""
         try:
-            # Prepare context for LLM
-            successful_results = {
-                k: v for k, v in tool_results.items() if v.get("success", False)
-            }
-            failed_results = {
-                k: v for k, v in tool_results.items() if not v.get("success", False)
-            }
+            # Prepare context for LLM, splitting results in a single pass
+            successful_results, failed_results = {}, {}
+            for tool_id, result in tool_results.items():
+                (successful_results if result.get("success", False) else failed_results)[
+                    tool_id
+                ] = result
             
             logger.info(f"Generating response with {len(successful_results)} successful tool results and {len(failed_results)} failed results")
             if successful_results:
@@ -1010,13 +1274,24 @@ Return only valid JSON.""",
             response_prompt_template = self.config.persona.response_prompt
             system_prompt = self.config.persona.system_prompt
             
+            # Large tool results are encoded off the event loop so one big
+            # payload does not stall other in-flight queries
+            if _exceeds_node_count(tool_results, _OFFLOAD_ENCODE_NODES):
+                retrieved_data, actions_taken = await asyncio.to_thread(
+                    encode_prompt_results, list(successful_results), tool_results
+                )
+            else:
+                retrieved_data, actions_taken = encode_prompt_results(
+                    list(successful_results), tool_results
+                )
+
             # Format the response prompt with actual values
             formatted_response_prompt = response_prompt_template.format(
                 user_query=sanitize_prompt_input(query.user_query),
                 intent=sanitize_prompt_input(query.intent),
-                entities=json.dumps(query.entities, default=str),
-                retrieved_data=json.dumps(successful_results, indent=2, default=str),
-                actions_taken=json.dumps(tool_results, indent=2, default=str),
+                entities=json_dumps(query.entities, default=str),
+                retrieved_data=retrieved_data,
+                actions_taken=actions_taken,
                 conversation_history="",
                 dispatch_instructions=""
             )
@@ -1025,7 +1300,7 @@ Return only valid JSON.""",
             response_prompt = [
                 {
                     "role": "system",
-                    "content": system_prompt + "\n\nIMPORTANT: You MUST return ONLY valid JSON. Do not include any text before or after the JSON.",
+                    "content": system_prompt + _JSON_ONLY_INSTRUCTION,
                 },
                 {
                     "role": "user",
@@ -1035,31 +1310,28 @@ Return only valid JSON.""",
 
             # Use slightly higher temperature for more natural language (0.3 instead of default 0.2)
             # This balances consistency with natural, fluent language
-            response = await self.nim_client.generate_response(
-                response_prompt, 
-                temperature=0.3
-            )
+            streamed = False
+            if on_text is None:
+                response = await self.nim_client.generate_response(
+                    response_prompt,
+                    temperature=0.3,
+                    response_format=_RESPONSE_RESPONSE_FORMAT,
+                )
+                content = response.content
+            else:
+                content, streamed = await stream_natural_language(
+                    self.nim_client, response_prompt, on_text, temperature=0.3
+                )
 
             # Parse JSON response
             try:
-                response_data = json.loads(response.content)
+                # Code fences or prose around the object are skipped up front
+                response_data = json_loads(_extract_json_object(content))
                 logger.info(f"Successfully parsed LLM response: {response_data}")
-            except json.JSONDecodeError as e:
+            except ValueError as e:
                 logger.warning(f"Failed to parse LLM response as JSON: {e}")
-                logger.warning(f"Raw LLM response: {response.content}")
-                
-                # Try to extract JSON from markdown code blocks
-                import re
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response.content, re.DOTALL)
-                if json_match:
-                    try:
-                        response_data = json.loads(json_match.group(1))
-                        logger.info(f"Successfully extracted JSON from code block: {response_data}")
-                    except json.JSONDecodeError:
-                        logger.warning("Failed to parse JSON from code block")
-                        response_data = None
-                else:
-                    response_data = None
+                logger.warning(f"Raw LLM response: {content}")
+                response_data = None
                 
                 # If still no valid JSON, generate natural language from tool results using LLM
                 if response_data is None:
@@ -1079,27 +1351,14 @@ Return only valid JSON.""",
                         
                         # Ask LLM to generate natural language response
                         natural_lang_prompt = [
-                            {
-                                "role": "system",
-                                "content": """You are a warehouse operations expert. Generate a clear, natural, conversational response 
-that explains what was accomplished based on tool execution results. Write in a professional but friendly tone, 
-as if explaining to a colleague. Use complete sentences, vary your sentence structure, and make it sound natural and fluent."""
-                            },
+                            {"role": "system", "content": _NATURAL_LANGUAGE_SYSTEM_PROMPT},
                             {
                                 "role": "user",
-                                "content": f"""The user asked: "{query.user_query}"
-
-The following tools were executed successfully:
-{json.dumps(tool_results_summary, indent=2, default=str)[:1500]}
-
-Generate a natural, conversational response (2-4 sentences) that:
-1. Confirms what was accomplished
-2. Includes specific details (IDs, names, statuses) naturally woven into the explanation
-3. Sounds like a human expert explaining the results
-4. Is clear, professional, and easy to read
-
-Return ONLY the natural language response text (no JSON, no formatting, just the response)."""
-                            }
+                                "content": _NATURAL_LANGUAGE_USER_PROMPT(
+                                    user_query=query.user_query,
+                                    tool_results=json_dumps(tool_results_summary, default=str)[:1500],
+                                ),
+                            },
                         ]
                         
                         try:
@@ -1131,8 +1390,8 @@ Return ONLY the natural language response text (no JSON, no formatting, just the
                             natural_language = " ".join(summaries) if summaries else "I've completed your request successfully."
                     else:
                         # No successful results - use the raw LLM response if it looks reasonable
-                        if response.content and len(response.content.strip()) > 50:
-                            natural_language = response.content.strip()
+                        if content and len(content.strip()) > 50:
+                            natural_language = content.strip()
                         else:
                             natural_language = f"I processed your request regarding {query.intent.replace('_', ' ')}, but I wasn't able to execute the requested actions. Please check the system status and try again."
                     
@@ -1231,20 +1490,15 @@ Return ONLY the natural language response text (no JSON, no formatting, just the
                 # Try to enhance with LLM
                 try:
                     enhance_prompt = [
-                        {
-                            "role": "system",
-                            "content": "You are a warehouse operations expert. Expand and improve the given response to make it more natural, detailed, and conversational while keeping the same meaning."
-                        },
+                        {"role": "system", "content": _ENHANCE_SYSTEM_PROMPT},
                         {
                             "role": "user",
-                            "content": f"""Original response: "{natural_language}"
-
-User query: "{query.user_query}"
-
-Tool results: {len(successful_results)} tools executed successfully
-
-Expand this into a natural, conversational response (2-4 sentences) that explains what was accomplished in a clear, professional tone. Return ONLY the enhanced response text."""
-                        }
+                            "content": _ENHANCE_USER_PROMPT(
+                                natural_language=natural_language,
+                                user_query=query.user_query,
+                                successful_count=len(successful_results),
+                            ),
+                        },
                     ]
                     enhanced_response = await self.nim_client.generate_response(
                         enhance_prompt,
@@ -1276,7 +1530,10 @@ Expand this into a natural, conversational response (2-4 sentences) that explain
                     logger.info(f"Validation suggestions: {validation_result.suggestions}")
             except Exception as e:
                 logger.warning(f"Response validation error: {e}")
-            
+
+            if on_text is not None and not streamed:
+                await on_text(natural_language)
+
             return MCPOperationsResponse(
                 response_type=response_data.get("response_type", "operations_info"),
                 data=response_data.get("data", {}),
@@ -1322,7 +1579,7 @@ Expand this into a natural, conversational response (2-4 sentences) that explain
         """Get all available MCP tools."""
         if not self._check_tool_discovery():
             return []
-        return list(self.tool_discovery.discovered_tools.values())
+        return self.tool_discovery.get_all_tools()
 
     async def get_tools_by_category(
         self, category: ToolCategory
@@ -1379,7 +1636,14 @@ Expand this into a natural, conversational response (2-4 sentences) that explain
         )
     
     def get_agent_status(self) -> Dict[str, Any]:
-        """Get agent status and statistics."""
+        """Get agent status and statistics (cached for up to a second)."""
+        status = self._status_cache.get("status")
+        if status is None:
+            status = self._compute_agent_status()
+            self._status_cache.set("status", status)
+        return status
+
+    def _compute_agent_status(self) -> Dict[str, Any]:
         return {
             "initialized": self._check_tool_discovery(),
             "available_tools": (
@@ -1396,37 +1660,7 @@ Expand this into a natural, conversational response (2-4 sentences) that explain
     
     def _is_complex_query(self, query: str) -> bool:
         """Determine if a query is complex enough to require reasoning."""
-        query_lower = query.lower()
-        complex_keywords = [
-            "analyze",
-            "compare",
-            "relationship",
-            "why",
-            "how",
-            "explain",
-            "investigate",
-            "evaluate",
-            "optimize",
-            "improve",
-            "what if",
-            "scenario",
-            "pattern",
-            "trend",
-            "cause",
-            "effect",
-            "because",
-            "result",
-            "consequence",
-            "due to",
-            "leads to",
-            "recommendation",
-            "suggestion",
-            "strategy",
-            "plan",
-            "alternative",
-            "option",
-        ]
-        return any(keyword in query_lower for keyword in complex_keywords)
+        return _COMPLEX_QUERY_PATTERN.search(query.lower()) is not None
     
     def _check_keywords_in_query(self, query_lower: str, keywords: List[str]) -> bool:
         """
@@ -1483,10 +1717,20 @@ Expand this into a natural, conversational response (2-4 sentences) that explain
 _mcp_operations_agent = None
 
 
-async def get_mcp_operations_agent() -> MCPOperationsCoordinationAgent:
-    """Get the global MCP operations agent instance."""
+def _get_agent_instance() -> MCPOperationsCoordinationAgent:
     global _mcp_operations_agent
     if _mcp_operations_agent is None:
         _mcp_operations_agent = MCPOperationsCoordinationAgent()
-        await _mcp_operations_agent.initialize()
     return _mcp_operations_agent
+
+
+def start_mcp_operations_agent_warmup() -> asyncio.Future:
+    """Begin initializing the global agent in the background (e.g. at startup)."""
+    return _get_agent_instance().start_initialization()
+
+
+async def get_mcp_operations_agent() -> MCPOperationsCoordinationAgent:
+    """Get the global MCP operations agent instance, waiting for initialization."""
+    agent = _get_agent_instance()
+    await agent.ensure_initialized()
+    return agent
@@ -21,24 +21,256 @@ and operational KPI tracking for warehouse operations.
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, asdict
+import os
+import re
+import time
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from dataclasses import dataclass, asdict, fields, replace
 import json
 from datetime import datetime, timedelta
 import asyncio
 
+from src.api.services.cache.semantic_cache import SemanticCache
+from src.api.services.cache.ttl_cache import TTLCache
 from src.api.services.llm.nim_client import get_nim_client, LLMResponse
 from src.retrieval.hybrid_retriever import get_hybrid_retriever, SearchContext
 from src.retrieval.structured.task_queries import TaskQueries, Task
 from src.retrieval.structured.telemetry_queries import TelemetryQueries
 from src.api.utils.log_utils import sanitize_prompt_input
 from src.api.services.agent_config import load_agent_config, AgentConfig
+from src.api.utils.json_utils import json_dumps, json_loads
+from src.api.utils.prompt_utils import (
+    PROMPT_MAX_CHARS,
+    compact_for_prompt,
+    embed_query,
+    prompt_cache_key,
+    query_identifiers,
+    stream_natural_language,
+)
 from .action_tools import get_operations_action_tools, OperationsActionTools
 
 logger = logging.getLogger(__name__)
 
+# Read-only intents whose responses may be replayed for repeated queries
+_CACHEABLE_INTENTS = frozenset(
+    {"workforce", "task_management", "equipment", "kpi", "scheduling"}
+)
+
+# A cached response is only reused when the session's most recent intents
+# match, so a follow-up is never answered from a different conversation thread
+_CONTEXT_CHAIN_TURNS = 3
+
+
+# Intents whose responses never use the task summary, so it is not fetched
+_NO_TASK_SUMMARY_INTENTS = frozenset({"equipment", "workforce"})
+
+# Replies larger than this are parsed in a worker thread; below it the
+# thread hand-off costs more than the parse itself
+_OFFLOAD_PARSE_BYTES = 256 * 1024
+
+_JSON_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+# Task attributes passed on to prompts and response data
+_TASK_FIELDS = tuple(field.name for field in fields(Task))
+
+# Characters kept per conversation turn when rendering history into prompts
+_HISTORY_TURN_MAX_CHARS = 200
+
+# Conversation turns kept per session
+_MAX_HISTORY_TURNS = 10
+
+# Sessions are dropped once idle for the TTL (least recently used go first
+# beyond the cap), so conversation memory stays bounded on long-running servers
+_MAX_SESSIONS = 10_000
+_SESSION_TTL_SECONDS = 3600
+
+# Escaped braces or the opening brace of a str.format replacement field
+_TEMPLATE_BRACE_PATTERN = re.compile(r"\{\{|\}\}|\{")
+
+# Keyword buckets for local intent detection, checked in order
+_INTENT_KEYWORDS = (
+    (
+        "workforce",
+        (
+            "shift",
+            "workforce",
+            "employee",
+            "staff",
+            "team",
+            "worker",
+            "workers",
+            "active workers",
+            "how many",
+        ),
+    ),
+    ("task_assignment", ("assign", "task assignment", "assign task")),
+    ("workload_rebalance", ("rebalance", "workload", "balance")),
+    ("pick_wave", ("wave", "pick wave", "generate wave")),
+    ("optimize_paths", ("optimize", "path", "route", "efficiency")),
+    ("shift_management", ("shift management", "manage shift", "schedule shift")),
+    ("dock_scheduling", ("dock", "appointment", "scheduling")),
+    ("equipment_dispatch", ("dispatch", "equipment dispatch", "send equipment")),
+    ("publish_kpis", ("publish", "kpi", "metrics", "dashboard")),
+    (
+        "task_management",
+        (
+            "task",
+            "tasks",
+            "work",
+            "job",
+            "pick",
+            "pack",
+            "latest",
+            "pending",
+            "in progress",
+            "assignment",
+            "assignments",
+        ),
+    ),
+    ("equipment", ("equipment", "forklift", "conveyor", "machine")),
+    ("kpi", ("performance", "productivity")),
+    ("scheduling", ("schedule", "planning", "roster")),
+)
+
+# Endings a keyword may carry and still match ("shifts", "assigned", "picking")
+_KEYWORD_SUFFIXES = ("", "s", "es", "d", "ed", "ing")
+
+
+def _keyword_forms(word: str) -> Tuple[str, ...]:
+    """A single keyword plus its plural and inflected forms."""
+    return tuple(word + suffix for suffix in _KEYWORD_SUFFIXES)
+
+
+# Per bucket: single words (with their inflected forms) matched against the
+# query's tokens as a set, and the few multi-word phrases that still need a
+# substring check
+_INTENT_KEYWORD_SETS = tuple(
+    (
+        intent,
+        frozenset(
+            form
+            for word in keywords
+            if " " not in word
+            for form in _keyword_forms(word)
+        ),
+        tuple(word for word in keywords if " " in word),
+    )
+    for intent, keywords in _INTENT_KEYWORDS
+)
+
+_WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+@lru_cache(maxsize=32)
+def _split_prompt(system_prompt: str, template: str) -> Tuple[str, str]:
+    """
+    Move a prompt template's static head into the system message.
+
+    Everything before the line holding the first replacement field is
+    appended to the system prompt, so the system message is byte-identical
+    across calls and can be served from the provider's prefix cache. Returns
+    (system message, remaining template to format into the user message).
+    """
+    first_field = next(
+        (m.start() for m in _TEMPLATE_BRACE_PATTERN.finditer(template) if m.group() == "{"),
+        None,
+    )
+    if first_field is None:
+        return system_prompt, template
+
+    split_at = template.rfind("\n", 0, first_field) + 1
+    head = template[:split_at].replace("{{", "{").replace("}}", "}").strip()
+    if not head:
+        return system_prompt, template
+    return f"{system_prompt.rstrip()}\n\n{head}", template[split_at:]
+
+
+def _parse_llm_json(content: str) -> Any:
+    """
+    Parse a JSON reply from the LLM, tolerating code fences and surrounding prose.
+
+    Raises:
+        ValueError: If no JSON document can be decoded from the reply
+    """
+    text = content.strip()
+    fenced = _JSON_FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    try:
+        return json_loads(text)
+    except ValueError:
+        # Retry on the outermost {...} span when prose surrounds the object
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return json_loads(text[start : end + 1])
+
+
+async def _parse_llm_json_async(content: str) -> Any:
+    """Parse an LLM reply, moving very large payloads off the event loop."""
+    if len(content) > _OFFLOAD_PARSE_BYTES:
+        return await asyncio.to_thread(_parse_llm_json, content)
+    return _parse_llm_json(content)
+
+
+def _task_to_dict(task: Task) -> Dict[str, Any]:
+    """Shallow field projection of a Task; asdict() would deep-copy the payload."""
+    return {name: getattr(task, name) for name in _TASK_FIELDS}
+
+
+def _tasks_to_table(title: str, tasks: Sequence[Dict[str, Any]], limit: int) -> str:
+    """Render task dicts as a pipe-delimited table, far fewer tokens than dicts."""
+    rows = [f"{title} ({len(tasks)}):", "id|kind|priority|assignee"]
+    for task in islice(tasks, limit):
+        payload = task.get("payload")
+        priority = payload.get("priority", "medium") if isinstance(payload, dict) else "medium"
+        rows.append(
+            f"{task.get('id', 'N/A')}|{task.get('kind', 'unknown')}|{priority}|"
+            f"{task.get('assignee') or '-'}"
+        )
+    if len(tasks) > limit:
+        rows.append(f"... and {len(tasks) - limit} more")
+    return "\n".join(rows) + "\n"
 
-@dataclass
+
+def _compact_json(value: Any, max_chars: int = PROMPT_MAX_CHARS) -> str:
+    """Compact JSON for a prompt, cut at max_chars."""
+    text = json_dumps(compact_for_prompt(value), default=str)
+    if len(text) > max_chars:
+        return text[:max_chars] + "...[truncated]"
+    return text
+
+
+def _render_history(turns: Sequence[Dict]) -> str:
+    """One compact line per turn; timestamps are left out of the prompt."""
+    return "; ".join(
+        _compact_json(
+            {key: turn.get(key) for key in ("query", "intent", "response_type")},
+            _HISTORY_TURN_MAX_CHARS,
+        )
+        for turn in turns
+    )
+
+
+def _recent_turns(history: Sequence[Dict], count: int) -> List[Dict]:
+    """The newest count turns of a history deque, oldest first."""
+    return list(islice(history, max(0, len(history) - count), None))
+
+
+@dataclass(slots=True, frozen=True)
 class OperationsQuery:
     """Structured operations query."""
 
@@ -48,7 +280,7 @@ class OperationsQuery:
     user_query: str  # Original user query
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OperationsResponse:
     """Structured operations response."""
 
@@ -60,7 +292,7 @@ class OperationsResponse:
     actions_taken: List[Dict[str, Any]]  # Actions performed by the agent
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkforceInfo:
     """Workforce information structure."""
 
@@ -71,7 +303,7 @@ class WorkforceInfo:
     productivity_score: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TaskAssignment:
     """Task assignment structure."""
 
@@ -83,6 +315,72 @@ class TaskAssignment:
     status: str
 
 
+def _render_workforce_context(workforce_info: Dict[str, Any]) -> str:
+    """Render workforce info as the prompt's "Workforce Info" block."""
+    shifts = workforce_info.get("shifts", {})
+
+    # Calculate total workers
+    total_workers = sum(shift.get("total_count", 0) for shift in shifts.values())
+
+    workforce_context = f"Workforce Info:\n"
+    workforce_context += f"- Total Active Workers: {total_workers}\n"
+
+    for shift_name, shift_data in shifts.items():
+        workforce_context += f"- {shift_name.title()} Shift: {shift_data.get('total_count', 0)} workers\n"
+        workforce_context += f"  - Active Tasks: {shift_data.get('active_tasks', 0)}\n"
+        workforce_context += f"  - Employees: {', '.join([emp.get('name', 'Unknown') for emp in shift_data.get('employees', [])])}\n"
+
+    if workforce_info.get("productivity_metrics"):
+        metrics = workforce_info["productivity_metrics"]
+        workforce_context += f"- Productivity Metrics:\n"
+        workforce_context += f"  - Picks per hour: {metrics.get('picks_per_hour', 0)}\n"
+        workforce_context += f"  - Packages per hour: {metrics.get('packages_per_hour', 0)}\n"
+        workforce_context += f"  - Accuracy rate: {metrics.get('accuracy_rate', 0)}%\n"
+
+    return workforce_context
+
+
+# Demonstration workforce data (there is no workforce source yet). Built once
+# and shared by every workforce query, so callers must not mutate it.
+_SIMULATED_WORKFORCE: Dict[str, Any] = {
+    "shifts": {
+        "morning": {
+            "start_time": "06:00",
+            "end_time": "14:00",
+            "employees": [
+                {"name": "John Smith", "role": "Picker", "status": "active"},
+                {"name": "Sarah Johnson", "role": "Packer", "status": "active"},
+                {
+                    "name": "Mike Wilson",
+                    "role": "Forklift Operator",
+                    "status": "active",
+                },
+            ],
+            "total_count": 3,
+            "active_tasks": 8,
+        },
+        "afternoon": {
+            "start_time": "14:00",
+            "end_time": "22:00",
+            "employees": [
+                {"name": "Lisa Brown", "role": "Picker", "status": "active"},
+                {"name": "David Lee", "role": "Packer", "status": "active"},
+                {"name": "Amy Chen", "role": "Supervisor", "status": "active"},
+            ],
+            "total_count": 3,
+            "active_tasks": 6,
+        },
+    },
+    "productivity_metrics": {
+        "picks_per_hour": 45.2,
+        "packages_per_hour": 38.7,
+        "accuracy_rate": 98.5,
+    },
+}
+
+_SIMULATED_WORKFORCE_CONTEXT = _render_workforce_context(_SIMULATED_WORKFORCE)
+
+
 class OperationsCoordinationAgent:
     """
     Operations Coordination Agent with NVIDIA NIM integration.
@@ -101,37 +399,54 @@ class OperationsCoordinationAgent:
         self.task_queries = None
         self.telemetry_queries = None
         self.action_tools = None
-        self.conversation_context = {}  # Maintain conversation context
+        self.conversation_context = TTLCache(
+            ttl_seconds=_SESSION_TTL_SECONDS, max_entries=_MAX_SESSIONS
+        )  # Maintain conversation context
         self.config: Optional[AgentConfig] = None  # Agent configuration
+        self._parse_cache = TTLCache(ttl_seconds=300.0, max_entries=1024)
+        self._exact_response_cache = TTLCache(ttl_seconds=30.0, max_entries=512)
+        self._response_cache = SemanticCache(similarity_threshold=0.92, ttl_seconds=60.0)
+        # Resolve read-only intents locally so those queries need a single LLM call
+        self.local_intent_enabled = (
+            os.getenv("OPERATIONS_LOCAL_INTENT_ENABLED", "true").lower() == "true"
+        )
+        self._inflight_queries: Dict[tuple, asyncio.Future] = {}
+        self._init_lock = asyncio.Lock()
+        self._initialized = False
 
     async def initialize(self) -> None:
-        """Initialize the agent with required services."""
-        try:
-            # Load agent configuration
-            self.config = load_agent_config("operations")
-            logger.info(f"Loaded agent configuration: {self.config.name}")
-            
-            self.nim_client = await get_nim_client()
-            self.hybrid_retriever = await get_hybrid_retriever()
+        """Initialize the agent with required services (once; safe to call concurrently)."""
+        async with self._init_lock:
+            if self._initialized:
+                return
+            try:
+                # Load agent configuration
+                self.config = load_agent_config("operations")
+                logger.info(f"Loaded agent configuration: {self.config.name}")
+                
+                self.nim_client = await get_nim_client()
+                self.hybrid_retriever = await get_hybrid_retriever()
 
-            # Initialize task and telemetry queries
-            from src.retrieval.structured.sql_retriever import get_sql_retriever
+                # Initialize task and telemetry queries
+                from src.retrieval.structured.sql_retriever import get_sql_retriever
 
-            sql_retriever = await get_sql_retriever()
-            self.task_queries = TaskQueries(sql_retriever)
-            self.telemetry_queries = TelemetryQueries(sql_retriever)
-            self.action_tools = await get_operations_action_tools()
+                sql_retriever = await get_sql_retriever()
+                self.task_queries = TaskQueries(sql_retriever)
+                self.telemetry_queries = TelemetryQueries(sql_retriever)
+                self.action_tools = await get_operations_action_tools()
 
-            logger.info("Operations Coordination Agent initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Operations Coordination Agent: {e}")
-            raise
+                self._initialized = True
+                logger.info("Operations Coordination Agent initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize Operations Coordination Agent: {e}")
+                raise
 
     async def process_query(
         self,
         query: str,
         session_id: str = "default",
         context: Optional[Dict[str, Any]] = None,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> OperationsResponse:
         """
         Process operations-related queries with full intelligence.
@@ -140,26 +455,86 @@ class OperationsCoordinationAgent:
             query: User's operations query
             session_id: Session identifier for context
             context: Additional context
+            on_text: Optional coroutine called with natural-language text as
+                it is generated, before the full response is available
 
         Returns:
             OperationsResponse with structured data and natural language
         """
+        # Identical queries racing in one session (double submits, SSE
+        # reconnects) share a single run instead of repeating LLM and SQL work
+        request_key = (
+            session_id,
+            query,
+            json_dumps(context, sort_keys=True, default=str) if context else "",
+        )
+        inflight = self._inflight_queries.get(request_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._process_query(query, session_id, context, on_text)
+            )
+            self._inflight_queries[request_key] = inflight
+            inflight.add_done_callback(
+                lambda _: self._inflight_queries.pop(request_key, None)
+            )
+            # Shielded so one caller's cancellation does not fail the others
+            return await asyncio.shield(inflight)
+
+        # Joined an existing run: its text went to the first caller's on_text
+        response = await asyncio.shield(inflight)
+        if on_text is not None:
+            await on_text(response.natural_language)
+        return response
+
+    async def _process_query(
+        self,
+        query: str,
+        session_id: str,
+        context: Optional[Dict[str, Any]],
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> OperationsResponse:
         try:
             # Initialize if needed
-            if not self.nim_client or not self.hybrid_retriever:
+            if not self._initialized:
                 await self.initialize()
 
             # Update conversation context
-            if session_id not in self.conversation_context:
-                self.conversation_context[session_id] = {
-                    "history": [],
-                    "current_focus": None,
-                    "last_entities": {},
-                }
+            self._session_context(session_id)
+
+            # L1: verbatim repeats of a recent read-only query are served without
+            # any LLM call. Both tiers are keyed on the session's recent intents.
+            context_chain = self._context_chain(session_id)
+            exact_key = (
+                " ".join(query.lower().split()),
+                json_dumps(context, sort_keys=True, default=str) if context else "",
+                context_chain,
+            )
+            cached = self._exact_response_cache.get(exact_key)
+            if cached is not None:
+                logger.info(f"Exact cache hit for operations query: {query}")
+                return await self._serve_cached_response(
+                    session_id, query, cached, on_text
+                )
 
             # Step 1: Understand intent and extract entities using LLM
             operations_query = await self._understand_query(query, session_id, context)
 
+            # L2: restatements of a recent read-only query. Only looked up once
+            # the intent is known to be read-only, since a paraphrased action
+            # ("Rebalance the workload") can sit close to a cached lookup;
+            # caller-supplied context can change the answer, so skip it then
+            query_embedding = None
+            partition = (context_chain, query_identifiers(query))
+            if operations_query.intent in _CACHEABLE_INTENTS and not context:
+                query_embedding = await embed_query(self.nim_client, query)
+                if query_embedding is not None:
+                    cached = self._response_cache.lookup(query_embedding, partition)
+                    if cached is not None:
+                        logger.info(f"Semantic cache hit for operations query: {query}")
+                        return await self._serve_cached_response(
+                            session_id, query, (operations_query, cached[1]), on_text
+                        )
+
             # Step 2: Retrieve relevant data using hybrid retriever and task queries
             retrieved_data = await self._retrieve_operations_data(operations_query)
 
@@ -168,9 +543,19 @@ class OperationsCoordinationAgent:
 
             # Step 4: Generate intelligent response using LLM
             response = await self._generate_operations_response(
-                operations_query, retrieved_data, session_id, actions_taken
+                operations_query, retrieved_data, session_id, actions_taken, on_text
             )
 
+            if (
+                operations_query.intent in _CACHEABLE_INTENTS
+                and response.response_type != "error"
+            ):
+                self._exact_response_cache.set(exact_key, (operations_query, response))
+                if query_embedding is not None:
+                    self._response_cache.store(
+                        query_embedding, (operations_query, response), partition
+                    )
+
             # Step 5: Update conversation context
             self._update_context(session_id, operations_query, response)
 
@@ -187,10 +572,51 @@ class OperationsCoordinationAgent:
                 actions_taken=[],
             )
 
+    def _session_context(self, session_id: str) -> Dict[str, Any]:
+        """Return the session's context, registering a new session if needed."""
+        session_context = self.conversation_context.get(session_id)
+        if session_context is None:
+            session_context = {
+                "history": deque(maxlen=_MAX_HISTORY_TURNS),
+                "current_focus": None,
+                "last_entities": {},
+            }
+            self.conversation_context.set(session_id, session_context)
+        return session_context
+
+    def _context_chain(self, session_id: str) -> tuple:
+        """Intents of the session's most recent turns, oldest first."""
+        history = self.conversation_context.get(session_id, {}).get("history", ())
+        return tuple(
+            turn["intent"] for turn in _recent_turns(history, _CONTEXT_CHAIN_TURNS)
+        )
+
+    async def _serve_cached_response(
+        self,
+        session_id: str,
+        query: str,
+        cached: tuple,
+        on_text: Optional[Callable[[str], Awaitable[None]]],
+    ) -> OperationsResponse:
+        """Record and return a cached (OperationsQuery, OperationsResponse) pair."""
+        cached_query, response = cached
+        self._update_context(session_id, replace(cached_query, user_query=query), response)
+        if on_text is not None:
+            await on_text(response.natural_language)
+        return response
+
     async def _understand_query(
         self, query: str, session_id: str, context: Optional[Dict[str, Any]]
     ) -> OperationsQuery:
         """Use LLM to understand query intent and extract entities."""
+        # Queries naming IDs, zones or counts still go to the LLM for entities
+        if self.local_intent_enabled and not query_identifiers(query):
+            local_query = self._fallback_intent_detection(query)
+            if local_query.intent in _CACHEABLE_INTENTS and local_query.context.get(
+                "keyword_match"
+            ):
+                return local_query
+
         try:
             # Build context-aware prompt
             conversation_history = self.conversation_context.get(session_id, {}).get(
@@ -198,6 +624,12 @@ class OperationsCoordinationAgent:
             )
             context_str = self._build_context_string(conversation_history, context)
 
+            # The parse only depends on the query and the rendered context
+            parse_key = (" ".join(query.lower().split()), context_str)
+            cached = self._parse_cache.get(parse_key)
+            if cached is not None:
+                return self._build_operations_query(query, cached)
+
             # Sanitize user input to prevent template injection
             safe_query = sanitize_prompt_input(query)
             safe_context = sanitize_prompt_input(context_str)
@@ -206,8 +638,10 @@ class OperationsCoordinationAgent:
             if self.config is None:
                 self.config = load_agent_config("operations")
             
-            understanding_prompt_template = self.config.persona.understanding_prompt
-            system_prompt = self.config.persona.system_prompt
+            system_prompt, understanding_prompt_template = _split_prompt(
+                self.config.persona.system_prompt,
+                self.config.persona.understanding_prompt,
+            )
             
             # Format the understanding prompt with actual values
             prompt = understanding_prompt_template.format(
@@ -223,106 +657,63 @@ class OperationsCoordinationAgent:
                 {"role": "user", "content": prompt},
             ]
 
+            # Intent/entity extraction is a small classification task, so it
+            # runs on the extraction model; generation stays on the main model
             response = await self.nim_client.generate_response(
-                messages, temperature=0.1
+                messages,
+                temperature=0.1,
+                model="extraction",
+                prompt_cache_key=prompt_cache_key(system_prompt),
             )
 
             # Parse LLM response
             try:
-                parsed_response = json.loads(response.content)
-                return OperationsQuery(
-                    intent=parsed_response.get("intent", "general"),
-                    entities=parsed_response.get("entities", {}),
-                    context=parsed_response.get("context", {}),
-                    user_query=query,
-                )
-            except json.JSONDecodeError:
+                parsed_response = await _parse_llm_json_async(response.content)
+                operations_query = self._build_operations_query(query, parsed_response)
+            except ValueError:
                 # Fallback to simple intent detection
                 return self._fallback_intent_detection(query)
 
+            # Only successful LLM parses are worth replaying
+            self._parse_cache.set(parse_key, parsed_response)
+            return operations_query
+
         except Exception as e:
             logger.error(f"Query understanding failed: {e}")
             return self._fallback_intent_detection(query)
 
+    @staticmethod
+    def _build_operations_query(
+        query: str, parsed_response: Dict[str, Any]
+    ) -> OperationsQuery:
+        """Build a fresh query object from a parsed LLM reply."""
+        return OperationsQuery(
+            intent=parsed_response.get("intent", "general"),
+            entities=dict(parsed_response.get("entities") or {}),
+            context=dict(parsed_response.get("context") or {}),
+            user_query=query,
+        )
+
     def _fallback_intent_detection(self, query: str) -> OperationsQuery:
         """Fallback intent detection using keyword matching."""
         query_lower = query.lower()
-
-        if any(
-            word in query_lower
-            for word in [
-                "shift",
-                "workforce",
-                "employee",
-                "staff",
-                "team",
-                "worker",
-                "workers",
-                "active workers",
-                "how many",
-            ]
-        ):
-            intent = "workforce"
-        elif any(
-            word in query_lower for word in ["assign", "task assignment", "assign task"]
-        ):
-            intent = "task_assignment"
-        elif any(word in query_lower for word in ["rebalance", "workload", "balance"]):
-            intent = "workload_rebalance"
-        elif any(
-            word in query_lower for word in ["wave", "pick wave", "generate wave"]
-        ):
-            intent = "pick_wave"
-        elif any(
-            word in query_lower for word in ["optimize", "path", "route", "efficiency"]
-        ):
-            intent = "optimize_paths"
-        elif any(
-            word in query_lower
-            for word in ["shift management", "manage shift", "schedule shift"]
-        ):
-            intent = "shift_management"
-        elif any(word in query_lower for word in ["dock", "appointment", "scheduling"]):
-            intent = "dock_scheduling"
-        elif any(
-            word in query_lower
-            for word in ["dispatch", "equipment dispatch", "send equipment"]
-        ):
-            intent = "equipment_dispatch"
-        elif any(
-            word in query_lower for word in ["publish", "kpi", "metrics", "dashboard"]
-        ):
-            intent = "publish_kpis"
-        elif any(
-            word in query_lower
-            for word in [
-                "task",
-                "tasks",
-                "work",
-                "job",
-                "pick",
-                "pack",
-                "latest",
-                "pending",
-                "in progress",
-                "assignment",
-                "assignments",
-            ]
-        ):
-            intent = "task_management"
-        elif any(
-            word in query_lower
-            for word in ["equipment", "forklift", "conveyor", "machine"]
-        ):
-            intent = "equipment"
-        elif any(word in query_lower for word in ["performance", "productivity"]):
-            intent = "kpi"
-        elif any(word in query_lower for word in ["schedule", "planning", "roster"]):
-            intent = "scheduling"
-        else:
-            intent = "general"
-
-        return OperationsQuery(intent=intent, entities={}, context={}, user_query=query)
+        tokens = set(_WORD_PATTERN.findall(query_lower))
+
+        matched = [
+            intent
+            for intent, words, phrases in _INTENT_KEYWORD_SETS
+            if not tokens.isdisjoint(words)
+            or any(phrase in query_lower for phrase in phrases)
+        ]
+        intent = matched[0] if matched else "general"
+
+        return OperationsQuery(
+            intent=intent,
+            entities={},
+            # Set when exactly one bucket matched, i.e. the intent is unambiguous
+            context={"keyword_match": len(matched) == 1},
+            user_query=query,
+        )
 
     async def _retrieve_operations_data(
         self, operations_query: OperationsQuery
@@ -330,32 +721,41 @@ class OperationsCoordinationAgent:
         """Retrieve relevant operations data."""
         try:
             data = {}
+            intent = operations_query.intent
 
-            # Get task summary
-            if self.task_queries:
-                task_summary = await self.task_queries.get_task_summary()
-                data["task_summary"] = task_summary
+            # The queries are independent, so they run concurrently on the pool
+            queries = {}
+            if self.task_queries and intent not in _NO_TASK_SUMMARY_INTENTS:
+                queries["task_summary"] = self.task_queries.get_task_summary()
 
-            # Get tasks by status
-            if operations_query.intent == "task_management":
-                pending_tasks = await self.task_queries.get_tasks_by_status(
-                    "pending", limit=20
-                )
-                in_progress_tasks = await self.task_queries.get_tasks_by_status(
-                    "in_progress", limit=20
+            # Get pending and in-progress tasks in a single query
+            if intent == "task_management":
+                queries["tasks_by_status"] = self.task_queries.get_tasks_by_statuses(
+                    ("pending", "in_progress"), limit=20
                 )
-                data["pending_tasks"] = [asdict(task) for task in pending_tasks]
-                data["in_progress_tasks"] = [asdict(task) for task in in_progress_tasks]
 
             # Get equipment health status
-            if operations_query.intent == "equipment":
-                equipment_health = (
-                    await self.telemetry_queries.get_equipment_health_status()
+            if intent == "equipment":
+                queries["equipment_health"] = (
+                    self.telemetry_queries.get_equipment_health_status()
                 )
-                data["equipment_health"] = equipment_health
+
+            results = await asyncio.gather(*queries.values(), return_exceptions=True)
+            for key, result in zip(queries, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Operations data retrieval failed for {key}: {result}")
+                else:
+                    data[key] = result
+
+            tasks_by_status = data.pop("tasks_by_status", None)
+            if tasks_by_status is not None:
+                for status in ("pending", "in_progress"):
+                    data[f"{status}_tasks"] = [
+                        _task_to_dict(task) for task in tasks_by_status[status]
+                    ]
 
             # Get workforce simulation data (since we don't have real workforce data yet)
-            if operations_query.intent == "workforce":
+            if intent == "workforce":
                 data["workforce_info"] = self._simulate_workforce_data()
 
             return data
@@ -391,8 +791,6 @@ class OperationsCoordinationAgent:
             if operations_query.intent == "task_assignment":
                 # Extract task details from query if not in entities
                 if not task_type:
-                    import re
-
                     if "pick" in operations_query.user_query.lower():
                         task_type = "pick"
                     elif "pack" in operations_query.user_query.lower():
@@ -403,8 +801,6 @@ class OperationsCoordinationAgent:
                         task_type = "general"
 
                 if not quantity:
-                    import re
-
                     qty_matches = re.findall(r"\b(\d+)\b", operations_query.user_query)
                     if qty_matches:
                         quantity = int(qty_matches[0])
@@ -446,8 +842,6 @@ class OperationsCoordinationAgent:
                 # Extract order IDs from the query if not in entities
                 if not order_ids:
                     # Try to extract from the user query
-                    import re
-
                     order_matches = re.findall(r"ORD\d+", operations_query.user_query)
                     if order_matches:
                         order_ids = order_matches
@@ -602,42 +996,8 @@ class OperationsCoordinationAgent:
             ]
 
     def _simulate_workforce_data(self) -> Dict[str, Any]:
-        """Simulate workforce data for demonstration."""
-        return {
-            "shifts": {
-                "morning": {
-                    "start_time": "06:00",
-                    "end_time": "14:00",
-                    "employees": [
-                        {"name": "John Smith", "role": "Picker", "status": "active"},
-                        {"name": "Sarah Johnson", "role": "Packer", "status": "active"},
-                        {
-                            "name": "Mike Wilson",
-                            "role": "Forklift Operator",
-                            "status": "active",
-                        },
-                    ],
-                    "total_count": 3,
-                    "active_tasks": 8,
-                },
-                "afternoon": {
-                    "start_time": "14:00",
-                    "end_time": "22:00",
-                    "employees": [
-                        {"name": "Lisa Brown", "role": "Picker", "status": "active"},
-                        {"name": "David Lee", "role": "Packer", "status": "active"},
-                        {"name": "Amy Chen", "role": "Supervisor", "status": "active"},
-                    ],
-                    "total_count": 3,
-                    "active_tasks": 6,
-                },
-            },
-            "productivity_metrics": {
-                "picks_per_hour": 45.2,
-                "packages_per_hour": 38.7,
-                "accuracy_rate": 98.5,
-            },
-        }
+        """Simulate workforce data for demonstration (shared; treat as read-only)."""
+        return _SIMULATED_WORKFORCE
 
     async def _generate_operations_response(
         self,
@@ -645,8 +1005,10 @@ class OperationsCoordinationAgent:
         retrieved_data: Dict[str, Any],
         session_id: str,
         actions_taken: Optional[List[Dict[str, Any]]] = None,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> OperationsResponse:
         """Generate intelligent response using LLM with retrieved context."""
+        streamed = False
         try:
             # Build context for LLM
             context_str = self._build_retrieved_context(retrieved_data)
@@ -680,8 +1042,10 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
             if self.config is None:
                 self.config = load_agent_config("operations")
             
-            response_prompt_template = self.config.persona.response_prompt
-            system_prompt = self.config.persona.system_prompt
+            system_prompt, response_prompt_template = _split_prompt(
+                self.config.persona.system_prompt,
+                self.config.persona.response_prompt,
+            )
             
             # Format the response prompt with actual values
             prompt = response_prompt_template.format(
@@ -690,7 +1054,11 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
                 entities=safe_entities,
                 retrieved_data=context_str,
                 actions_taken=actions_str,
-                conversation_history=conversation_history[-3:] if conversation_history else "None",
+                conversation_history=(
+                    _render_history(_recent_turns(conversation_history, 3))
+                    if conversation_history
+                    else "None"
+                ),
                 dispatch_instructions=dispatch_instructions
             )
 
@@ -702,14 +1070,25 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
                 {"role": "user", "content": prompt},
             ]
 
-            response = await self.nim_client.generate_response(
-                messages, temperature=0.2
-            )
+            cache_key = prompt_cache_key(system_prompt)
+            if on_text is None:
+                response = await self.nim_client.generate_response(
+                    messages, temperature=0.2, prompt_cache_key=cache_key
+                )
+                content = response.content
+            else:
+                content, streamed = await stream_natural_language(
+                    self.nim_client,
+                    messages,
+                    on_text,
+                    temperature=0.2,
+                    prompt_cache_key=cache_key,
+                )
 
             # Parse LLM response
             try:
-                parsed_response = json.loads(response.content)
-                return OperationsResponse(
+                parsed_response = await _parse_llm_json_async(content)
+                result = OperationsResponse(
                     response_type=parsed_response.get("response_type", "general"),
                     data=parsed_response.get("data", {}),
                     natural_language=parsed_response.get(
@@ -719,18 +1098,22 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
                     confidence=parsed_response.get("confidence", 0.8),
                     actions_taken=actions_taken or [],
                 )
-            except json.JSONDecodeError:
+            except ValueError:
                 # Fallback response
-                return self._generate_fallback_response(
+                result = self._generate_fallback_response(
                     operations_query, retrieved_data, actions_taken
                 )
 
         except Exception as e:
             logger.error(f"Response generation failed: {e}")
-            return self._generate_fallback_response(
+            result = self._generate_fallback_response(
                 operations_query, retrieved_data, actions_taken
             )
 
+        if on_text is not None and not streamed:
+            await on_text(result.natural_language)
+        return result
+
     def _generate_fallback_response(
         self,
         operations_query: OperationsQuery,
@@ -1062,7 +1445,7 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
             )
 
     def _build_context_string(
-        self, conversation_history: List[Dict], context: Optional[Dict[str, Any]]
+        self, conversation_history: Sequence[Dict], context: Optional[Dict[str, Any]]
     ) -> str:
         """Build context string from conversation history."""
         if not conversation_history and not context:
@@ -1071,11 +1454,13 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
         context_parts = []
 
         if conversation_history:
-            recent_history = conversation_history[-3:]  # Last 3 exchanges
-            context_parts.append(f"Recent conversation: {recent_history}")
+            # Last 3 exchanges
+            context_parts.append(
+                f"Recent conversation: {_render_history(_recent_turns(conversation_history, 3))}"
+            )
 
         if context:
-            context_parts.append(f"Additional context: {context}")
+            context_parts.append(f"Additional context: {_compact_json(context)}")
 
         return "; ".join(context_parts)
 
@@ -1106,79 +1491,28 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
 
                 context_parts.append(task_context)
 
-            # Add pending tasks
-            if "pending_tasks" in retrieved_data:
-                pending_tasks = retrieved_data["pending_tasks"]
-                if pending_tasks:
-                    pending_context = f"Pending Tasks ({len(pending_tasks)}):\n"
-                    for i, task in enumerate(pending_tasks[:3], 1):  # Show first 3
-                        task_id = task.get("id", "N/A")
-                        task_kind = task.get("kind", "Unknown")
-                        priority = (
-                            task.get("payload", {}).get("priority", "medium")
-                            if isinstance(task.get("payload"), dict)
-                            else "medium"
-                        )
-                        pending_context += f"{i}. {task_kind.title()} (ID: {task_id}, Priority: {priority})\n"
-                    if len(pending_tasks) > 3:
-                        pending_context += (
-                            f"... and {len(pending_tasks) - 3} more pending tasks\n"
-                        )
-                    context_parts.append(pending_context)
-
-            # Add in-progress tasks
-            if "in_progress_tasks" in retrieved_data:
-                in_progress_tasks = retrieved_data["in_progress_tasks"]
-                if in_progress_tasks:
-                    in_progress_context = (
-                        f"In Progress Tasks ({len(in_progress_tasks)}):\n"
-                    )
-                    for i, task in enumerate(in_progress_tasks[:3], 1):  # Show first 3
-                        task_id = task.get("id", "N/A")
-                        task_kind = task.get("kind", "Unknown")
-                        assignee = task.get("assignee", "Unassigned")
-                        in_progress_context += f"{i}. {task_kind.title()} (ID: {task_id}, Assigned to: {assignee})\n"
-                    if len(in_progress_tasks) > 3:
-                        in_progress_context += f"... and {len(in_progress_tasks) - 3} more in-progress tasks\n"
-                    context_parts.append(in_progress_context)
+            # Add pending and in-progress tasks as compact tables (first 3 each)
+            for key, title in (
+                ("pending_tasks", "Pending Tasks"),
+                ("in_progress_tasks", "In Progress Tasks"),
+            ):
+                tasks = retrieved_data.get(key)
+                if tasks:
+                    context_parts.append(_tasks_to_table(title, tasks, 3))
 
             # Add workforce info
             if "workforce_info" in retrieved_data:
                 workforce_info = retrieved_data["workforce_info"]
-                shifts = workforce_info.get("shifts", {})
-
-                # Calculate total workers
-                total_workers = sum(
-                    shift.get("total_count", 0) for shift in shifts.values()
+                context_parts.append(
+                    _SIMULATED_WORKFORCE_CONTEXT
+                    if workforce_info is _SIMULATED_WORKFORCE
+                    else _render_workforce_context(workforce_info)
                 )
 
-                workforce_context = f"Workforce Info:\n"
-                workforce_context += f"- Total Active Workers: {total_workers}\n"
-
-                for shift_name, shift_data in shifts.items():
-                    workforce_context += f"- {shift_name.title()} Shift: {shift_data.get('total_count', 0)} workers\n"
-                    workforce_context += (
-                        f"  - Active Tasks: {shift_data.get('active_tasks', 0)}\n"
-                    )
-                    workforce_context += f"  - Employees: {', '.join([emp.get('name', 'Unknown') for emp in shift_data.get('employees', [])])}\n"
-
-                if workforce_info.get("productivity_metrics"):
-                    metrics = workforce_info["productivity_metrics"]
-                    workforce_context += f"- Productivity Metrics:\n"
-                    workforce_context += (
-                        f"  - Picks per hour: {metrics.get('picks_per_hour', 0)}\n"
-                    )
-                    workforce_context += f"  - Packages per hour: {metrics.get('packages_per_hour', 0)}\n"
-                    workforce_context += (
-                        f"  - Accuracy rate: {metrics.get('accuracy_rate', 0)}%\n"
-                    )
-
-                context_parts.append(workforce_context)
-
             # Add equipment health
             if "equipment_health" in retrieved_data:
                 equipment_health = retrieved_data["equipment_health"]
-                context_parts.append(f"Equipment Health: {equipment_health}")
+                context_parts.append(f"Equipment Health: {_compact_json(equipment_health)}")
 
             return (
                 "\n".join(context_parts) if context_parts else "No relevant data found"
@@ -1196,64 +1530,61 @@ IMPORTANT FOR EQUIPMENT DISPATCH:
     ) -> None:
         """Update conversation context."""
         try:
-            if session_id not in self.conversation_context:
-                self.conversation_context[session_id] = {
-                    "history": [],
-                    "current_focus": None,
-                    "last_entities": {},
-                }
+            session_context = self._session_context(session_id)
 
             # Add to history
-            self.conversation_context[session_id]["history"].append(
+            session_context["history"].append(
                 {
                     "query": operations_query.user_query,
                     "intent": operations_query.intent,
                     "response_type": response.response_type,
-                    "timestamp": datetime.now().isoformat(),
+                    # Epoch seconds; formatted only when the history is read
+                    "timestamp": time.time(),
                 }
             )
 
             # Update current focus
             if operations_query.intent != "general":
-                self.conversation_context[session_id][
-                    "current_focus"
-                ] = operations_query.intent
+                session_context["current_focus"] = operations_query.intent
 
             # Update last entities
             if operations_query.entities:
-                self.conversation_context[session_id][
-                    "last_entities"
-                ] = operations_query.entities
-
-            # Keep history manageable
-            if len(self.conversation_context[session_id]["history"]) > 10:
-                self.conversation_context[session_id]["history"] = (
-                    self.conversation_context[session_id]["history"][-10:]
-                )
+                session_context["last_entities"] = operations_query.entities
+
+            # Re-storing refreshes the session's TTL
+            self.conversation_context.set(session_id, session_context)
 
         except Exception as e:
             logger.error(f"Context update failed: {e}")
 
     async def get_conversation_context(self, session_id: str) -> Dict[str, Any]:
         """Get conversation context for a session."""
-        return self.conversation_context.get(
-            session_id, {"history": [], "current_focus": None, "last_entities": {}}
-        )
+        session_context = self.conversation_context.get(session_id)
+        if session_context is None:
+            return {"history": [], "current_focus": None, "last_entities": {}}
+        history = [
+            {**turn, "timestamp": datetime.fromtimestamp(turn["timestamp"]).isoformat()}
+            for turn in session_context["history"]
+        ]
+        return {**session_context, "history": history}
 
     async def clear_conversation_context(self, session_id: str) -> None:
         """Clear conversation context for a session."""
-        if session_id in self.conversation_context:
-            del self.conversation_context[session_id]
+        self.conversation_context.invalidate(session_id)
 
 
 # Global operations agent instance
 _operations_agent: Optional[OperationsCoordinationAgent] = None
+_operations_agent_lock = asyncio.Lock()
 
 
 async def get_operations_agent() -> OperationsCoordinationAgent:
-    """Get or create the global operations agent instance."""
+    """Get the global operations agent instance (initialized exactly once)."""
     global _operations_agent
     if _operations_agent is None:
-        _operations_agent = OperationsCoordinationAgent()
-        await _operations_agent.initialize()
+        async with _operations_agent_lock:
+            if _operations_agent is None:
+                operations_agent = OperationsCoordinationAgent()
+                await operations_agent.initialize()
+                _operations_agent = operations_agent
     return _operations_agent
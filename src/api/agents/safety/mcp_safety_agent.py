@@ -21,12 +21,16 @@ dynamic tool discovery and execution for safety and compliance management.
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, asdict
-import json
+from typing import Dict, List, Literal, Optional, Any, Tuple, Union
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime, timedelta
 import asyncio
 import re
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+from pydantic import BaseModel, Field
 
 from src.api.services.llm.nim_client import get_nim_client, LLMResponse
 from src.retrieval.hybrid_retriever import get_hybrid_retriever, SearchContext
@@ -43,12 +47,313 @@ from src.api.services.reasoning import (
     ReasoningChain,
 )
 from src.api.utils.log_utils import sanitize_prompt_input
+from src.api.utils.json_utils import json_dumps, json_loads
+from src.api.utils.prompt_utils import (
+    embed_query,
+    encode_prompt_results,
+    json_schema_format,
+    prompt_cache_key,
+    query_identifiers,
+)
 from src.api.services.agent_config import load_agent_config, AgentConfig
 from src.api.services.validation import get_response_validator
+from src.api.services.cache.semantic_cache import SemanticCache
+from src.api.services.cache.ttl_cache import TTLCache
+from src.api.services.cache.embedding_store import EmbeddingStore
 from .action_tools import get_safety_action_tools
 
 logger = logging.getLogger(__name__)
 
+# Bounds for in-process history so a long-running server does not grow forever
+_MAX_SESSION_TURNS = 20
+_MAX_TOOL_EXECUTION_HISTORY = 1000
+_MAX_SESSIONS = 10_000
+_SESSION_TTL_SECONDS = 3600
+
+# Intents whose answers only read safety data and can be served from cache
+_CACHEABLE_INTENTS = frozenset(
+    {"policy_lookup", "compliance_check", "safety_audit", "hazard_identification"}
+)
+
+# Tools without side effects; responses that ran any other tool (logging an
+# incident, starting a checklist, broadcasting an alert) are never cached
+_READ_ONLY_TOOLS = frozenset({"get_safety_procedures"})
+
+# Politeness filler that does not change what is being asked
+_QUERY_FILLER_PATTERN = re.compile(
+    r"\b(?:please|kindly|can you|could you|would you|i need to|i want to)\b"
+)
+
+
+class _ParsedSafetyQuerySchema(BaseModel):
+    """Structured output requested from the query-parse LLM call."""
+
+    intent: Literal[
+        "incident_reporting",
+        "compliance_check",
+        "safety_audit",
+        "hazard_identification",
+        "policy_lookup",
+        "training_tracking",
+    ]
+    entities: Dict[str, Any] = Field(default_factory=dict)
+    context: Dict[str, Any] = Field(default_factory=dict)
+
+
+class _SafetyResponseSchema(BaseModel):
+    """Structured output requested from the response-generation LLM call."""
+
+    response_type: str = "safety_info"
+    data: Dict[str, Any] = Field(default_factory=dict)
+    natural_language: str
+    recommendations: List[str] = Field(default_factory=list)
+    confidence: float = 0.7
+    actions_taken: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+# Built once; the NIM client only sends these when structured output is enabled
+_PARSE_RESPONSE_FORMAT = json_schema_format("safety_query", _ParsedSafetyQuerySchema)
+_RESPONSE_RESPONSE_FORMAT = json_schema_format("safety_response", _SafetyResponseSchema)
+
+
+# Keywords for the local intent classifier; a query whose keyword hits point
+# clearly at one intent is parsed without the LLM
+_INTENT_KEYWORDS = (
+    (
+        "incident_reporting",
+        (
+            "incident", "report", "reported", "accident", "injury", "injured",
+            "spill", "spilled", "leak", "leaking", "fire", "flood", "flooding",
+            "collision", "emergency", "issue", "problem",
+        ),
+    ),
+    (
+        "policy_lookup",
+        (
+            "procedure", "procedures", "policy", "policies", "checklist",
+            "guideline", "guidelines", "what are", "how do i", "how should",
+        ),
+    ),
+    ("compliance_check", ("compliance", "compliant", "osha", "regulation", "regulations", "violation")),
+    ("safety_audit", ("audit", "audits", "inspection", "inspections")),
+    ("hazard_identification", ("hazard", "hazards", "hazardous", "unsafe", "risk", "risks")),
+    ("training_tracking", ("training", "trained", "certification", "certifications", "certified")),
+)
+
+# Per intent: single words matched against the query's tokens as a set, and
+# the few multi-word phrases that still need a substring check
+_INTENT_KEYWORD_SETS = tuple(
+    (
+        intent,
+        frozenset(word for word in keywords if " " not in word),
+        tuple(word for word in keywords if " " in word),
+    )
+    for intent, keywords in _INTENT_KEYWORDS
+)
+
+_WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Share of keyword hits the top intent needs before the LLM parse is skipped
+_LOCAL_INTENT_MIN_CONFIDENCE = 0.6
+
+# Intents the keyword classifier may settle without the LLM. Incident
+# reporting is excluded: its plan logs incidents and broadcasts alerts, and
+# keywords cannot tell a report apart from a question about one ("How do I
+# report an injury?")
+_LOCAL_INTENTS = frozenset(
+    {
+        "policy_lookup",
+        "compliance_check",
+        "safety_audit",
+        "hazard_identification",
+        "training_tracking",
+    }
+)
+
+
+def _classify_intent(query: str) -> tuple:
+    """
+    Classify a safety query by keyword hits.
+
+    Returns:
+        (intent, confidence), where confidence is the top intent's share of
+        all keyword hits; (None, 0.0) when no keyword matches
+    """
+    query_lower = query.lower()
+    tokens = set(_WORD_PATTERN.findall(query_lower))
+    scores = {}
+    for intent, words, phrases in _INTENT_KEYWORD_SETS:
+        hits = len(tokens & words) + sum(phrase in query_lower for phrase in phrases)
+        if hits:
+            scores[intent] = hits
+    if not scores:
+        return None, 0.0
+    intent = max(scores, key=scores.get)
+    return intent, scores[intent] / sum(scores.values())
+
+
+# Tools kept from the embedding ranking of the catalog for each query
+_TOOL_ROUTING_TOP_K = 5
+
+# Tool descriptions sent per embedding request when indexing the catalog
+_TOOL_EMBEDDING_BATCH_SIZE = 64
+
+
+def _tool_text(tool: DiscoveredTool) -> str:
+    """Text embedded for a tool: its name, description and capabilities."""
+    return f"{tool.name}: {tool.description}. {', '.join(tool.capabilities)}"
+
+
+# Safety prompts: the system prompts never change, so their prefix-cache keys
+# are computed once below; each *_USER_PROMPT is a bound str.format
+_PARSE_SYSTEM_PROMPT = """You are a safety and compliance expert. Parse warehouse safety queries and extract intent, entities, and context.
+
+Return JSON format:
+{
+    "intent": "incident_reporting",
+    "entities": {
+        "incident_type": "flooding",
+        "location": "Zone A",
+        "severity": "critical",
+        "description": "flooding in Zone A",
+        "reporter": "user"
+    },
+    "context": {"priority": "high", "severity": "critical"}
+}
+
+Intent options: incident_reporting, compliance_check, safety_audit, hazard_identification, policy_lookup, training_tracking
+
+CRITICAL: Extract ALL relevant entities from the query:
+- incident_type: flooding, fire, spill, leak, accident, injury, hazard, etc.
+- location: Zone A, Zone B, Dock D2, warehouse, etc.
+- severity: critical, high, medium, low (infer from incident type - flooding/fire/spill = critical)
+- description: full description of the issue
+- reporter: "user" or "system"
+
+Examples:
+- "we have an issue with flooding in Zone A" → {"intent": "incident_reporting", "entities": {"incident_type": "flooding", "location": "Zone A", "severity": "critical", "description": "flooding in Zone A"}, "context": {"priority": "high", "severity": "critical"}}
+- "Report a safety incident in Zone A" → {"intent": "incident_reporting", "entities": {"location": "Zone A", "severity": "high"}, "context": {"priority": "high"}}
+- "What are the safety procedures for forklift operations?" → {"intent": "policy_lookup", "entities": {"equipment": "forklift", "query": "safety procedures for forklift operations"}, "context": {"priority": "normal"}}
+
+Return only valid JSON."""
+
+_PARSE_USER_PROMPT = 'Query: "{query}"\nContext: {context}'.format
+
+# Appended to the configured response system prompt
+_RESPONSE_FORMAT_INSTRUCTIONS = """
+
+CRITICAL JSON FORMAT REQUIREMENTS:
+1. Return ONLY a valid JSON object - no markdown, no code blocks, no explanations before or after
+2. Your response must start with { and end with }
+3. The 'natural_language' field is MANDATORY and must contain a detailed, informative response
+4. Do NOT put safety data at the top level - all data (policies, hazards, incidents) must be inside the 'data' field
+5. The 'natural_language' field must directly answer the user's question with specific details
+
+REQUIRED JSON STRUCTURE:
+{
+    "response_type": "safety_info",
+    "data": {
+        "policies": [...],
+        "hazards": [...],
+        "incidents": [...]
+    },
+    "natural_language": "Based on your query about [user query], I found the following safety information: [specific details including policy names, hazard types, incident details, etc.]. [Additional context and recommendations].",
+    "recommendations": ["Recommendation 1", "Recommendation 2"],
+    "confidence": 0.85,
+    "actions_taken": [...]
+}
+
+ABSOLUTELY CRITICAL:
+- The 'natural_language' field is REQUIRED and must not be empty
+- Include specific safety details (policy names, hazard types, incident details) in natural_language
+- Return valid JSON only - no other text
+"""
+
+_RESPONSE_USER_SUFFIX = "\n\nRemember: Return ONLY the JSON object with the 'natural_language' field populated with a detailed response."
+
+_NATURAL_LANGUAGE_SYSTEM_PROMPT = """You are a certified warehouse safety and compliance expert. 
+Generate a comprehensive, expert-level natural language response based on the provided data.
+
+CRITICAL: Write in a clear, natural, conversational tone:
+- Use fluent, natural English that reads like a human expert speaking
+- Avoid robotic or template-like language
+- Be specific and detailed, but keep it readable
+- Use active voice when possible
+- Vary sentence structure for better readability
+- Make it sound like you're explaining to a colleague, not a machine
+- Include context and reasoning, not just facts
+- Write complete, well-formed sentences and paragraphs
+
+CRITICAL ANTI-ECHOING RULES - YOU MUST FOLLOW THESE:
+- NEVER start with phrases like "You asked", "You requested", "I'll", "Let me", "As you requested", "Here's what you asked for"
+- NEVER echo or repeat the user's query - start directly with the information or action result
+- Start with the actual information or what was accomplished (e.g., "Forklift operations require..." or "A high-severity incident has been logged...")
+- Write as if explaining to a colleague, not referencing the query
+- DO NOT say "Here's the response:" or "Here's what I found:" - just provide the information directly
+
+Your response must be detailed, informative, and directly answer the user's query WITHOUT echoing it.
+Include specific details from the data (policy names, requirements, hazard types, incident details, etc.) naturally woven into the explanation.
+Provide expert-level analysis and context."""
+
+_NATURAL_LANGUAGE_USER_PROMPT = """The user asked: "{user_query}"
+
+The system retrieved the following data:
+{data}
+
+Tool execution results:
+{tool_results}
+
+Generate a comprehensive, expert-level natural language response that:
+1. Directly answers the user's query WITHOUT echoing the query
+2. Starts immediately with the information (e.g., "Forklift operations require..." or "A high-severity incident has been logged...")
+3. NEVER starts with "You asked", "You requested", "I'll", "Let me", "Here's the response", etc.
+4. Includes specific details from the retrieved data naturally woven into the explanation
+5. Provides expert analysis and recommendations with context
+6. Is written in a clear, natural, conversational tone - like explaining to a colleague
+7. Uses varied sentence structure and flows naturally
+8. Is comprehensive but concise (typically 2-4 well-formed paragraphs)
+
+Write in a way that sounds natural and human, not robotic or template-like. Return ONLY the natural language response text (no JSON, no formatting, just the response text).""".format
+
+_RECOMMENDATIONS_SYSTEM_PROMPT = """You are a certified warehouse safety and compliance expert. 
+Generate actionable, expert-level recommendations based on the user's query and retrieved data.
+Recommendations should be specific, practical, and based on safety best practices and regulatory requirements."""
+
+_RECOMMENDATIONS_USER_PROMPT = """The user asked: "{user_query}"
+Query intent: {intent}
+Query entities: {entities}
+
+Retrieved data:
+{data}
+
+Generate 3-5 actionable, expert-level recommendations that:
+1. Are specific to the user's query and the retrieved data
+2. Follow safety best practices and regulatory requirements
+3. Are practical and implementable
+4. Address the specific context (intent, entities, data)
+
+Return ONLY a JSON array of recommendation strings, for example:
+["Recommendation 1", "Recommendation 2", "Recommendation 3"]
+
+Do not include any other text, just the JSON array.""".format
+
+
+_PARSE_PROMPT_CACHE_KEY = prompt_cache_key(_PARSE_SYSTEM_PROMPT)
+_NATURAL_LANGUAGE_PROMPT_CACHE_KEY = prompt_cache_key(_NATURAL_LANGUAGE_SYSTEM_PROMPT)
+_RECOMMENDATIONS_PROMPT_CACHE_KEY = prompt_cache_key(_RECOMMENDATIONS_SYSTEM_PROMPT)
+
+
+@lru_cache(maxsize=8)
+def _response_system_prompt(system_prompt: str) -> Tuple[str, str]:
+    """The configured system prompt plus format rules, and its cache key."""
+    enhanced = system_prompt + _RESPONSE_FORMAT_INSTRUCTIONS
+    return enhanced, prompt_cache_key(enhanced)
+
+
+def _normalize_query(query: str) -> str:
+    """Lower-case the query and drop filler so restatements share cache entries."""
+    return " ".join(_QUERY_FILLER_PATTERN.sub(" ", query.lower()).split())
+
 
 @dataclass
 class MCPSafetyQuery:
@@ -96,10 +401,24 @@ class MCPSafetyComplianceAgent:
         self.mcp_manager = None
         self.tool_discovery = None
         self.reasoning_engine = None
-        self.conversation_context = {}
+        self.conversation_context = TTLCache(
+            ttl_seconds=_SESSION_TTL_SECONDS, max_entries=_MAX_SESSIONS
+        )
         self.mcp_tools_cache = {}
-        self.tool_execution_history = []
+        self.tool_execution_history = deque(maxlen=_MAX_TOOL_EXECUTION_HISTORY)
         self.config: Optional[AgentConfig] = None  # Agent configuration
+        self._init_task: Optional[asyncio.Future] = None
+        self._inflight_queries: Dict[tuple, asyncio.Future] = {}
+        # Tool embeddings keyed by _tool_text (persisted across restarts in
+        # the embedding store), and the (tools, unit-row matrix) index built
+        # from them for the current tool catalog
+        self._tool_embeddings: Dict[str, Any] = {}
+        self._tool_index: Optional[tuple] = None
+        self._embedding_store = EmbeddingStore()
+        # Exact repeats are served from a short-lived TTL cache; restatements
+        # fall through to the embedding-based semantic cache
+        self._exact_response_cache = TTLCache(ttl_seconds=60.0, max_entries=2048)
+        self._response_cache = SemanticCache(similarity_threshold=0.92, ttl_seconds=300.0)
 
     async def initialize(self) -> None:
         """Initialize the agent with required services including MCP."""
@@ -108,19 +427,26 @@ class MCPSafetyComplianceAgent:
             self.config = load_agent_config("safety")
             logger.info(f"Loaded agent configuration: {self.config.name}")
             
-            self.nim_client = await get_nim_client()
-            self.hybrid_retriever = await get_hybrid_retriever()
-            self.safety_tools = await get_safety_action_tools()
-
             # Initialize MCP components
             self.mcp_manager = MCPManager()
-            self.tool_discovery = ToolDiscoveryService()
-
-            # Start tool discovery
-            await self.tool_discovery.start_discovery()
-
-            # Initialize reasoning engine
-            self.reasoning_engine = await get_reasoning_engine()
+            tool_discovery = ToolDiscoveryService()
+
+            # The clients, the reasoning engine and tool discovery do not
+            # depend on each other, so bring them up concurrently
+            (
+                self.nim_client,
+                self.hybrid_retriever,
+                self.safety_tools,
+                self.reasoning_engine,
+                _,
+            ) = await asyncio.gather(
+                get_nim_client(),
+                get_hybrid_retriever(),
+                get_safety_action_tools(),
+                get_reasoning_engine(),
+                tool_discovery.start_discovery(),
+            )
+            self.tool_discovery = tool_discovery
 
             # Register MCP sources
             await self._register_mcp_sources()
@@ -132,6 +458,26 @@ class MCPSafetyComplianceAgent:
             logger.error(f"Failed to initialize MCP Safety & Compliance Agent: {e}")
             raise
 
+    def start_initialization(self) -> asyncio.Future:
+        """
+        Start initialize() in the background, once, and return its task.
+
+        A failed or cancelled initialization is restarted on the next call.
+        """
+        task = self._init_task
+        if task is None or (
+            task.done() and (task.cancelled() or task.exception() is not None)
+        ):
+            task = self._init_task = asyncio.ensure_future(self.initialize())
+            # initialize() logs its own failure; mark the exception as retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def ensure_initialized(self) -> None:
+        """Wait for initialization, sharing one run between concurrent callers."""
+        # Shielded so a caller's timeout does not abort the shared run
+        await asyncio.shield(self.start_initialization())
+
     async def _register_mcp_sources(self) -> None:
         """Register MCP sources for tool discovery."""
         try:
@@ -147,6 +493,9 @@ class MCPSafetyComplianceAgent:
             )
 
             logger.info("MCP sources registered successfully")
+
+            # Embed the tool catalog now so the first query does not pay for it
+            await self._index_tools()
         except Exception as e:
             logger.error(f"Failed to register MCP sources: {e}")
 
@@ -171,22 +520,93 @@ class MCPSafetyComplianceAgent:
         Returns:
             MCPSafetyResponse with MCP tool execution results
         """
+        if mcp_results is not None:
+            return await self._process_query(
+                query, session_id, context, mcp_results, enable_reasoning, reasoning_types
+            )
+
+        # Identical queries racing in one session (double submits, retries)
+        # share a single run, so an incident is not logged twice and the LLM
+        # calls are not repeated
+        request_key = (
+            session_id,
+            query,
+            json_dumps(context, sort_keys=True, default=str) if context else "",
+            enable_reasoning,
+            tuple(reasoning_types or ()),
+        )
+        inflight = self._inflight_queries.get(request_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._process_query(
+                    query, session_id, context, None, enable_reasoning, reasoning_types
+                )
+            )
+            self._inflight_queries[request_key] = inflight
+            inflight.add_done_callback(
+                lambda _: self._inflight_queries.pop(request_key, None)
+            )
+        # Shielded so one caller's cancellation does not fail the others
+        return await asyncio.shield(inflight)
+
+    async def _process_query(
+        self,
+        query: str,
+        session_id: str,
+        context: Optional[Dict[str, Any]],
+        mcp_results: Optional[Any],
+        enable_reasoning: bool,
+        reasoning_types: Optional[List[str]],
+    ) -> MCPSafetyResponse:
+        """Run the safety pipeline for one query (see process_query)."""
         try:
-            # Initialize if needed
+            # Wait for (or start) the shared initialization if it has not finished
             if (
                 not self.nim_client
                 or not self.hybrid_retriever
                 or not self.tool_discovery
             ):
-                await self.initialize()
-
-            # Update conversation context
-            if session_id not in self.conversation_context:
-                self.conversation_context[session_id] = {
-                    "queries": [],
-                    "responses": [],
+                await self.ensure_initialized()
+
+            # Look the session up once and keep a local reference; a new
+            # session is registered immediately so concurrent queries in it
+            # append to the same history
+            session_context = self.conversation_context.get(session_id)
+            if session_context is None:
+                session_context = {
+                    "queries": deque(maxlen=_MAX_SESSION_TURNS),
+                    "responses": deque(maxlen=_MAX_SESSION_TURNS),
                     "context": {},
                 }
+                self.conversation_context.set(session_id, session_context)
+
+            # Plain lookups without caller context can reuse an earlier answer.
+            # The query is parsed first: neither keywords nor embedding
+            # similarity can tell an incident report from a question about
+            # one, so only a read-only intent may be answered from cache.
+            cache_key = None
+            query_embedding = None
+            parsed_query = None
+            if not context and not mcp_results and not enable_reasoning:
+                parsed_query = await self._parse_safety_query(query, context)
+                if parsed_query.intent in _CACHEABLE_INTENTS:
+                    cache_key = _normalize_query(query)
+                    cached = self._exact_response_cache.get(cache_key)
+                    if cached is None:
+                        query_embedding = await embed_query(self.nim_client, cache_key)
+                        if query_embedding is not None:
+                            cached = self._response_cache.lookup(
+                                query_embedding, query_identifiers(query)
+                            )
+                    if cached is not None:
+                        logger.info(f"Response cache hit for safety query: {query[:50]}")
+                        # Hand out a copy so callers never mutate the instance
+                        # held by the cache
+                        response = replace(cached[1])
+                        session_context["queries"].append(parsed_query)
+                        session_context["responses"].append(response)
+                        self.conversation_context.set(session_id, session_context)
+                        return response
 
             # Step 1: Advanced Reasoning Analysis (if enabled and query is complex)
             reasoning_chain = None
@@ -227,8 +647,9 @@ class MCPSafetyComplianceAgent:
             else:
                 logger.info("Skipping advanced reasoning for simple query or reasoning disabled")
 
-            # Parse query and identify intent
-            parsed_query = await self._parse_safety_query(query, context)
+            # Parse query and identify intent (unless already parsed for the cache)
+            if parsed_query is None:
+                parsed_query = await self._parse_safety_query(query, context)
 
             # Use MCP results if provided, otherwise discover tools
             if mcp_results and hasattr(mcp_results, "tool_results"):
@@ -240,7 +661,9 @@ class MCPSafetyComplianceAgent:
                 parsed_query.tool_execution_plan = []
             else:
                 # Discover available MCP tools for this query
-                available_tools = await self._discover_relevant_tools(parsed_query)
+                available_tools = await self._discover_relevant_tools(
+                    parsed_query, query_embedding
+                )
                 parsed_query.mcp_tools = [tool.tool_id for tool in available_tools]
 
                 # Create tool execution plan
@@ -257,9 +680,21 @@ class MCPSafetyComplianceAgent:
                 parsed_query, tool_results, reasoning_chain
             )
 
-            # Update conversation context
-            self.conversation_context[session_id]["queries"].append(parsed_query)
-            self.conversation_context[session_id]["responses"].append(response)
+            # Update conversation context (re-storing refreshes the session's TTL)
+            session_context["queries"].append(parsed_query)
+            session_context["responses"].append(response)
+            self.conversation_context.set(session_id, session_context)
+
+            if cache_key is not None and self._is_cacheable(parsed_query, response):
+                self._exact_response_cache.set(cache_key, (parsed_query, response))
+                if query_embedding is None:
+                    query_embedding = await embed_query(self.nim_client, cache_key)
+                if query_embedding is not None:
+                    self._response_cache.store(
+                        query_embedding,
+                        (parsed_query, response),
+                        query_identifiers(query),
+                    )
 
             return response
 
@@ -280,124 +715,71 @@ class MCPSafetyComplianceAgent:
                 reasoning_steps=None,
             )
 
+    @staticmethod
+    def _is_cacheable(parsed_query: MCPSafetyQuery, response: MCPSafetyResponse) -> bool:
+        """Only successful, side-effect-free lookups may be replayed from cache."""
+        if parsed_query.intent not in _CACHEABLE_INTENTS:
+            return False
+        if response.response_type == "error":
+            return False
+        results = (response.tool_execution_results or {}).values()
+        return all(
+            result.get("success") and result.get("tool_name") in _READ_ONLY_TOOLS
+            for result in results
+        )
+
     async def _parse_safety_query(
         self, query: str, context: Optional[Dict[str, Any]]
     ) -> MCPSafetyQuery:
         """Parse safety query and extract intent and entities."""
         try:
-            # Fast path: Try keyword-based parsing first for simple queries
-            query_lower = query.lower()
-            entities = {}
-            intent = "incident_reporting"  # Default intent
-            
-            # Quick intent detection based on keywords
-            if any(word in query_lower for word in ["procedure", "checklist", "policy", "what are"]):
-                intent = "policy_lookup"
-            elif any(word in query_lower for word in ["report", "incident", "alert", "issue"]):
-                intent = "incident_reporting"
-            elif any(word in query_lower for word in ["compliance", "audit"]):
-                intent = "compliance_check"
-            
-            # Quick entity extraction using fallback parser
-            fallback_entities = self._fallback_parse_safety_query(query)
-            entities.update(fallback_entities)
-            
-            # For simple policy/procedure queries, use keyword-based parsing (faster, no LLM call)
-            simple_query_indicators = [
-                "procedure", "checklist", "what are", "show me", "safety"
-            ]
-            is_simple_query = (
-                any(indicator in query_lower for indicator in simple_query_indicators) and
-                len(query.split()) < 20 and  # Short queries
-                intent == "policy_lookup"  # Only for policy lookups
-            )
-            
-            if is_simple_query:
-                logger.info(f"Using fast keyword-based parsing for simple safety query: {query[:50]}")
-                # Ensure critical entities are present
-                if not entities.get("description"):
-                    entities["description"] = query
-                if not entities.get("reporter"):
-                    entities["reporter"] = "user"
-                
+            # Fast path: a confident local classification of a read-only
+            # intent skips the LLM call, with entities from the regex extractor
+            intent, confidence = _classify_intent(query)
+            if intent in _LOCAL_INTENTS and confidence >= _LOCAL_INTENT_MIN_CONFIDENCE:
+                logger.info(
+                    f"Using local intent classification ({intent}, {confidence:.2f}) "
+                    f"for safety query: {query[:50]}"
+                )
+                keyword_parse = self._fallback_parse_safety_query(query)
                 return MCPSafetyQuery(
                     intent=intent,
-                    entities=entities,
-                    context=context or {},
+                    entities=self._complete_entities(query, keyword_parse["entities"]),
+                    context={**keyword_parse["context"], **(context or {})},
                     user_query=query,
                 )
             
-            # For complex queries, use LLM parsing
+            # Ambiguous queries fall back to LLM parsing
             # Use LLM to parse the query with better entity extraction
             parse_prompt = [
-                {
-                    "role": "system",
-                    "content": """You are a safety and compliance expert. Parse warehouse safety queries and extract intent, entities, and context.
-
-Return JSON format:
-{
-    "intent": "incident_reporting",
-    "entities": {
-        "incident_type": "flooding",
-        "location": "Zone A",
-        "severity": "critical",
-        "description": "flooding in Zone A",
-        "reporter": "user"
-    },
-    "context": {"priority": "high", "severity": "critical"}
-}
-
-Intent options: incident_reporting, compliance_check, safety_audit, hazard_identification, policy_lookup, training_tracking
-
-CRITICAL: Extract ALL relevant entities from the query:
-- incident_type: flooding, fire, spill, leak, accident, injury, hazard, etc.
-- location: Zone A, Zone B, Dock D2, warehouse, etc.
-- severity: critical, high, medium, low (infer from incident type - flooding/fire/spill = critical)
-- description: full description of the issue
-- reporter: "user" or "system"
-
-Examples:
-- "we have an issue with flooding in Zone A" → {"intent": "incident_reporting", "entities": {"incident_type": "flooding", "location": "Zone A", "severity": "critical", "description": "flooding in Zone A"}, "context": {"priority": "high", "severity": "critical"}}
-- "Report a safety incident in Zone A" → {"intent": "incident_reporting", "entities": {"location": "Zone A", "severity": "high"}, "context": {"priority": "high"}}
-- "What are the safety procedures for forklift operations?" → {"intent": "policy_lookup", "entities": {"equipment": "forklift", "query": "safety procedures for forklift operations"}, "context": {"priority": "normal"}}
-
-Return only valid JSON.""",
-                },
+                {"role": "system", "content": _PARSE_SYSTEM_PROMPT},
                 {
                     "role": "user",
-                    "content": f'Query: "{query}"\nContext: {context or {}}',
+                    "content": _PARSE_USER_PROMPT(query=query, context=context or {}),
                 },
             ]
 
-            response = await self.nim_client.generate_response(parse_prompt, temperature=0.0)
+            response = await self.nim_client.generate_response(
+                parse_prompt,
+                temperature=0.0,
+                response_format=_PARSE_RESPONSE_FORMAT,
+                prompt_cache_key=_PARSE_PROMPT_CACHE_KEY,
+            )
 
-            # Parse JSON response
+            # Validate against the schema so an unknown intent is never routed;
+            # the keyword fallback still covers endpoints that do not enforce
+            # response_format
             try:
-                parsed_data = json.loads(response.content)
-            except json.JSONDecodeError:
-                # Fallback parsing with keyword extraction
+                parsed_data = _ParsedSafetyQuerySchema.model_validate_json(
+                    self._extract_json_safely(response.content.strip())
+                ).model_dump()
+            except ValueError as e:
+                logger.warning(f"Safety query parse failed validation, using keyword fallback: {e}")
                 parsed_data = self._fallback_parse_safety_query(query)
             
-            # Ensure critical entities are present
-            entities = parsed_data.get("entities", {})
-            if not entities.get("description"):
-                entities["description"] = query
-            if not entities.get("reporter"):
-                entities["reporter"] = "user"
-            
-            # Infer severity from incident type if missing
-            incident_type = entities.get("incident_type", "").lower()
-            if not entities.get("severity"):
-                if incident_type in ["flooding", "flood", "fire", "spill", "leak", "explosion"]:
-                    entities["severity"] = "critical"
-                elif incident_type in ["accident", "injury", "hazard"]:
-                    entities["severity"] = "high"
-                else:
-                    entities["severity"] = "medium"
-
             return MCPSafetyQuery(
                 intent=parsed_data.get("intent", "incident_reporting"),
-                entities=entities,
+                entities=self._complete_entities(query, parsed_data.get("entities", {})),
                 context=parsed_data.get("context", {}),
                 user_query=query,
             )
@@ -408,18 +790,81 @@ Return only valid JSON.""",
                 intent="incident_reporting", entities={}, context={}, user_query=query
             )
 
+    async def _index_tools(self) -> bool:
+        """
+        Embed the tool catalog for semantic routing, reusing known embeddings.
+
+        Embeddings are looked up in memory, then in the on-disk store; only
+        the remaining descriptions are sent to the embedding service.
+
+        Returns:
+            True if the index covers the current catalog
+        """
+        tools = self.tool_discovery.get_all_tools()
+        if self._tool_index is not None and self._tool_index[0] is tools:
+            return True
+        if not tools:
+            return False
+
+        missing = list(
+            {_tool_text(tool) for tool in tools} - self._tool_embeddings.keys()
+        )
+        if missing:
+            model = self.nim_client.config.embedding_model
+            stored = await self._embedding_store.get_many(model, missing)
+            self._tool_embeddings.update(stored)
+            missing = [text for text in missing if text not in stored]
+
+            embedded = {}
+            try:
+                for start in range(0, len(missing), _TOOL_EMBEDDING_BATCH_SIZE):
+                    batch = missing[start : start + _TOOL_EMBEDDING_BATCH_SIZE]
+                    response = await self.nim_client.generate_embeddings(
+                        batch, input_type="passage"
+                    )
+                    embedded.update(zip(batch, response.embeddings))
+            except Exception as e:
+                logger.warning(f"Tool embedding failed, using keyword tool search: {e}")
+                return False
+            finally:
+                # Keep whatever was embedded before a failure
+                self._tool_embeddings.update(embedded)
+                await self._embedding_store.put_many(model, embedded)
+
+        matrix = np.asarray(
+            [self._tool_embeddings[_tool_text(tool)] for tool in tools], dtype=np.float32
+        )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        self._tool_index = (tools, matrix / norms)
+        logger.info(f"Indexed {len(tools)} safety tools for semantic routing")
+        return True
+
+    async def _rank_tools_semantically(
+        self, query: MCPSafetyQuery, query_embedding: Optional[List[float]]
+    ) -> Optional[List[DiscoveredTool]]:
+        """Top tools by cosine similarity to the query; None if unavailable."""
+        if not await self._index_tools():
+            return None
+        if query_embedding is None:
+            query_embedding = await embed_query(self.nim_client, _normalize_query(query.user_query))
+            if query_embedding is None:
+                return None
+
+        tools, matrix = self._tool_index
+        vector = np.asarray(query_embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0 or vector.size != matrix.shape[1]:
+            return None
+        scores = matrix @ (vector / norm)
+        top = np.argsort(-scores)[:_TOOL_ROUTING_TOP_K]
+        return [tools[i] for i in top]
+
     async def _discover_relevant_tools(
-        self, query: MCPSafetyQuery
+        self, query: MCPSafetyQuery, query_embedding: Optional[List[float]] = None
     ) -> List[DiscoveredTool]:
         """Discover MCP tools relevant to the safety query."""
         try:
-            # Search for tools based on query intent and entities
-            search_terms = [query.intent]
-
-            # Add entity-based search terms
-            for entity_type, entity_value in query.entities.items():
-                search_terms.append(f"{entity_type}_{entity_value}")
-
             # Search for tools
             relevant_tools = []
 
@@ -437,8 +882,24 @@ Return only valid JSON.""",
             category_tools = await self.tool_discovery.get_tools_by_category(
                 intent_category
             )
+
+            # Rank the catalog against the query embedding; when embeddings are
+            # unavailable, fall back to keyword search on intent and entities
+            ranked_tools = await self._rank_tools_semantically(query, query_embedding)
+            if ranked_tools is not None:
+                # Best semantic matches first, then the rest of the category
+                seen = {tool.tool_id for tool in ranked_tools}
+                return ranked_tools + [
+                    tool for tool in category_tools if tool.tool_id not in seen
+                ]
+
             relevant_tools.extend(category_tools)
 
+            # Search for tools based on query intent and entities
+            search_terms = [query.intent]
+            for entity_type, entity_value in query.entities.items():
+                search_terms.append(f"{entity_type}_{entity_value}")
+
             # Search by keywords
             for term in search_terms:
                 keyword_tools = await self.tool_discovery.search_tools(term)
@@ -698,6 +1159,26 @@ Return only valid JSON.""",
 
         return arguments
     
+    @staticmethod
+    def _complete_entities(query: str, entities: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in description, reporter and severity that tools rely on."""
+        # Ensure critical entities are present
+        if not entities.get("description"):
+            entities["description"] = query
+        if not entities.get("reporter"):
+            entities["reporter"] = "user"
+        
+        # Infer severity from incident type if missing
+        incident_type = str(entities.get("incident_type", "")).lower()
+        if not entities.get("severity"):
+            if incident_type in ["flooding", "flood", "fire", "spill", "leak", "explosion"]:
+                entities["severity"] = "critical"
+            elif incident_type in ["accident", "injury", "hazard"]:
+                entities["severity"] = "high"
+            else:
+                entities["severity"] = "medium"
+        return entities
+
     def _fallback_parse_safety_query(self, query: str) -> Dict[str, Any]:
         """Fallback parsing using keyword matching when LLM parsing fails."""
         query_lower = query.lower()
@@ -829,48 +1310,24 @@ Return only valid JSON.""",
             response_prompt_template = self.config.persona.response_prompt
             system_prompt = self.config.persona.system_prompt
             
-            # Format the response prompt with actual values
+            # Format the response prompt with actual values; tool results are
+            # trimmed so large payloads do not inflate the prompt
+            retrieved_json, actions_json = encode_prompt_results(
+                list(successful_results), tool_results
+            )
             formatted_response_prompt = response_prompt_template.format(
                 user_query=sanitize_prompt_input(query.user_query),
                 intent=sanitize_prompt_input(query.intent),
-                entities=json.dumps(query.entities, default=str),
-                retrieved_data=json.dumps(successful_results, indent=2, default=str),
-                actions_taken=json.dumps(tool_results, indent=2, default=str),
+                entities=json_dumps(query.entities, default=str),
+                retrieved_data=retrieved_json,
+                actions_taken=actions_json,
                 reasoning_analysis="",
                 conversation_history=""
             )
             
-            # Create response prompt with very explicit instructions
-            enhanced_system_prompt = system_prompt + """
-
-CRITICAL JSON FORMAT REQUIREMENTS:
-1. Return ONLY a valid JSON object - no markdown, no code blocks, no explanations before or after
-2. Your response must start with { and end with }
-3. The 'natural_language' field is MANDATORY and must contain a detailed, informative response
-4. Do NOT put safety data at the top level - all data (policies, hazards, incidents) must be inside the 'data' field
-5. The 'natural_language' field must directly answer the user's question with specific details
-
-REQUIRED JSON STRUCTURE:
-{
-    "response_type": "safety_info",
-    "data": {
-        "policies": [...],
-        "hazards": [...],
-        "incidents": [...]
-    },
-    "natural_language": "Based on your query about [user query], I found the following safety information: [specific details including policy names, hazard types, incident details, etc.]. [Additional context and recommendations].",
-    "recommendations": ["Recommendation 1", "Recommendation 2"],
-    "confidence": 0.85,
-    "actions_taken": [...]
-}
-
-ABSOLUTELY CRITICAL:
-- The 'natural_language' field is REQUIRED and must not be empty
-- Include specific safety details (policy names, hazard types, incident details) in natural_language
-- Return valid JSON only - no other text
-"""
-            
-            # Create response prompt
+            # Create response prompt with very explicit instructions; the
+            # system prompt is a stable prefix the backend can cache
+            enhanced_system_prompt, prompt_cache_key = _response_system_prompt(system_prompt)
             response_prompt = [
                 {
                     "role": "system",
@@ -878,7 +1335,7 @@ ABSOLUTELY CRITICAL:
                 },
                 {
                     "role": "user",
-                    "content": formatted_response_prompt + "\n\nRemember: Return ONLY the JSON object with the 'natural_language' field populated with a detailed response.",
+                    "content": formatted_response_prompt + _RESPONSE_USER_SUFFIX,
                 },
             ]
 
@@ -886,7 +1343,9 @@ ABSOLUTELY CRITICAL:
             response = await self.nim_client.generate_response(
                 response_prompt,
                 temperature=0.0,  # Lower temperature for more consistent JSON format
-                max_tokens=2000  # Allow more tokens for detailed responses
+                max_tokens=2000,  # Allow more tokens for detailed responses
+                response_format=_RESPONSE_RESPONSE_FORMAT,
+                prompt_cache_key=prompt_cache_key,
             )
 
             # Parse JSON response - try to extract JSON from response if it contains extra text
@@ -896,9 +1355,9 @@ ABSOLUTELY CRITICAL:
             response_text = self._extract_json_safely(response_text)
             
             try:
-                response_data = json.loads(response_text)
+                response_data = json_loads(response_text)
                 logger.info(f"Successfully parsed LLM response: {response_data}")
-            except json.JSONDecodeError as e:
+            except ValueError as e:
                 logger.warning(f"Failed to parse LLM response as JSON: {e}")
                 logger.warning(f"Raw LLM response: {response.content[:500]}")
                 # Fallback response - use the text content but clean it
@@ -960,61 +1419,23 @@ ABSOLUTELY CRITICAL:
                 
                 # Ask LLM to generate natural_language from the response data
                 generation_prompt = [
-                    {
-                        "role": "system",
-                        "content": """You are a certified warehouse safety and compliance expert. 
-Generate a comprehensive, expert-level natural language response based on the provided data.
-
-CRITICAL: Write in a clear, natural, conversational tone:
-- Use fluent, natural English that reads like a human expert speaking
-- Avoid robotic or template-like language
-- Be specific and detailed, but keep it readable
-- Use active voice when possible
-- Vary sentence structure for better readability
-- Make it sound like you're explaining to a colleague, not a machine
-- Include context and reasoning, not just facts
-- Write complete, well-formed sentences and paragraphs
-
-CRITICAL ANTI-ECHOING RULES - YOU MUST FOLLOW THESE:
-- NEVER start with phrases like "You asked", "You requested", "I'll", "Let me", "As you requested", "Here's what you asked for"
-- NEVER echo or repeat the user's query - start directly with the information or action result
-- Start with the actual information or what was accomplished (e.g., "Forklift operations require..." or "A high-severity incident has been logged...")
-- Write as if explaining to a colleague, not referencing the query
-- DO NOT say "Here's the response:" or "Here's what I found:" - just provide the information directly
-
-Your response must be detailed, informative, and directly answer the user's query WITHOUT echoing it.
-Include specific details from the data (policy names, requirements, hazard types, incident details, etc.) naturally woven into the explanation.
-Provide expert-level analysis and context."""
-                    },
+                    {"role": "system", "content": _NATURAL_LANGUAGE_SYSTEM_PROMPT},
                     {
                         "role": "user",
-                        "content": f"""The user asked: "{query.user_query}"
-
-The system retrieved the following data:
-{json.dumps(data_for_generation, indent=2, default=str)[:2000]}
-
-Tool execution results:
-{json.dumps(tool_results_summary, indent=2, default=str)[:1000]}
-
-Generate a comprehensive, expert-level natural language response that:
-1. Directly answers the user's query WITHOUT echoing the query
-2. Starts immediately with the information (e.g., "Forklift operations require..." or "A high-severity incident has been logged...")
-3. NEVER starts with "You asked", "You requested", "I'll", "Let me", "Here's the response", etc.
-4. Includes specific details from the retrieved data naturally woven into the explanation
-5. Provides expert analysis and recommendations with context
-6. Is written in a clear, natural, conversational tone - like explaining to a colleague
-7. Uses varied sentence structure and flows naturally
-8. Is comprehensive but concise (typically 2-4 well-formed paragraphs)
-
-Write in a way that sounds natural and human, not robotic or template-like. Return ONLY the natural language response text (no JSON, no formatting, just the response text)."""
-                    }
+                        "content": _NATURAL_LANGUAGE_USER_PROMPT(
+                            user_query=query.user_query,
+                            data=json_dumps(data_for_generation, default=str)[:2000],
+                            tool_results=json_dumps(tool_results_summary, default=str)[:1000],
+                        ),
+                    },
                 ]
                 
                 try:
                     generation_response = await self.nim_client.generate_response(
                         generation_prompt,
                         temperature=0.4,  # Higher temperature for more natural, fluent language
-                        max_tokens=1000
+                        max_tokens=1000,
+                        prompt_cache_key=_NATURAL_LANGUAGE_PROMPT_CACHE_KEY,
                     )
                     natural_language = generation_response.content.strip()
                     logger.info(f"LLM generated natural_language: {natural_language[:200]}...")
@@ -1031,39 +1452,24 @@ Write in a way that sounds natural and human, not robotic or template-like. Retu
                 
                 # Ask LLM to generate recommendations based on the query and data
                 recommendations_prompt = [
-                    {
-                        "role": "system",
-                        "content": """You are a certified warehouse safety and compliance expert. 
-Generate actionable, expert-level recommendations based on the user's query and retrieved data.
-Recommendations should be specific, practical, and based on safety best practices and regulatory requirements."""
-                    },
+                    {"role": "system", "content": _RECOMMENDATIONS_SYSTEM_PROMPT},
                     {
                         "role": "user",
-                        "content": f"""The user asked: "{query.user_query}"
-Query intent: {query.intent}
-Query entities: {json.dumps(query.entities, default=str)}
-
-Retrieved data:
-{json.dumps(response_data, indent=2, default=str)[:1500]}
-
-Generate 3-5 actionable, expert-level recommendations that:
-1. Are specific to the user's query and the retrieved data
-2. Follow safety best practices and regulatory requirements
-3. Are practical and implementable
-4. Address the specific context (intent, entities, data)
-
-Return ONLY a JSON array of recommendation strings, for example:
-["Recommendation 1", "Recommendation 2", "Recommendation 3"]
-
-Do not include any other text, just the JSON array."""
-                    }
+                        "content": _RECOMMENDATIONS_USER_PROMPT(
+                            user_query=query.user_query,
+                            intent=query.intent,
+                            entities=json_dumps(query.entities, default=str),
+                            data=json_dumps(response_data, default=str)[:1500],
+                        ),
+                    },
                 ]
                 
                 try:
                     rec_response = await self.nim_client.generate_response(
                         recommendations_prompt,
                         temperature=0.3,
-                        max_tokens=500
+                        max_tokens=500,
+                        prompt_cache_key=_RECOMMENDATIONS_PROMPT_CACHE_KEY,
                     )
                     rec_text = rec_response.content.strip()
                     # Try to extract JSON array - use safe bracket counting to avoid quadratic runtime
@@ -1083,8 +1489,8 @@ Do not include any other text, just the JSON array."""
                             # Found matching brackets, extract JSON array
                             json_str = rec_text[start_idx:end_idx]
                             try:
-                                recommendations = json.loads(json_str)
-                            except json.JSONDecodeError:
+                                recommendations = json_loads(json_str)
+                            except ValueError:
                                 recommendations = None
                         else:
                             recommendations = None
@@ -1559,10 +1965,20 @@ Do not include any other text, just the JSON array."""
 _mcp_safety_agent = None
 
 
-async def get_mcp_safety_agent() -> MCPSafetyComplianceAgent:
-    """Get the global MCP safety agent instance."""
+def _get_agent_instance() -> MCPSafetyComplianceAgent:
     global _mcp_safety_agent
     if _mcp_safety_agent is None:
         _mcp_safety_agent = MCPSafetyComplianceAgent()
-        await _mcp_safety_agent.initialize()
     return _mcp_safety_agent
+
+
+def start_mcp_safety_agent_warmup() -> asyncio.Future:
+    """Begin initializing the global agent in the background (e.g. at startup)."""
+    return _get_agent_instance().start_initialization()
+
+
+async def get_mcp_safety_agent() -> MCPSafetyComplianceAgent:
+    """Get the global MCP safety agent instance, waiting for initialization."""
+    agent = _get_agent_instance()
+    await agent.ensure_initialized()
+    return agent
@@ -84,6 +84,31 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to start alert checker: {e}")
     
+    # Warm up the MCP operations agent in the background so the first
+    # operations query does not pay for client setup and tool discovery
+    try:
+        from src.api.agents.operations.mcp_operations_agent import (
+            start_mcp_operations_agent_warmup,
+        )
+
+        start_mcp_operations_agent_warmup()
+        logger.info("✅ MCP operations agent warm-up started")
+    except Exception as e:
+        logger.warning(f"Failed to start MCP operations agent warm-up: {e}")
+        logger.info("MCP operations agent will be initialized on first request")
+
+    # Same for the MCP safety agent
+    try:
+        from src.api.agents.safety.mcp_safety_agent import (
+            start_mcp_safety_agent_warmup,
+        )
+
+        start_mcp_safety_agent_warmup()
+        logger.info("✅ MCP safety agent warm-up started")
+    except Exception as e:
+        logger.warning(f"Failed to start MCP safety agent warm-up: {e}")
+        logger.info("MCP safety agent will be initialized on first request")
+    
     yield
     
     # Shutdown
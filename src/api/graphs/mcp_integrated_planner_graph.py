@@ -31,7 +31,7 @@ from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_core.tools import tool
-from dataclasses import asdict
+from dataclasses import asdict, fields, is_dataclass
 import logging
 import asyncio
 import threading
@@ -81,7 +81,9 @@ def _detect_complex_query(message_text: str) -> bool:
     return (
         any(keyword in message_lower for keyword in COMPLEX_QUERY_KEYWORDS) or
         (message_lower.count(" and ") > 0 and any(action in message_lower for action in COMPLEX_QUERY_ACTIONS)) or
-        len(message_text.split()) > COMPLEX_QUERY_WORD_COUNT_THRESHOLD
+        # maxsplit bounds the work: only whether the threshold is exceeded matters
+        len(message_text.split(maxsplit=COMPLEX_QUERY_WORD_COUNT_THRESHOLD))
+        > COMPLEX_QUERY_WORD_COUNT_THRESHOLD
     )
 
 
@@ -1324,19 +1326,21 @@ class MCPPlannerGraph:
                     logger.info(f"🔍 Has natural_language: {'natural_language' in agent_response}")
                     if "natural_language" in agent_response:
                         logger.info(f"🔍 natural_language value: {str(agent_response['natural_language'])[:100]}...")
-                elif hasattr(agent_response, "__dict__"):
-                    logger.info(f"🔍 agent_response object attributes: {list(agent_response.__dict__.keys())}")
+                elif is_dataclass(agent_response):
+                    logger.info(f"🔍 agent_response object attributes: {[f.name for f in fields(agent_response)]}")
 
                 # Handle MCP response format
                 if hasattr(agent_response, "natural_language"):
-                    # Convert dataclass to dict
-                    if hasattr(agent_response, "__dict__"):
-                        agent_response_dict = agent_response.__dict__.copy()
+                    # Convert to a shallow dict; slotted dataclasses have no
+                    # __dict__, and asdict() would deep-copy the response and
+                    # flatten reasoning_chain before it is curated below
+                    if is_dataclass(agent_response):
+                        agent_response_dict = {
+                            f.name: getattr(agent_response, f.name)
+                            for f in fields(agent_response)
+                        }
                     else:
-                        # Use asdict for dataclasses
-                        from dataclasses import asdict
-
-                        agent_response_dict = asdict(agent_response)
+                        agent_response_dict = agent_response.__dict__.copy()
                     
                     # Log what fields are in the dict
                     logger.info(f"📋 agent_response_dict keys: {list(agent_response_dict.keys())}")
@@ -16,6 +16,9 @@
 """Cache services for query result caching."""
 
 from src.api.services.cache.query_cache import get_query_cache, QueryCache
+from src.api.services.cache.ttl_cache import TTLCache
+from src.api.services.cache.semantic_cache import SemanticCache
+from src.api.services.cache.embedding_store import EmbeddingStore
 
-__all__ = ["get_query_cache", "QueryCache"]
+__all__ = ["get_query_cache", "QueryCache", "TTLCache", "SemanticCache", "EmbeddingStore"]
 
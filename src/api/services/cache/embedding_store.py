@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Embedding Store
+
+Persistent embedding cache in a local SQLite file, so embeddings of static
+texts (e.g. tool descriptions) survive restarts and are shared by workers on
+the same host. Entries are keyed by a hash of the embedding model and the
+text, so changing either one means a fresh embedding.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on bound parameters per statement is 999
+_MAX_KEYS_PER_QUERY = 500
+
+_DEFAULT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "warehouse-assistant", "embeddings.sqlite3"
+)
+
+
+class EmbeddingStore:
+    """SQLite-backed store of float32 embeddings keyed by (model, text)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("EMBEDDING_STORE_PATH", _DEFAULT_PATH)
+
+    @staticmethod
+    def _key(model: str, text: str) -> str:
+        return hashlib.blake2b(f"{model}\0{text}".encode(), digest_size=16).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        return connection
+
+    def _get_many(self, model: str, texts: List[str]) -> Dict[str, np.ndarray]:
+        keys = {self._key(model, text): text for text in texts}
+        found = {}
+        connection = self._connect()
+        try:
+            key_list = list(keys)
+            for start in range(0, len(key_list), _MAX_KEYS_PER_QUERY):
+                chunk = key_list[start : start + _MAX_KEYS_PER_QUERY]
+                rows = connection.execute(
+                    "SELECT key, vector FROM embeddings WHERE key IN (%s)"
+                    % ",".join("?" * len(chunk)),
+                    chunk,
+                )
+                for key, blob in rows:
+                    found[keys[key]] = np.frombuffer(blob, dtype=np.float32)
+        finally:
+            connection.close()
+        return found
+
+    def _put_many(self, model: str, embeddings: Dict[str, Sequence[float]]) -> None:
+        rows = [
+            (self._key(model, text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in embeddings.items()
+        ]
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                )
+        finally:
+            connection.close()
+
+    async def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Return stored embeddings by text for the texts that have one.
+
+        A store that cannot be read counts as all misses.
+        """
+        texts = list(texts)
+        if not texts:
+            return {}
+        try:
+            return await asyncio.to_thread(self._get_many, model, texts)
+        except Exception as e:
+            logger.warning(f"Failed to read embedding store {self.path}: {e}")
+            return {}
+
+    async def put_many(self, model: str, embeddings: Dict[str, Sequence[float]]) -> None:
+        """Persist embeddings by text; failures are logged and ignored."""
+        if not embeddings:
+            return
+        try:
+            await asyncio.to_thread(self._put_many, model, embeddings)
+        except Exception as e:
+            logger.warning(f"Failed to write embedding store {self.path}: {e}")
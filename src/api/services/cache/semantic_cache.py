@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Semantic Cache
+
+Bounded in-memory cache keyed by query embedding. A lookup returns the value
+stored for the most similar cached embedding when its cosine similarity clears
+the configured threshold, so restatements of the same question can reuse an
+earlier answer.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _Partition:
+    """
+    Embeddings and values for one partition, stored as a contiguous matrix.
+
+    Rows live in preallocated arrays that grow by doubling up to max_entries;
+    once full, the oldest row is overwritten in place. Storing therefore never
+    copies the whole matrix, and a lookup is one matrix-vector product.
+    """
+
+    def __init__(self, dim: int, max_entries: int):
+        capacity = min(8, max_entries)
+        self.max_entries = max_entries
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.expires_at = np.empty(capacity, dtype=np.float64)
+        self.values: List[Any] = []
+        self._oldest = 0
+
+    def live_count(self, now: float) -> int:
+        return int(np.count_nonzero(self.expires_at[: len(self.values)] > now))
+
+    def add(self, vector: np.ndarray, expires_at: float, value: Any) -> None:
+        size = len(self.values)
+        if size < self.max_entries:
+            if size == len(self.expires_at):
+                capacity = min(size * 2, self.max_entries)
+                vectors = np.empty((capacity, self.vectors.shape[1]), dtype=np.float32)
+                vectors[:size] = self.vectors
+                self.vectors = vectors
+                self.expires_at = np.resize(self.expires_at, capacity)
+            row = size
+            self.values.append(value)
+        else:
+            row = self._oldest
+            self.values[row] = value
+            self._oldest = (row + 1) % self.max_entries
+
+        self.vectors[row] = vector
+        self.expires_at[row] = expires_at
+
+    def best_match(self, vector: np.ndarray, now: float) -> Tuple[int, float]:
+        """Return (row, score) of the most similar live entry; score is -inf if none."""
+        size = len(self.values)
+        scores = self.vectors[:size] @ vector
+        scores[self.expires_at[:size] <= now] = -np.inf
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+
+class SemanticCache:
+    """In-memory cosine-similarity cache with TTL expiry and bounded partitions."""
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.92,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 256,
+        max_partitions: int = 1024,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_partitions = max_partitions
+        self._partitions: "OrderedDict[Tuple[Hashable, int], _Partition]" = OrderedDict()
+
+    def __len__(self) -> int:
+        now = time.monotonic()
+        return sum(p.live_count(now) for p in self._partitions.values())
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if vector.size == 0 or norm == 0.0:
+            return None
+        return vector / norm
+
+    def lookup(
+        self, embedding: Sequence[float], partition: Hashable = None
+    ) -> Optional[Any]:
+        """
+        Return the value cached for the closest embedding, if similar enough.
+
+        Args:
+            embedding: Query embedding
+            partition: Optional namespace; entries never match across partitions
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        bucket = self._partitions.get((partition, vector.size))
+        if bucket is None:
+            return None
+
+        if not bucket.values:
+            return None
+
+        best, score = bucket.best_match(vector, time.monotonic())
+        if score < self.similarity_threshold:
+            return None
+        return bucket.values[best]
+
+    def store(
+        self,
+        embedding: Sequence[float],
+        value: Any,
+        partition: Hashable = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Cache value under embedding, dropping the oldest entries once full.
+
+        Partitions are kept in least-recently-stored order; the stalest one is
+        dropped when max_partitions is exceeded.
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        key = (partition, vector.size)
+        bucket = self._partitions.get(key)
+        if bucket is None:
+            bucket = self._partitions[key] = _Partition(vector.size, self.max_entries)
+            while len(self._partitions) > self.max_partitions:
+                self._partitions.popitem(last=False)
+        self._partitions.move_to_end(key)
+
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        bucket.add(vector, time.monotonic() + ttl, value)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._partitions.clear()
@@ -25,7 +25,7 @@ import json
 import asyncio
 import hashlib
 import math
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
@@ -61,6 +61,11 @@ def _getenv_float(key: str, default: float) -> float:
         return default
 
 
+# Request header carrying a caller-supplied prompt identity, so gateways and
+# prefix-cache-aware routers can key on it without hashing the messages
+PROMPT_CACHE_KEY_HEADER = "X-Prompt-Cache-Key"
+
+
 @dataclass
 class NIMConfig:
     """NVIDIA NIM configuration."""
@@ -72,6 +77,9 @@ class NIMConfig:
         "EMBEDDING_NIM_URL", "https://integrate.api.nvidia.com/v1"
     )
     llm_model: str = os.getenv("LLM_MODEL", "nvcf:nvidia/llama-3.3-nemotron-super-49b-v1:dep-36lKV0IHjM2xq0MqnzR8wTnQwON")
+    # Smaller model for short structured-extraction calls (intent/entity
+    # parsing), requested with model="extraction"; empty means use llm_model
+    llm_extraction_model: str = os.getenv("LLM_EXTRACTION_MODEL", "")
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "nvidia/nv-embedqa-e5-v5")
     timeout: int = _getenv_int("LLM_CLIENT_TIMEOUT", 120)  # Increased from 60s to 120s to prevent premature timeouts
     # LLM generation parameters (configurable via environment variables)
@@ -80,6 +88,19 @@ class NIMConfig:
     default_top_p: float = _getenv_float("LLM_TOP_P", 1.0)
     default_frequency_penalty: float = _getenv_float("LLM_FREQUENCY_PENALTY", 0.0)
     default_presence_penalty: float = _getenv_float("LLM_PRESENCE_PENALTY", 0.0)
+    # Micro-batching for single-query embeddings (see NIMClient.embed_query)
+    embedding_batch_size: int = _getenv_int("EMBEDDING_BATCH_SIZE", 16)
+    embedding_batch_window_ms: int = _getenv_int("EMBEDDING_BATCH_WINDOW_MS", 10)
+    # Connection pool per client. NIM batches concurrent requests server-side,
+    # so keep enough warm connections for concurrent agent calls to reach it
+    # together instead of reconnecting past httpx's default of 20 keep-alives
+    max_connections: int = _getenv_int("LLM_MAX_CONNECTIONS", 100)
+    max_keepalive_connections: int = _getenv_int("LLM_MAX_KEEPALIVE_CONNECTIONS", 100)
+    # Send response_format (JSON schema constrained decoding) when callers ask
+    # for it; only enable for models/endpoints that support it
+    structured_output_enabled: bool = (
+        os.getenv("LLM_STRUCTURED_OUTPUT", "false").lower() == "true"
+    )
 
 
 @dataclass
@@ -116,13 +137,22 @@ class NIMClient:
         self._response_cache: Dict[str, Dict[str, Any]] = {}
         self._cache_lock = asyncio.Lock()
         self._cache_stats = {"hits": 0, "misses": 0}
+        self._embedding_batch: List[tuple] = []
+        self._embedding_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._embedding_batch_tasks: set = set()
+        self._inflight_generations: Dict[str, asyncio.Future] = {}
         
         # Validate configuration
         self._validate_config()
         
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+        )
         self.llm_client = httpx.AsyncClient(
             base_url=self.config.llm_base_url,
             timeout=self.config.timeout,
+            limits=limits,
             headers={
                 "Authorization": f"Bearer {self.config.llm_api_key}",
                 "Content-Type": "application/json",
@@ -131,6 +161,7 @@ class NIMClient:
         self.embedding_client = httpx.AsyncClient(
             base_url=self.config.embedding_base_url,
             timeout=self.config.timeout,
+            limits=limits,
             headers={
                 "Authorization": f"Bearer {self.config.embedding_api_key}",
                 "Content-Type": "application/json",
@@ -203,6 +234,8 @@ class NIMClient:
         top_p: float,
         frequency_penalty: float,
         presence_penalty: float,
+        response_format: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
     ) -> str:
         """Generate a cache key from LLM request parameters."""
         # Normalize messages for cache key generation
@@ -228,8 +261,10 @@ class NIMClient:
             "top_p": round(top_p, 2),
             "frequency_penalty": round(frequency_penalty, 2),
             "presence_penalty": round(presence_penalty, 2),
-            "model": self.config.llm_model,
+            "model": model or self.config.llm_model,
         }
+        if response_format is not None:
+            cache_data["response_format"] = response_format
         
         cache_string = json.dumps(cache_data, sort_keys=True)
         cache_key = hashlib.sha256(cache_string.encode()).hexdigest()
@@ -309,10 +344,16 @@ class NIMClient:
         presence_penalty: Optional[float] = None,
         stream: bool = False,
         max_retries: int = 3,
+        response_format: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        prompt_cache_key: Optional[str] = None,
     ) -> LLMResponse:
         """
         Generate response using NVIDIA NIM LLM with retry logic.
 
+        Concurrent calls with identical arguments share a single in-flight
+        request instead of each sending their own.
+
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             temperature: Sampling temperature (0.0 to 2.0). If None, uses config default.
@@ -322,10 +363,72 @@ class NIMClient:
             presence_penalty: Presence penalty (-2.0 to 2.0). If None, uses config default.
             stream: Whether to stream the response
             max_retries: Maximum number of retry attempts
+            response_format: Optional OpenAI-style response_format (e.g. a JSON
+                schema); sent only when structured output is enabled in config
+            model: Model to use. "extraction" selects the configured extraction
+                model (LLM_EXTRACTION_MODEL); if None, uses LLM_MODEL.
+            prompt_cache_key: Optional stable ID of the static prompt prefix,
+                sent as the X-Prompt-Cache-Key header
 
         Returns:
             LLMResponse with generated content
         """
+        model = self._resolve_model(model)
+        if stream:
+            return await self._generate_response(
+                messages, temperature, max_tokens, top_p,
+                frequency_penalty, presence_penalty, stream, max_retries,
+                response_format, model, prompt_cache_key,
+            )
+
+        request_key = json.dumps(
+            [
+                messages, temperature, max_tokens, top_p,
+                frequency_penalty, presence_penalty, response_format, model,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        inflight = self._inflight_generations.get(request_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._generate_response(
+                    messages, temperature, max_tokens, top_p,
+                    frequency_penalty, presence_penalty, stream, max_retries,
+                    response_format, model, prompt_cache_key,
+                )
+            )
+            self._inflight_generations[request_key] = inflight
+            inflight.add_done_callback(
+                lambda _: self._inflight_generations.pop(request_key, None)
+            )
+        # Shielded so one caller's cancellation does not fail the others
+        return await asyncio.shield(inflight)
+
+    def _resolve_model(self, model: Optional[str]) -> str:
+        """Map a model argument (None, "extraction" or a model name) to a model name."""
+        if model is None:
+            return self.config.llm_model
+        if model == "extraction":
+            return self.config.llm_extraction_model or self.config.llm_model
+        return model
+
+    async def _generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        frequency_penalty: Optional[float] = None,
+        presence_penalty: Optional[float] = None,
+        stream: bool = False,
+        max_retries: int = 3,
+        response_format: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        prompt_cache_key: Optional[str] = None,
+    ) -> LLMResponse:
+        """Send one chat completion request, with response caching and retry logic."""
+        model = model or self.config.llm_model
         # Use config defaults if parameters are not provided
         temperature = temperature if temperature is not None else self.config.default_temperature
         max_tokens = max_tokens if max_tokens is not None else self.config.default_max_tokens
@@ -336,7 +439,8 @@ class NIMClient:
         # Check cache first (skip for streaming)
         if not stream and self.enable_cache:
             cache_key = self._generate_cache_key(
-                messages, temperature, max_tokens, top_p, frequency_penalty, presence_penalty
+                messages, temperature, max_tokens, top_p, frequency_penalty, presence_penalty,
+                response_format, model,
             )
             cached_response = await self._get_cached_response(cache_key)
             if cached_response:
@@ -345,7 +449,7 @@ class NIMClient:
                 self._cache_stats["misses"] += 1
         
         payload = {
-            "model": self.config.llm_model,
+            "model": model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
@@ -360,13 +464,20 @@ class NIMClient:
             payload["frequency_penalty"] = frequency_penalty
         if not math.isclose(presence_penalty, 0.0, abs_tol=1e-09):
             payload["presence_penalty"] = presence_penalty
+        if response_format is not None and self.config.structured_output_enabled:
+            payload["response_format"] = response_format
 
+        headers = (
+            {PROMPT_CACHE_KEY_HEADER: prompt_cache_key} if prompt_cache_key else None
+        )
         last_exception = None
 
         for attempt in range(max_retries):
             try:
                 logger.info(f"LLM generation attempt {attempt + 1}/{max_retries}")
-                response = await self.llm_client.post("/chat/completions", json=payload)
+                response = await self.llm_client.post(
+                    "/chat/completions", json=payload, headers=headers
+                )
                 response.raise_for_status()
 
                 data = response.json()
@@ -374,14 +485,15 @@ class NIMClient:
                 llm_response = LLMResponse(
                     content=data["choices"][0]["message"]["content"],
                     usage=data.get("usage", {}),
-                    model=data.get("model", self.config.llm_model),
+                    model=data.get("model", model),
                     finish_reason=data["choices"][0].get("finish_reason", "stop"),
                 )
                 
                 # Cache the response (skip for streaming)
                 if not stream and self.enable_cache:
                     cache_key = self._generate_cache_key(
-                        messages, temperature, max_tokens, top_p, frequency_penalty, presence_penalty
+                        messages, temperature, max_tokens, top_p, frequency_penalty, presence_penalty,
+                        response_format, model,
                     )
                     await self._cache_response(cache_key, llm_response)
                 
@@ -391,7 +503,7 @@ class NIMClient:
                 last_exception = e
                 logger.error(
                     f"⏱️ LLM TIMEOUT: Generation attempt {attempt + 1}/{max_retries} timed out after {self.config.timeout}s | "
-                    f"Model: {self.config.llm_model} | "
+                    f"Model: {model} | "
                     f"Max tokens: {max_tokens} | "
                     f"Temperature: {temperature}"
                 )
@@ -492,6 +604,57 @@ class NIMClient:
                         "LLM service error occurred. Please try again or contact support if the issue persists."
                     ) from e
 
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        prompt_cache_key: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text from NVIDIA NIM as it is produced.
+
+        Streaming responses bypass the response cache and are not retried,
+        since chunks may already have been handed to the caller.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            temperature: Sampling temperature. If None, uses config default.
+            max_tokens: Maximum tokens to generate. If None, uses config default.
+            prompt_cache_key: Optional stable ID of the static prompt prefix,
+                sent as the X-Prompt-Cache-Key header
+
+        Yields:
+            Content deltas in generation order
+        """
+        payload = {
+            "model": self.config.llm_model,
+            "messages": messages,
+            "temperature": temperature if temperature is not None else self.config.default_temperature,
+            "max_tokens": max_tokens if max_tokens is not None else self.config.default_max_tokens,
+            "stream": True,
+        }
+
+        headers = (
+            {PROMPT_CACHE_KEY_HEADER: prompt_cache_key} if prompt_cache_key else None
+        )
+        async with self.llm_client.stream(
+            "POST", "/chat/completions", json=payload, headers=headers
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # Server-sent events: "data: {...}" lines, ending with "data: [DONE]"
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+
     async def generate_embeddings(
         self, texts: List[str], model: Optional[str] = None, input_type: str = "query"
     ) -> EmbeddingResponse:
@@ -528,6 +691,79 @@ class NIMClient:
             logger.error(f"Embedding generation failed: {e}")
             raise
 
+    async def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query, batching it with concurrent callers.
+
+        Requests arriving within the batch window (or until the batch is full)
+        are sent to the embedding service as one call, and each caller gets
+        its own vector back.
+
+        Args:
+            text: Query text to embed
+
+        Returns:
+            Embedding vector for text
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._embedding_batch.append((text, future))
+
+        if len(self._embedding_batch) >= self.config.embedding_batch_size:
+            self._flush_embedding_batch()
+        elif self._embedding_flush_handle is None:
+            self._embedding_flush_handle = loop.call_later(
+                self.config.embedding_batch_window_ms / 1000,
+                self._flush_embedding_batch,
+            )
+
+        return await future
+
+    def _flush_embedding_batch(self) -> None:
+        """Send the pending embedding batch as a background request."""
+        if self._embedding_flush_handle is not None:
+            self._embedding_flush_handle.cancel()
+            self._embedding_flush_handle = None
+
+        batch, self._embedding_batch = self._embedding_batch, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run_embedding_batch(batch))
+        self._embedding_batch_tasks.add(task)
+        task.add_done_callback(self._embedding_batch_tasks.discard)
+
+    async def _run_embedding_batch(self, batch: List[tuple]) -> None:
+        """Resolve each caller's future from one batched embedding call."""
+        try:
+            result = await self.generate_embeddings([text for text, _ in batch])
+        except BaseException as e:
+            error = e if isinstance(e, Exception) else RuntimeError("Embedding batch was cancelled")
+            self._fail_embedding_futures(batch, error)
+            if isinstance(e, Exception):
+                return
+            raise
+
+        for (_, future), embedding in zip(batch, result.embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+        if len(result.embeddings) < len(batch):
+            logger.error(
+                f"Embedding service returned {len(result.embeddings)} vectors "
+                f"for {len(batch)} inputs"
+            )
+            self._fail_embedding_futures(
+                batch, RuntimeError("Embedding service returned too few vectors")
+            )
+
+    @staticmethod
+    def _fail_embedding_futures(batch: List[tuple], error: BaseException) -> None:
+        """Fail every future in the batch that has not been resolved yet."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
     async def health_check(self) -> Dict[str, bool]:
         """
         Check health of NVIDIA NIM services.
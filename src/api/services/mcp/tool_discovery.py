@@ -120,6 +120,8 @@ class ToolDiscoveryService:
     def __init__(self, config: ToolDiscoveryConfig = None):
         self.config = config or ToolDiscoveryConfig()
         self.discovered_tools: Dict[str, DiscoveredTool] = {}
+        # List view of discovered_tools, rebuilt only after tools are added/removed
+        self._tools_snapshot: Optional[List[DiscoveredTool]] = None
         self.tool_categories: Dict[ToolCategory, List[str]] = {
             cat: [] for cat in ToolCategory
         }
@@ -432,6 +434,7 @@ class ToolDiscoveryService:
             existing_tool.status = ToolDiscoveryStatus.DISCOVERED
         else:
             self.discovered_tools[tool_key] = tool
+            self._tools_snapshot = None
 
         # Update category index
         if tool.category not in self.tool_categories:
@@ -596,6 +599,17 @@ class ToolDiscoveryService:
 
         return tools
 
+    def get_all_tools(self) -> List[DiscoveredTool]:
+        """
+        Get all discovered tools.
+
+        The list is shared between callers until the set of tools changes,
+        so treat it as read-only.
+        """
+        if self._tools_snapshot is None:
+            self._tools_snapshot = list(self.discovered_tools.values())
+        return self._tools_snapshot
+
     async def get_tools_by_source(self, source: str) -> List[DiscoveredTool]:
         """Get tools by source."""
         tools = []
@@ -794,6 +808,7 @@ class ToolDiscoveryService:
                     t for t in self.tool_categories[tool.category] if t != tool_key
                 ]
             del self.discovered_tools[tool_key]
+            self._tools_snapshot = None
 
         if tools_to_remove:
             logger.info(f"Cleaned up {len(tools_to_remove)} old tools")
@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Session History Store
+
+Bounded per-session conversation history shared across API workers.
+Uses a Redis list per session (LPUSH + LTRIM + EXPIRE) and falls back to an
+in-process LRU/TTL cache when Redis is unavailable.
+"""
+
+import logging
+import os
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from src.api.services.cache.ttl_cache import TTLCache
+from src.api.utils.json_utils import json_dumps, json_loads
+
+# Try to import redis, fallback to None if not available
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class SessionHistoryStore:
+    """Conversation history per session, in Redis with an in-memory fallback."""
+
+    def __init__(self, namespace: str, max_turns: int = 10, ttl_seconds: int = 3600):
+        self.namespace = namespace
+        self.max_turns = max_turns
+        self.ttl_seconds = ttl_seconds
+        self.redis_client: Optional["redis.Redis"] = None
+        self.redis_available = False
+        self._local = TTLCache(ttl_seconds=ttl_seconds, max_entries=10_000)
+
+    async def initialize(self) -> None:
+        """Connect to Redis (lazy - only reads env when called)."""
+        if redis is None:
+            logger.warning("Redis not available, session history will use in-memory fallback")
+            return
+
+        try:
+            redis_host = os.getenv("REDIS_HOST", "localhost")
+            redis_port = int(os.getenv("REDIS_PORT", "6379"))
+            redis_password = os.getenv("REDIS_PASSWORD")
+            redis_db = int(os.getenv("REDIS_DB", "0"))
+
+            if redis_password:
+                redis_url = f"redis://:{redis_password}@{redis_host}:{redis_port}/{redis_db}"
+            else:
+                redis_url = f"redis://{redis_host}:{redis_port}/{redis_db}"
+
+            self.redis_client = redis.from_url(
+                redis_url,
+                encoding="utf-8",
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+            await self.redis_client.ping()
+            self.redis_available = True
+            logger.info(f"✅ Session history store ({self.namespace}) initialized with Redis")
+        except Exception as e:
+            logger.warning(
+                f"Redis not available for session history, using in-memory fallback: {e}"
+            )
+            self.redis_available = False
+            self.redis_client = None
+
+    def _key(self, session_id: str) -> str:
+        return f"convctx:{self.namespace}:{session_id}"
+
+    async def append(self, session_id: str, turn: Dict[str, Any]) -> None:
+        """Record a conversation turn, keeping only the newest max_turns."""
+        if self.redis_available and self.redis_client:
+            try:
+                key = self._key(session_id)
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.lpush(key, json_dumps(turn, default=str))
+                    pipe.ltrim(key, 0, self.max_turns - 1)
+                    pipe.expire(key, self.ttl_seconds)
+                    await pipe.execute()
+                return
+            except Exception as e:
+                logger.error(f"Failed to append session history in Redis: {e}")
+
+        # In-memory fallback (re-storing refreshes the session's TTL)
+        history = self._local.get(session_id)
+        if history is None:
+            history = deque(maxlen=self.max_turns)
+        history.append(turn)
+        self._local.set(session_id, history)
+
+    async def get_recent(self, session_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Return up to limit of the newest turns, oldest first."""
+        if self.redis_available and self.redis_client:
+            try:
+                raw_turns = await self.redis_client.lrange(
+                    self._key(session_id), 0, limit - 1
+                )
+                return [json_loads(raw) for raw in reversed(raw_turns)]
+            except Exception as e:
+                logger.error(f"Failed to read session history from Redis: {e}")
+
+        history = self._local.get(session_id)
+        if not history:
+            return []
+        return list(history)[-limit:]
+
+    async def clear(self, session_id: str) -> None:
+        """Drop a session's history."""
+        if self.redis_available and self.redis_client:
+            try:
+                await self.redis_client.delete(self._key(session_id))
+            except Exception as e:
+                logger.error(f"Failed to clear session history in Redis: {e}")
+        self._local.invalidate(session_id)
+
+    async def close(self) -> None:
+        """Close Redis connection."""
+        if self.redis_client:
+            await self.redis_client.close()
@@ -18,6 +18,7 @@ API utility functions for common operations.
 """
 
 from .log_utils import sanitize_log_data
+from .json_utils import json_dumps, json_loads
 
-__all__ = ["sanitize_log_data"]
+__all__ = ["sanitize_log_data", "json_dumps", "json_loads"]
 
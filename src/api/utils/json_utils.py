@@ -0,0 +1,159 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+JSON utility functions for API modules.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Dataclasses and datetimes are serialized directly, without an
+intermediate asdict() copy when orjson is available.
+"""
+
+import dataclasses
+import json
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types the standard library cannot serialize."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(
+    obj: Any,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """
+    Serialize obj to a compact JSON string.
+
+    Args:
+        obj: Object to serialize (dicts, lists, dataclasses, datetimes, ...)
+        sort_keys: Whether to sort dictionary keys
+        default: Fallback for objects neither backend can serialize (e.g. str)
+
+    Returns:
+        JSON string
+    """
+    if default is None:
+        encoder = _default
+    else:
+
+        def encoder(value: Any) -> Any:
+            try:
+                return _default(value)
+            except TypeError:
+                return default(value)
+
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=encoder, option=option).decode()
+    return json.dumps(obj, default=encoder, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JSONStringFieldStream:
+    """
+    Incrementally extract one string field from JSON text as it streams in.
+
+    feed() returns the newly decoded characters of the field's value, so a
+    caller can surface e.g. "natural_language" before the rest of the object
+    has been generated. Only unconsumed text is buffered, keeping the total
+    work linear in the stream length.
+    """
+
+    def __init__(self, field: str):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._key_tail = len(field) + 16
+        self._buffer = ""
+        self._in_value = False
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return any newly available field text."""
+        if self.done:
+            return ""
+
+        self._buffer += chunk
+        if not self._in_value:
+            match = self._key.search(self._buffer)
+            if match is None:
+                # Keep enough of the tail to match a key split across chunks
+                self._buffer = self._buffer[-self._key_tail :]
+                return ""
+            self._buffer = self._buffer[match.end() :]
+            self._in_value = True
+
+        return self._decode_available()
+
+    def _decode_available(self) -> str:
+        raw = self._buffer
+        end = len(raw)
+        i = safe = 0
+        while i < end:
+            char = raw[i]
+            if char == "\\":
+                width = 2
+                if raw[i + 1 : i + 2] == "u":
+                    width = 6
+                    if "d8" <= raw[i + 2 : i + 4].lower() <= "db":
+                        # A high surrogate is decoded together with its low
+                        # half, which may still be in the next chunk
+                        follow = raw[i + 6 : i + 8]
+                        if follow == "\\u":
+                            width = 12
+                        elif len(follow) < 2 and "\\u".startswith(follow):
+                            break
+                if i + width > end:
+                    break  # Escape sequence is split across chunks
+                i += width
+                safe = i
+                continue
+            if char == '"':
+                self.done = True
+                break
+            i += 1
+            safe = i
+
+        segment = raw[:safe]
+        self._buffer = "" if self.done else raw[safe:]
+        return json.loads(f'"{segment}"', strict=False) if segment else ""
@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prompt helpers shared by the agents.
+
+Covers trimming tool results before they go into a prompt, structured-output
+formats, provider prompt-cache keys, the identifier tokens that partition
+semantic response caches, query embeddings for cache lookups, and streaming
+a reply's natural-language field to the caller.
+"""
+
+import hashlib
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.api.utils.json_utils import JSONStringFieldStream, json_dumps
+
+logger = logging.getLogger(__name__)
+
+# Tool results are trimmed to this many list items / string characters
+# before they are embedded in a prompt
+PROMPT_MAX_ITEMS = 5
+PROMPT_MAX_CHARS = 2000
+
+# Tokens that change what a query refers to (task or incident IDs, counts,
+# zone and dock letters); near-identical queries only share a cached answer
+# when these match
+QUERY_IDENTIFIER_PATTERN = re.compile(
+    r"\b\w*\d[\w-]*|\b(?:zone|dock|aisle|area|bay|lane|section|row)\s+[a-z]\b"
+)
+
+
+def compact_for_prompt(value: Any) -> Any:
+    """
+    Trim a tool result for an LLM prompt.
+
+    Lists keep their first PROMPT_MAX_ITEMS items plus a marker with the
+    original length, and long strings (e.g. SDS text) are cut at
+    PROMPT_MAX_CHARS. Callers still return the full result to the user.
+    """
+    if isinstance(value, dict):
+        return {k: compact_for_prompt(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [compact_for_prompt(v) for v in value[:PROMPT_MAX_ITEMS]]
+        if len(value) > PROMPT_MAX_ITEMS:
+            items.append({"_truncated": True, "total": len(value)})
+        return items
+    if isinstance(value, str) and len(value) > PROMPT_MAX_CHARS:
+        return value[:PROMPT_MAX_CHARS] + "...[truncated]"
+    return value
+
+
+def encode_prompt_results(
+    successful_ids: List[str], tool_results: Dict[str, Any]
+) -> Tuple[str, str]:
+    """Compact tool results once and encode (successful results, all results)."""
+    compact = compact_for_prompt(tool_results)
+    return (
+        json_dumps({tool_id: compact[tool_id] for tool_id in successful_ids}, default=str),
+        json_dumps(compact, default=str),
+    )
+
+
+def query_identifiers(query: str) -> frozenset:
+    """Identifier-like tokens in a query, used to partition semantic caches."""
+    return frozenset(QUERY_IDENTIFIER_PATTERN.findall(query.lower()))
+
+
+def json_schema_format(name: str, schema: type) -> Dict[str, Any]:
+    """response_format requesting output that matches a pydantic model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema.model_json_schema()},
+    }
+
+
+@lru_cache(maxsize=32)
+def prompt_cache_key(system_prompt: str) -> str:
+    """Stable short ID of a system prompt, sent so the backend can reuse its prefix."""
+    return hashlib.blake2b(system_prompt.encode(), digest_size=8).hexdigest()
+
+
+async def embed_query(nim_client: Any, query: str) -> Optional[List[float]]:
+    """Embed a query for cache lookups and tool routing; None if embedding fails."""
+    try:
+        return await nim_client.embed_query(query)
+    except Exception as e:
+        logger.warning(f"Query embedding failed, skipping embedding lookups: {e}")
+        return None
+
+
+async def stream_natural_language(
+    nim_client: Any,
+    messages: List[Dict[str, str]],
+    on_text: Callable[[str], Awaitable[None]],
+    **kwargs: Any,
+) -> Tuple[str, bool]:
+    """
+    Stream a JSON reply, forwarding its natural_language text as it arrives.
+
+    Extra keyword arguments (temperature, prompt_cache_key, ...) are passed
+    to nim_client.stream_response.
+
+    Returns:
+        Tuple of (full response content, whether any text was forwarded)
+    """
+    chunks: List[str] = []
+    extractor = JSONStringFieldStream("natural_language")
+    streamed = False
+    async for delta in nim_client.stream_response(messages, **kwargs):
+        chunks.append(delta)
+        text = extractor.feed(delta)
+        if text:
+            streamed = True
+            await on_text(text)
+    return "".join(chunks), streamed
@@ -671,11 +671,15 @@ Provide a concise summary:
 
 # Global memory manager instance
 _memory_manager: Optional[MemoryManager] = None
+_memory_manager_lock = asyncio.Lock()
 
 async def get_memory_manager() -> MemoryManager:
     """Get or create the global memory manager instance."""
     global _memory_manager
     if _memory_manager is None:
-        _memory_manager = MemoryManager()
-        await _memory_manager.initialize()
+        async with _memory_manager_lock:
+            if _memory_manager is None:
+                memory_manager = MemoryManager()
+                await memory_manager.initialize()
+                _memory_manager = memory_manager
     return _memory_manager
@@ -35,6 +35,18 @@ class InventoryItem:
     reorder_point: int
     updated_at: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict of the item's fields (cheaper than dataclasses.asdict)."""
+        return {
+            "id": self.id,
+            "sku": self.sku,
+            "name": self.name,
+            "quantity": self.quantity,
+            "location": self.location,
+            "reorder_point": self.reorder_point,
+            "updated_at": self.updated_at,
+        }
+
 @dataclass
 class InventorySearchResult:
     """Search result for inventory queries."""
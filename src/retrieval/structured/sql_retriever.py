@@ -43,6 +43,8 @@ class DatabaseConfig:
     password: str = ""
     min_size: int = 1
     max_size: int = 10
+    max_inactive_connection_lifetime: float = 300.0
+    statement_cache_size: int = 1024
     
     @classmethod
     def from_env(cls) -> "DatabaseConfig":
@@ -96,6 +98,8 @@ class SQLRetriever:
                             password=self.config.password,
                             min_size=self.config.min_size,
                             max_size=self.config.max_size,
+                            max_inactive_connection_lifetime=self.config.max_inactive_connection_lifetime,
+                            statement_cache_size=self.config.statement_cache_size,  # Reuse prepared statements across calls
                             command_timeout=30,
                             server_settings={
                                 'application_name': 'warehouse_assistant',
@@ -20,7 +20,7 @@ Provides parameterized queries for task management including
 workforce scheduling, task assignment, and operational KPIs.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 from dataclasses import dataclass
 from .sql_retriever import SQLRetriever
 
@@ -68,6 +68,45 @@ class TaskQueries:
         except Exception as e:
             raise Exception(f"Failed to get tasks by status {status}: {e}")
     
+    async def get_tasks_by_statuses(
+        self, statuses: Sequence[str], limit: int = 100
+    ) -> Dict[str, List[Task]]:
+        """
+        Get the newest tasks for several statuses in one round trip.
+
+        Returns a list per requested status, each holding at most limit tasks.
+        """
+        query = """
+        SELECT id, kind, status, assignee, payload, created_at, updated_at
+        FROM (
+            SELECT id, kind, status, assignee, payload, created_at, updated_at,
+                   ROW_NUMBER() OVER (PARTITION BY status ORDER BY created_at DESC) AS status_rank
+            FROM tasks
+            WHERE status = ANY($1)
+        ) ranked
+        WHERE status_rank <= $2
+        ORDER BY created_at DESC
+        """
+        
+        try:
+            results = await self.sql_retriever.execute_query(query, (list(statuses), limit))
+            tasks_by_status: Dict[str, List[Task]] = {status: [] for status in statuses}
+            for row in results:
+                tasks_by_status[row['status']].append(
+                    Task(
+                        id=row['id'],
+                        kind=row['kind'],
+                        status=row['status'],
+                        assignee=row['assignee'],
+                        payload=row['payload'],
+                        created_at=str(row['created_at']),
+                        updated_at=str(row['updated_at'])
+                    )
+                )
+            return tasks_by_status
+        except Exception as e:
+            raise Exception(f"Failed to get tasks by statuses {list(statuses)}: {e}")
+    
     async def get_tasks_by_assignee(self, assignee: str, limit: int = 100) -> List[Task]:
         """Get tasks assigned to a specific person."""
         query = """
@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the on-disk embedding store.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.services.cache.embedding_store import EmbeddingStore
+
+
+@pytest.mark.asyncio
+async def test_embeddings_round_trip_per_model(tmp_path):
+    """Stored vectors come back for the same model and text only."""
+    store = EmbeddingStore(str(tmp_path / "nested" / "embeddings.sqlite3"))
+    await store.put_many("model-a", {"forklift": [0.5, 0.25], "spill": [1.0, 0.0]})
+
+    found = await store.get_many("model-a", ["forklift", "unknown"])
+    assert list(found) == ["forklift"]
+    assert found["forklift"].tolist() == [0.5, 0.25]
+    assert await store.get_many("model-b", ["forklift"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_unreadable_store_counts_as_misses(tmp_path):
+    """A broken store path never raises to the caller."""
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    store = EmbeddingStore(str(blocker / "embeddings.sqlite3"))
+
+    await store.put_many("model-a", {"forklift": [0.5]})
+    assert await store.get_many("model-a", ["forklift"]) == {}
@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the equipment action tools.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.agents.inventory.equipment_action_tools import (
+    EquipmentActionTools,
+    _fallback_id,
+)
+
+
+def _tools(rows=None, velocity=None, history=None) -> EquipmentActionTools:
+    tools = EquipmentActionTools()
+    tools.sql_retriever = SimpleNamespace(fetch_all=AsyncMock(return_value=rows or []))
+    tools.wms_service = SimpleNamespace(
+        get_item_velocity=AsyncMock(return_value=velocity),
+        get_transaction_history=AsyncMock(return_value=history),
+    )
+    tools._initialized = True
+    return tools
+
+
+@pytest.mark.asyncio
+async def test_check_stock_many_uses_one_query_and_maps_every_sku():
+    """One round-trip serves every SKU; misses map to empty stock and hits are cached."""
+    updated_at = datetime(2025, 1, 1, 8, 0)
+    tools = _tools(
+        rows=[
+            {"sku": "SKU1", "name": "Widget", "quantity": 12, "location": "A01",
+             "reorder_point": 5, "updated_at": updated_at},
+            {"sku": "SKU1", "name": "Widget", "quantity": 3, "location": "B02",
+             "reorder_point": 5, "updated_at": updated_at},
+        ]
+    )
+
+    stock = await tools.check_stock_many(["SKU1", "SKU2"])
+
+    tools.sql_retriever.fetch_all.assert_awaited_once_with(
+        EquipmentActionTools._STOCK_QUERY, ["SKU1", "SKU2"]
+    )
+    assert list(stock) == ["SKU1", "SKU2"]
+    assert stock["SKU1"].on_hand == 12
+    assert stock["SKU1"].available_to_promise == 12
+    assert stock["SKU1"].locations == [{"location": "A01", "quantity": 12}]
+    assert stock["SKU1"].reorder_point == 5
+    assert stock["SKU1"].last_updated == updated_at
+    assert stock["SKU2"].on_hand == 0 and stock["SKU2"].locations == []
+
+    # A follow-up single check is answered from the short-lived cache
+    assert await tools.check_stock("SKU1") is stock["SKU1"]
+    tools.sql_retriever.fetch_all.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_check_stock_many_passes_location_patterns():
+    """Several locations are matched with one LIKE ANY query."""
+    tools = _tools()
+
+    await tools.check_stock_many(["SKU1"], locations=["A01", "B02"])
+
+    tools.sql_retriever.fetch_all.assert_awaited_once_with(
+        EquipmentActionTools._STOCK_BY_LOCATION_QUERY, ["SKU1"], ["%A01%", "%B02%"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_back_to_back_reservations_see_each_others_stock():
+    """Reservations check stock uncached and invalidate the SKU's cached stock."""
+    row = {"sku": "SKU1", "name": "Widget", "quantity": 10, "location": "A01",
+           "reorder_point": 0, "updated_at": None}
+    tools = _tools(rows=[row])
+    tools.wms_service.create_reservation = AsyncMock(
+        return_value={"success": True, "reservation_id": "R1"}
+    )
+    assert (await tools.check_stock("SKU1")).on_hand == 10
+
+    first = await tools.reserve_inventory("SKU1", 8, "ORD1")
+    tools.sql_retriever.fetch_all.return_value = [{**row, "quantity": 2}]
+    second = await tools.reserve_inventory("SKU1", 8, "ORD2")
+
+    assert first.success is True
+    assert second.success is False
+    assert "Available: 2" in second.message
+    assert (await tools.check_stock("SKU1")).on_hand == 2
+
+
+def test_fallback_ids_are_unique_under_rapid_calls():
+    """IDs generated back to back never collide, even within one clock tick."""
+    ids = [_fallback_id("CC") for _ in range(10_000)]
+    assert len(set(ids)) == len(ids)
+    assert all(i.startswith("CC_") for i in ids)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "picks_per_day,location",
+    [(0, "C03"), (50, "C03"), (51, "B02"), (100, "B02"), (101, "A01")],
+)
+async def test_reslotting_moves_faster_skus_closer_to_shipping(picks_per_day, location):
+    """Velocity thresholds are inclusive upper bounds of each slotting class."""
+    tools = _tools(velocity={"current_location": "C10", "picks_per_day": picks_per_day})
+
+    result = await tools.recommend_reslotting("SKU1")
+
+    assert result["success"] is True
+    assert result["recommendations"][0]["recommended_location"] == location
+
+
+@pytest.mark.asyncio
+async def test_investigate_discrepancy_counts_recent_activity():
+    """All history is counted; only recent picks and moves count as recent activity."""
+    now = datetime.now()
+    history = [
+        {"type": "pick", "timestamp": now - timedelta(days=1)},
+        {"type": "pick", "timestamp": (now - timedelta(days=2)).isoformat()},
+        {"type": "move", "timestamp": now - timedelta(days=3)},
+        {"type": "receive", "timestamp": now - timedelta(days=1)},
+        {"type": "pick", "timestamp": now - timedelta(days=20)},
+        {"type": "move", "timestamp": "not a date"},
+    ]
+    tools = _tools(history=history)
+
+    investigation = await tools.investigate_discrepancy("SKU1", "A01", 40, 25)
+
+    assert investigation.transaction_count == 6
+    assert investigation.recent_pick_count == 2
+    assert investigation.recent_move_count == 1
+    assert investigation.discrepancy_amount == -15
+    assert "Recent activity: 2 picks, 1 moves" in investigation.findings
+
+
+@pytest.mark.asyncio
+async def test_investigate_discrepancy_without_history_reports_zero_counts():
+    """A history lookup failure is reported as a finding with zero counts."""
+    tools = _tools()
+    tools.wms_service.get_transaction_history.side_effect = RuntimeError("WMS down")
+
+    investigation = await tools.investigate_discrepancy("SKU1", "A01", 10, 10)
+
+    assert investigation.transaction_count == 0
+    assert investigation.recent_pick_count == 0
+    assert investigation.recent_move_count == 0
+    assert investigation.findings == ["Transaction history unavailable: WMS down"]
@@ -0,0 +1,119 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the equipment & asset operations agent.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.agents.inventory.equipment_agent import (
+    EquipmentAssetOperationsAgent,
+    EquipmentQuery,
+    EquipmentResponse,
+    _cache_partition,
+)
+
+
+def _agent(intents) -> EquipmentAssetOperationsAgent:
+    agent = EquipmentAssetOperationsAgent()
+    agent.nim_client = SimpleNamespace(embed_query=AsyncMock(return_value=[1.0, 0.0]))
+    agent._understand_query = AsyncMock(
+        side_effect=lambda query, session_id, context: EquipmentQuery(
+            intent=intents[query], entities={}, context={}, user_query=query
+        )
+    )
+    agent._retrieve_equipment_data = AsyncMock(return_value={})
+    agent._execute_action_tools = AsyncMock(return_value=[])
+    agent._generate_equipment_response = AsyncMock(
+        side_effect=lambda parsed, data, session_id, actions, on_text: EquipmentResponse(
+            response_type=parsed.intent,
+            data={},
+            natural_language=parsed.user_query,
+            recommendations=[],
+            confidence=0.9,
+            actions_taken=actions,
+        )
+    )
+    return agent
+
+
+def test_cache_partition_separates_types_and_zones():
+    """Queries naming a different equipment type or zone never share a cache entry."""
+    forklifts = _cache_partition("Which forklifts are available in Zone A?")
+    assert forklifts == (frozenset(), frozenset({"forklift"}), frozenset({"a"}))
+    assert forklifts != _cache_partition("Which scanners are available in Zone A?")
+    assert forklifts != _cache_partition("Which forklifts are available in Zone B?")
+    assert _cache_partition("Status of FL-01")[0] == frozenset({"FL-01"})
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["Is the freezer online?", "Order more sausages", "Open the preservice log", "Light the showroom"],
+)
+def test_fallback_intent_ignores_keywords_inside_other_words(query):
+    """Keywords and equipment types only match as whole words."""
+    equipment_query = EquipmentAssetOperationsAgent()._fallback_intent_detection(query)
+    assert equipment_query.context == {"keyword_match": False}
+    assert equipment_query.entities == {}
+
+
+def test_fallback_intent_matches_inflected_keywords():
+    """Plural and inflected forms still select their bucket."""
+    agent = EquipmentAssetOperationsAgent()
+    free = agent._fallback_intent_detection("Which forklifts are free?")
+    assert free.intent == "availability"
+    assert free.entities == {"equipment_type": "forklift"}
+    assert agent._fallback_intent_detection("Show repairs for AMRs").intent == "maintenance"
+    assert agent._fallback_intent_detection("Which AMRs are assigned?").intent == "assignment"
+
+
+@pytest.mark.asyncio
+async def test_action_worded_like_a_cached_lookup_still_runs():
+    """The cache is only consulted once the intent is known to be read-only."""
+    agent = _agent({"Is FL-01 available?": "availability", "Make FL-01 available": "release"})
+
+    await agent.process_query("Is FL-01 available?", session_id="s1")
+    response = await agent.process_query("Make FL-01 available", session_id="s2")
+
+    assert response.response_type == "release"
+    assert agent._generate_equipment_response.await_count == 2
+    assert agent._execute_action_tools.await_args.args[0].intent == "release"
+
+
+@pytest.mark.asyncio
+async def test_follow_ups_are_not_shared_across_conversation_threads():
+    """Both cache tiers are keyed on the session's recent intents."""
+    agent = _agent({"Is it available?": "availability"})
+    await agent.history_store.append("s1", {"query": "Show FL-01", "intent": "equipment_lookup"})
+    await agent.history_store.append("s2", {"query": "FL-02 battery", "intent": "telemetry"})
+    await agent.history_store.append("s3", {"query": "Show FL-01", "intent": "equipment_lookup"})
+
+    await agent.process_query("Is it available?", session_id="s1")
+    await agent.process_query("Is it available?", session_id="s2")
+    assert agent._generate_equipment_response.await_count == 2
+
+    await agent.process_query("Is it available?", session_id="s3")
+    assert agent._generate_equipment_response.await_count == 2
+    await asyncio.gather(*agent._background_tasks)
@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the JSON helpers.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.utils import json_utils
+from src.api.utils.json_utils import JSONStringFieldStream, json_dumps, json_loads
+
+
+@dataclass(slots=True, frozen=True)
+class _Result:
+    sku: str
+    created_at: datetime
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_dataclass_and_datetime(monkeypatch, use_orjson):
+    """Both backends serialize dataclasses and datetimes identically."""
+    if use_orjson and not json_utils.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", use_orjson)
+
+    result = _Result(sku="SKU123", created_at=datetime(2025, 1, 2, 3, 4, 5))
+    assert json_loads(json_dumps(result)) == {
+        "sku": "SKU123",
+        "created_at": "2025-01-02T03:04:05",
+    }
+    assert json_dumps({"b": 1, "a": [1, 2]}, sort_keys=True) == '{"a":[1,2],"b":1}'
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_uses_default_for_unknown_types(monkeypatch, use_orjson):
+    """A caller-supplied default handles types neither backend knows."""
+    if use_orjson and not json_utils.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", use_orjson)
+
+    with pytest.raises(TypeError):
+        json_dumps({"value": Decimal("1.5")})
+    assert json_dumps({"value": Decimal("1.5")}, default=str) == '{"value":"1.5"}'
+
+
+def test_loads_invalid_json_raises_value_error():
+    """Decode errors surface as ValueError regardless of backend."""
+    with pytest.raises(ValueError):
+        json_loads("{not json")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1000])
+def test_string_field_stream_decodes_across_chunk_boundaries(chunk_size):
+    """The extracted field matches a full parse however the text is split."""
+    document = (
+        '{"response_type": "equipment_info", '
+        '"natural_language": "FL-01 is \\"ready\\".\\nBattery \\u00e9 85%", '
+        '"recommendations": ["Charge FL-02"]}'
+    )
+    stream = JSONStringFieldStream("natural_language")
+    text = "".join(
+        stream.feed(document[i : i + chunk_size])
+        for i in range(0, len(document), chunk_size)
+    )
+
+    assert text == json_loads(document)["natural_language"]
+    assert stream.done
+
+
+@pytest.mark.parametrize("split", range(1, 20))
+def test_string_field_stream_keeps_surrogate_pairs_together(split):
+    """An escaped surrogate pair split across chunks decodes to one character."""
+    document = '{"natural_language": "hi \\ud83d\\ude00 ok"}'
+    stream = JSONStringFieldStream("natural_language")
+    chunks = [stream.feed(document[: split + 20]), stream.feed(document[split + 20 :])]
+
+    assert "".join(chunks) == "hi \U0001F600 ok"
+    for chunk in chunks:
+        chunk.encode("utf-8")
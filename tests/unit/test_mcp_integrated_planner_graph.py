@@ -789,6 +789,60 @@ class TestMCPPlannerGraph:
         assert result["final_response"] is not None
         assert "reasoning_chain" in result["context"] or result.get("reasoning_chain") is not None
 
+    def test_mcp_synthesize_response_with_slotted_dataclass(self, planner_graph):
+        """Test synthesize response with a slotted dataclass agent response."""
+        @dataclass(slots=True)
+        class SlottedResponse:
+            response_type: str = "operations"
+            data: dict = field(default_factory=lambda: {"tasks": []})
+            natural_language: str = "Two pick waves are scheduled"
+            recommendations: list = field(default_factory=list)
+            confidence: float = 0.9
+            actions_taken: list = field(default_factory=list)
+            reasoning_chain: Optional[Any] = None
+
+        @dataclass
+        class MockReasoningChain:
+            chain_id: str = "test"
+            query: str = "test"
+            reasoning_type: str = "analytical"
+            final_conclusion: str = "test conclusion"
+            overall_confidence: float = 0.8
+            execution_time: float = 1.0
+            created_at: datetime = field(default_factory=datetime.now)
+            steps: list = field(default_factory=list)
+
+        agent_response = SlottedResponse(reasoning_chain=MockReasoningChain())
+        state: MCPWarehouseState = {
+            "messages": [HumanMessage(content="Test query")],
+            "user_intent": "operations",
+            "routing_decision": "operations",
+            "agent_responses": {"operations": agent_response},
+            "final_response": None,
+            "context": {},
+            "session_id": "test",
+            "mcp_results": None,
+            "tool_execution_plan": None,
+            "available_tools": None,
+            "enable_reasoning": False,
+            "reasoning_types": None,
+            "reasoning_chain": None,
+        }
+
+        with patch(
+            "src.api.graphs.mcp_integrated_planner_graph._convert_reasoning_chain_to_dict",
+            wraps=_convert_reasoning_chain_to_dict,
+        ) as mock_convert:
+            result = planner_graph._mcp_synthesize_response(state)
+
+        assert "Two pick waves" in result["final_response"]
+        # The reasoning chain reaches the curated converter as the original
+        # dataclass rather than a pre-flattened deep copy.
+        assert any(
+            call.args and call.args[0] is agent_response.reasoning_chain
+            for call in mock_convert.call_args_list
+        )
+
     @pytest.mark.asyncio
     async def test_process_warehouse_query_with_initialization(self, planner_graph):
         """Test process_warehouse_query with initialization."""
@@ -0,0 +1,219 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the MCP operations coordination agent.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.agents.operations.mcp_operations_agent import (
+    MCPOperationsCoordinationAgent,
+    MCPOperationsQuery,
+    _exceeds_node_count,
+)
+from src.api.utils.prompt_utils import compact_for_prompt, encode_prompt_results
+
+
+def _agent(parse_reply: str, embedding=(1.0, 0.0)) -> MCPOperationsCoordinationAgent:
+    agent = MCPOperationsCoordinationAgent()
+    agent.nim_client = SimpleNamespace(
+        generate_response=AsyncMock(return_value=SimpleNamespace(content=parse_reply)),
+        embed_query=AsyncMock(return_value=list(embedding)),
+    )
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_repeated_and_restated_queries_reuse_the_parse():
+    """Exact repeats and near-identical restatements skip the parse LLM call."""
+    agent = _agent('{"intent": "kpi_analysis", "entities": {}, "context": {}}')
+
+    first = await agent._parse_operations_query("Show KPIs", None)
+    repeat = await agent._parse_operations_query("  show kpis ", None)
+    restated = await agent._parse_operations_query("Show me the KPIs", None)
+
+    assert first.intent == repeat.intent == restated.intent == "kpi_analysis"
+    assert restated.user_query == "Show me the KPIs"
+    assert first is not repeat
+    agent.nim_client.generate_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_respects_identifiers_and_failures():
+    """Different zones never share a parse, and fallback parses are not cached."""
+    agent = _agent('{"intent": "workforce_management", "entities": {"zone": "A"}}')
+    await agent._parse_operations_query("Assign workers to zone A", None)
+    await agent._parse_operations_query("Assign workers to zone B", None)
+    assert agent.nim_client.generate_response.await_count == 2
+
+    agent = _agent("not json")
+    await agent._parse_operations_query("Show KPIs", None)
+    await agent._parse_operations_query("Show KPIs", None)
+    assert agent.nim_client.generate_response.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_parse_recovers_json_wrapped_in_fences_or_prose():
+    """A fenced or prefaced JSON reply is still parsed instead of falling back."""
+    agent = _agent(
+        'Here is the parse:\n```json\n{"intent": "wave_creation", '
+        '"entities": {"order_range": "1001-1010"}}\n```'
+    )
+
+    parsed = await agent._parse_operations_query("Create a wave for orders 1001-1010", None)
+
+    assert parsed.intent == "wave_creation"
+    assert parsed.entities == {"order_range": "1001-1010"}
+
+
+@pytest.mark.asyncio
+async def test_reasoning_runs_concurrently_with_parsing():
+    """Reasoning and the parse LLM call overlap instead of running back to back."""
+    agent = _agent('{"intent": "kpi_analysis", "entities": {}, "context": {}}')
+    parse_started = asyncio.Event()
+
+    async def reason(**kwargs):
+        await asyncio.wait_for(parse_started.wait(), timeout=1.0)
+        return SimpleNamespace(steps=[])
+
+    async def parse(*args, **kwargs):
+        parse_started.set()
+        return SimpleNamespace(content='{"intent": "kpi_analysis"}')
+
+    agent.nim_client.generate_response = AsyncMock(side_effect=parse)
+    agent.reasoning_engine = SimpleNamespace(process_with_reasoning=reason)
+    agent.hybrid_retriever = agent.tool_discovery = object()
+    agent._generate_response_with_tools = AsyncMock(return_value="response")
+
+    response = await agent.process_query(
+        "Analyze KPI trends",
+        mcp_results=SimpleNamespace(tool_results={}),
+        enable_reasoning=True,
+    )
+
+    assert response == "response"
+    parsed, _, chain, _ = agent._generate_response_with_tools.await_args.args
+    assert parsed.intent == "kpi_analysis"
+    assert chain is not None
+    assert list(agent.conversation_context.get("default")["queries"]) == [parsed]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_in_a_new_session_share_its_history():
+    """The first queries of a session are all kept, not overwritten by each other."""
+    agent = _agent('{"intent": "kpi_analysis", "entities": {}, "context": {}}')
+    agent.hybrid_retriever = agent.tool_discovery = object()
+    agent._generate_response_with_tools = AsyncMock(return_value="response")
+
+    await asyncio.gather(
+        *(
+            agent.process_query(q, session_id="s1", mcp_results=SimpleNamespace(tool_results={}))
+            for q in ("Show KPIs", "Show throughput", "Show accuracy")
+        )
+    )
+
+    history = agent.conversation_context.get("s1")
+    assert sorted(q.user_query for q in history["queries"]) == [
+        "Show KPIs",
+        "Show accuracy",
+        "Show throughput",
+    ]
+    assert len(history["responses"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_response_text_is_forwarded_while_streaming():
+    """With on_text, natural language reaches the caller before the reply completes."""
+    agent = _agent("")
+    agent.config = SimpleNamespace(
+        persona=SimpleNamespace(response_prompt="{user_query}", system_prompt="")
+    )
+    natural_language = "Wave W-42 was created for orders 1001-1010 in zone A."
+    reply = '{"response_type": "wave_creation", "natural_language": "%s"}' % natural_language
+    forwarded = []
+
+    async def stream_response(messages, temperature=None):
+        for start in range(0, len(reply), 7):
+            yield reply[start : start + 7]
+
+    async def on_text(text):
+        forwarded.append(text)
+
+    agent.nim_client.stream_response = stream_response
+    query = MCPOperationsQuery(
+        intent="wave_creation", entities={}, context={}, user_query="Create a wave"
+    )
+
+    response = await agent._generate_response_with_tools(query, {}, None, on_text)
+
+    assert len(forwarded) > 1
+    assert "".join(forwarded) == response.natural_language == natural_language
+    assert response.response_type == "wave_creation"
+    agent.nim_client.generate_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_initialization_runs_once_and_restarts_after_failure():
+    """Concurrent callers share one initialize(); a failed run is retried later."""
+    agent = MCPOperationsCoordinationAgent()
+    agent.initialize = AsyncMock(side_effect=[RuntimeError("NIM unavailable"), None])
+
+    results = await asyncio.gather(
+        agent.ensure_initialized(), agent.ensure_initialized(), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert agent.initialize.await_count == 1
+
+    await agent.ensure_initialized()
+    await agent.ensure_initialized()
+    assert agent.initialize.await_count == 2
+
+
+def test_tool_results_are_compacted_for_the_prompt():
+    """Large lists and strings are trimmed; small values pass through unchanged."""
+    results = {
+        "t1": {"success": True, "result": {"tasks": list(range(500)), "note": "x" * 5000}},
+        "t2": {"success": True, "result": {"task_id": "T-1"}},
+    }
+
+    compact = compact_for_prompt(results)
+
+    assert compact["t1"]["result"]["tasks"] == [0, 1, 2, 3, 4, {"_truncated": True, "total": 500}]
+    assert len(compact["t1"]["result"]["note"]) < 2100
+    assert compact["t2"] == results["t2"]
+    assert len(results["t1"]["result"]["tasks"]) == 500
+
+
+def test_large_tool_results_are_detected_without_a_full_walk():
+    """The offload check stops counting at the limit and leaves small results inline."""
+    small = {"t1": {"success": True, "result": {"task_id": "T-1"}}}
+    large = {"t1": {"success": True, "result": {"tasks": list(range(100_000))}}}
+
+    assert not _exceeds_node_count(small, 2000)
+    assert _exceeds_node_count(large, 2000)
+
+    retrieved, actions = encode_prompt_results(["t1"], large)
+    assert retrieved == actions
+    assert '"total":100000' in actions
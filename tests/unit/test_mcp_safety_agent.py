@@ -0,0 +1,351 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the MCP safety & compliance agent.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.services.cache.embedding_store import EmbeddingStore
+from src.api.agents.safety.mcp_safety_agent import (
+    MCPSafetyComplianceAgent,
+    MCPSafetyQuery,
+    MCPSafetyResponse,
+    _PARSE_PROMPT_CACHE_KEY,
+)
+from src.api.utils.prompt_utils import encode_prompt_results
+
+
+def _agent(intent: str, tool_name: str, embedding=(1.0, 0.0)) -> MCPSafetyComplianceAgent:
+    agent = MCPSafetyComplianceAgent()
+    agent.nim_client = SimpleNamespace(embed_query=AsyncMock(return_value=list(embedding)))
+    agent.hybrid_retriever = agent.tool_discovery = object()
+    agent._parse_safety_query = AsyncMock(
+        side_effect=lambda query, context: MCPSafetyQuery(
+            intent=intent, entities={}, context={}, user_query=query
+        )
+    )
+    agent._discover_relevant_tools = AsyncMock(return_value=[])
+    agent._create_tool_execution_plan = AsyncMock(return_value=[])
+    agent._execute_tool_plan = AsyncMock(
+        return_value={"t1": {"tool_name": tool_name, "success": True, "result": {}}}
+    )
+    agent._generate_response_with_tools = AsyncMock(
+        side_effect=lambda parsed, results, chain: MCPSafetyResponse(
+            response_type="safety_info",
+            data={},
+            natural_language="answer",
+            recommendations=[],
+            confidence=0.9,
+            actions_taken=[],
+            mcp_tools_used=["t1"],
+            tool_execution_results=results,
+        )
+    )
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_restated_lookups_are_served_from_the_response_cache():
+    """Repeats and filler-only restatements skip tools and generation."""
+    agent = _agent("policy_lookup", "get_safety_procedures")
+
+    first = await agent.process_query("Show forklift procedures", session_id="s1")
+    repeat = await agent.process_query("please show forklift procedures", session_id="s1")
+    restated = await agent.process_query("What are the forklift procedures?", session_id="s1")
+
+    assert first == repeat == restated
+    assert repeat is not first and restated is not repeat
+    agent._generate_response_with_tools.assert_awaited_once()
+    agent._execute_tool_plan.assert_awaited_once()
+    session = agent.conversation_context.get("s1")
+    assert len(session["responses"]) == 3
+    assert [q.user_query for q in session["queries"]] == [
+        "Show forklift procedures",
+        "please show forklift procedures",
+        "What are the forklift procedures?",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_side_effects_and_identifiers_bypass_the_response_cache():
+    """Incident logging is never replayed, and different zones never share answers."""
+    agent = _agent("incident_reporting", "log_incident")
+    await agent.process_query("Report a spill in zone A")
+    await agent.process_query("Report a spill in zone A")
+    assert agent._execute_tool_plan.await_count == 2
+
+    agent = _agent("policy_lookup", "get_safety_procedures")
+    await agent.process_query("Show procedures for zone A")
+    await agent.process_query("Show procedures for zone B")
+    assert agent._generate_response_with_tools.await_count == 2
+
+    agent = _agent("policy_lookup", "get_safety_procedures")
+    await agent.process_query("Show procedures", context={"user": "u1"})
+    await agent.process_query("Show procedures", context={"user": "u1"})
+    assert agent._generate_response_with_tools.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_report_worded_like_a_cached_lookup_still_logs_the_incident():
+    """The cache is only consulted once the query is parsed as a read-only intent."""
+    agent = _agent("hazard_identification", "get_safety_procedures")
+    agent._parse_safety_query.side_effect = lambda query, context: MCPSafetyQuery(
+        intent="hazard_identification" if query.endswith("?") else "incident_reporting",
+        entities={},
+        context={},
+        user_query=query,
+    )
+
+    await agent.process_query("Is there a chemical spill hazard in zone A?")
+    agent._execute_tool_plan.return_value = {
+        "t1": {"tool_name": "log_incident", "success": True, "result": {}}
+    }
+    report = await agent.process_query("There is a chemical spill hazard in zone A")
+
+    assert agent._execute_tool_plan.await_count == 2
+    assert report.tool_execution_results["t1"]["tool_name"] == "log_incident"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_queries_share_one_initialization():
+    """Queries arriving before warm-up finishes wait on the same initialize()."""
+    agent = MCPSafetyComplianceAgent()
+    started = asyncio.Event()
+
+    async def initialize():
+        started.set()
+        await asyncio.sleep(0)
+        agent.nim_client = agent.hybrid_retriever = agent.tool_discovery = object()
+
+    agent.initialize = AsyncMock(side_effect=initialize)
+    warmup = agent.start_initialization()
+    await started.wait()
+
+    await asyncio.gather(agent.ensure_initialized(), agent.ensure_initialized())
+    await warmup
+    agent.initialize.assert_awaited_once()
+
+
+def _step(name):
+    return {"tool_id": name, "tool_name": name, "arguments": {}}
+
+
+@pytest.mark.asyncio
+async def test_failed_incident_log_does_not_block_the_alert():
+    """Plan steps run concurrently, and one failure never aborts the others."""
+    agent = MCPSafetyComplianceAgent()
+    all_started = asyncio.Barrier(3)
+
+    async def execute_tool(tool_id, arguments):
+        await asyncio.wait_for(all_started.wait(), timeout=1.0)
+        if tool_id == "log_incident":
+            raise RuntimeError("database unavailable")
+        return {"ok": True}
+
+    agent.tool_discovery = SimpleNamespace(execute_tool=execute_tool)
+    results = await agent._execute_tool_plan(
+        [_step("log_incident"), _step("get_safety_procedures"), _step("broadcast_alert")]
+    )
+
+    assert results["log_incident"]["success"] is False
+    assert results["get_safety_procedures"]["success"] is True
+    assert results["broadcast_alert"]["success"] is True
+
+
+@pytest.mark.asyncio
+async def test_parse_requests_schema_and_rejects_unknown_intents():
+    """The parse asks for the schema; replies outside it use the keyword fallback."""
+    agent = MCPSafetyComplianceAgent()
+    agent.nim_client = SimpleNamespace(
+        generate_response=AsyncMock(
+            return_value=SimpleNamespace(
+                content='```json\n{"intent": "hazard_identification", '
+                '"entities": {"location": "Dock D4"}}\n```'
+            )
+        )
+    )
+
+    parsed = await agent._parse_safety_query("Something odd happened near dock D4", None)
+    assert parsed.intent == "hazard_identification"
+    assert parsed.entities["location"] == "Dock D4"
+    format_ = agent.nim_client.generate_response.await_args.kwargs["response_format"]
+    assert "hazard_identification" in str(format_["json_schema"]["schema"])
+    cache_key = agent.nim_client.generate_response.await_args.kwargs["prompt_cache_key"]
+    assert cache_key == _PARSE_PROMPT_CACHE_KEY and len(cache_key) == 16
+
+    agent.nim_client.generate_response.return_value = SimpleNamespace(
+        content='{"intent": "incident_logging", "entities": {}}'
+    )
+    parsed = await agent._parse_safety_query("Something odd happened near dock D4", None)
+    assert parsed.intent == "incident_reporting"
+
+
+@pytest.mark.asyncio
+async def test_clear_read_only_queries_are_parsed_without_the_llm():
+    """Confident keyword classifications of read-only intents skip the parse LLM call."""
+    agent = MCPSafetyComplianceAgent()
+    agent.nim_client = SimpleNamespace(generate_response=AsyncMock())
+
+    lookup = await agent._parse_safety_query("Show the lockout procedures for Dock D2", None)
+    training = await agent._parse_safety_query("Who is missing forklift certification?", None)
+
+    assert lookup.intent == "policy_lookup"
+    assert lookup.entities["location"] == "Dock D2"
+    assert "intent" not in lookup.entities
+    assert training.intent == "training_tracking"
+    agent.nim_client.generate_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query",
+    [
+        "What is the emergency procedure for a chemical spill?",
+        "How do I report an injury?",
+        "What is the status of incident INC-42?",
+        "Report a chemical spill at Dock D2",
+    ],
+)
+async def test_incident_like_queries_are_never_resolved_locally(query):
+    """Incident reporting has side effects, so only the LLM parse may choose it."""
+    agent = MCPSafetyComplianceAgent()
+    agent.nim_client = SimpleNamespace(
+        generate_response=AsyncMock(
+            return_value=SimpleNamespace(content='{"intent": "policy_lookup", "entities": {}}')
+        )
+    )
+
+    parsed = await agent._parse_safety_query(query, None)
+
+    agent.nim_client.generate_response.assert_awaited_once()
+    assert parsed.intent == "policy_lookup"
+
+
+def _tool(name, description):
+    return SimpleNamespace(
+        tool_id=name, name=name, description=description, capabilities=[],
+        usage_count=0, success_rate=0.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_tools_are_ranked_by_embedding_similarity(tmp_path):
+    """The catalog is embedded once and ranked against each query embedding."""
+    tools = [
+        _tool("log_incident", "Log a safety incident"),
+        _tool("broadcast_alert", "Broadcast a safety alert"),
+        _tool("get_safety_procedures", "Get safety procedures"),
+    ]
+    vectors = {"log_incident": [1.0, 0.0, 0.0], "broadcast_alert": [0.0, 1.0, 0.0],
+               "get_safety_procedures": [0.0, 0.0, 1.0]}
+
+    async def generate_embeddings(texts, input_type="query"):
+        return SimpleNamespace(embeddings=[vectors[t.split(":")[0]] for t in texts])
+
+    agent = MCPSafetyComplianceAgent()
+    agent._embedding_store = EmbeddingStore(str(tmp_path / "embeddings.sqlite3"))
+    agent.nim_client = SimpleNamespace(
+        config=SimpleNamespace(embedding_model="test-embed"),
+        generate_embeddings=AsyncMock(side_effect=generate_embeddings),
+        embed_query=AsyncMock(return_value=[0.1, 0.9, 0.3]),
+    )
+    agent.tool_discovery = SimpleNamespace(
+        get_all_tools=lambda: tools,
+        get_tools_by_category=AsyncMock(return_value=[tools[0]]),
+        search_tools=AsyncMock(return_value=[]),
+    )
+    query = MCPSafetyQuery(
+        intent="incident_reporting", entities={}, context={}, user_query="Alert everyone"
+    )
+
+    ranked = await agent._discover_relevant_tools(query)
+    again = await agent._discover_relevant_tools(query, [0.9, 0.1, 0.0])
+
+    assert [t.name for t in ranked] == ["broadcast_alert", "get_safety_procedures", "log_incident"]
+    assert again[0].name == "log_incident"
+    agent.nim_client.generate_embeddings.assert_awaited_once()
+    agent.tool_discovery.search_tools.assert_not_awaited()
+
+    agent.nim_client.embed_query.side_effect = RuntimeError("embedding service down")
+    await agent._discover_relevant_tools(query)
+    agent.tool_discovery.search_tools.assert_awaited()
+
+    # A restarted agent loads the tool embeddings from disk instead of re-embedding
+    restarted = MCPSafetyComplianceAgent()
+    restarted._embedding_store = agent._embedding_store
+    restarted.nim_client = SimpleNamespace(
+        config=SimpleNamespace(embedding_model="test-embed"),
+        generate_embeddings=AsyncMock(side_effect=generate_embeddings),
+        embed_query=AsyncMock(return_value=[0.1, 0.9, 0.3]),
+    )
+    restarted.tool_discovery = agent.tool_discovery
+    ranked = await restarted._discover_relevant_tools(query)
+    assert ranked[0].name == "broadcast_alert"
+    restarted.nim_client.generate_embeddings.assert_not_awaited()
+
+
+def test_large_tool_results_are_trimmed_for_the_prompt():
+    """Long documents and lists are cut; the successful subset is encoded too."""
+    results = {
+        "sds": {"success": True, "result": {"text": "x" * 5000, "sections": list(range(20))}},
+        "alert": {"success": False, "error": "timeout"},
+    }
+
+    retrieved, everything = encode_prompt_results(["sds"], results)
+
+    assert len(retrieved) < 2500
+    assert "...[truncated]" in retrieved and '"total":20' in retrieved
+    assert "alert" not in retrieved and "timeout" in everything
+    assert len(results["sds"]["result"]["text"]) == 5000
+
+
+@pytest.mark.asyncio
+async def test_session_history_is_bounded():
+    """Each session keeps only its newest turns."""
+    agent = _agent("incident_reporting", "log_incident")
+
+    for i in range(30):
+        await agent.process_query(f"Report spill number {i}", session_id="s1")
+
+    responses = agent.conversation_context.get("s1")["responses"]
+    assert len(responses) == 20
+    assert len(agent.conversation_context) == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_queries_share_one_run():
+    """A double submit in one session runs the tools once; other sessions run their own."""
+    agent = _agent("incident_reporting", "log_incident")
+
+    first, second, other = await asyncio.gather(
+        agent.process_query("Report a fire at Dock D2", session_id="s1"),
+        agent.process_query("Report a fire at Dock D2", session_id="s1"),
+        agent.process_query("Report a fire at Dock D2", session_id="s2"),
+    )
+
+    assert first is second and first is not other
+    assert agent._execute_tool_plan.await_count == 2
+    assert not agent._inflight_queries
@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for NIMClient embedding micro-batching and chat request handling.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.services.llm.nim_client import EmbeddingResponse, NIMClient, NIMConfig
+
+
+def _client(batch_size: int = 16) -> NIMClient:
+    config = NIMConfig(
+        llm_api_key="test",
+        embedding_batch_size=batch_size,
+        embedding_batch_window_ms=5,
+    )
+    client = NIMClient(config, enable_cache=False)
+    client.generate_embeddings = AsyncMock(
+        side_effect=lambda texts: EmbeddingResponse(
+            embeddings=[[float(len(t))] for t in texts], usage={}, model="test"
+        )
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_one_embedding_call():
+    """Queries inside the batch window are embedded with a single request."""
+    client = _client()
+    vectors = await asyncio.gather(
+        client.embed_query("a"), client.embed_query("bb"), client.embed_query("ccc")
+    )
+
+    assert vectors == [[1.0], [2.0], [3.0]]
+    client.generate_embeddings.assert_awaited_once_with(["a", "bb", "ccc"])
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_and_errors_reach_every_caller():
+    """A full batch is sent immediately; a failed call fails each waiter."""
+    client = _client(batch_size=2)
+    client.generate_embeddings.side_effect = RuntimeError("embedding service down")
+
+    results = await asyncio.gather(
+        client.embed_query("a"), client.embed_query("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    client.generate_embeddings.assert_awaited_once()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_short_or_cancelled_batches_fail_every_unresolved_caller():
+    """Callers never hang when vectors are missing or the batch task is cancelled."""
+    client = _client(batch_size=2)
+    client.generate_embeddings.side_effect = lambda texts: EmbeddingResponse(
+        embeddings=[[1.0]], usage={}, model="test"
+    )
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            client.embed_query("a"), client.embed_query("b"), return_exceptions=True
+        ),
+        timeout=1,
+    )
+    assert results[0] == [1.0]
+    assert isinstance(results[1], RuntimeError)
+
+    started = asyncio.Event()
+
+    async def hang(texts):
+        started.set()
+        await asyncio.Event().wait()
+
+    client.generate_embeddings.side_effect = hang
+    callers = [asyncio.ensure_future(client.embed_query(t)) for t in ("c", "d")]
+    await started.wait()
+    for task in list(client._embedding_batch_tasks):
+        task.cancel()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*callers, return_exceptions=True), timeout=1
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_generations_share_one_request():
+    """Identical in-flight chat requests are sent once; different ones are not merged."""
+    client = _client()
+
+    async def generate(messages, *args):
+        await asyncio.sleep(0.01)
+        return messages[0]["content"]
+
+    client._generate_response = AsyncMock(side_effect=generate)
+    same = [{"role": "user", "content": "status"}]
+    other = [{"role": "user", "content": "kpis"}]
+
+    results = await asyncio.gather(
+        client.generate_response(same),
+        client.generate_response(same),
+        client.generate_response(other),
+    )
+
+    assert results == ["status", "status", "kpis"]
+    assert client._generate_response.await_count == 2
+    assert client._inflight_generations == {}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_response_format_is_sent_only_when_enabled():
+    """Callers may always pass response_format; config decides whether it is sent."""
+    reply = MagicMock()
+    reply.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
+    schema = {"type": "json_schema", "json_schema": {"name": "q", "schema": {}}}
+
+    for enabled in (False, True):
+        client = _client()
+        client.config.structured_output_enabled = enabled
+        client.llm_client.post = AsyncMock(return_value=reply)
+
+        await client.generate_response(
+            [{"role": "user", "content": "hi"}], response_format=schema
+        )
+
+        payload = client.llm_client.post.await_args.kwargs["json"]
+        assert ("response_format" in payload) is enabled
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_extraction_model_routing():
+    """model="extraction" uses the extraction model, falling back to the main model."""
+    reply = MagicMock()
+    reply.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
+
+    for extraction_model, expected in (("small-model", "small-model"), ("", "main-model")):
+        client = _client()
+        client.config.llm_model = "main-model"
+        client.config.llm_extraction_model = extraction_model
+        client.llm_client.post = AsyncMock(return_value=reply)
+
+        response = await client.generate_response(
+            [{"role": "user", "content": "hi"}], model="extraction"
+        )
+
+        assert client.llm_client.post.await_args.kwargs["json"]["model"] == expected
+        assert response.model == expected
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_prompt_cache_key_is_sent_as_header():
+    """A prompt cache key is forwarded as a header and omitted when not given."""
+    reply = MagicMock()
+    reply.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
+    client = _client()
+    client.llm_client.post = AsyncMock(return_value=reply)
+
+    await client.generate_response([{"role": "user", "content": "a"}], prompt_cache_key="abc")
+    assert client.llm_client.post.await_args.kwargs["headers"] == {"X-Prompt-Cache-Key": "abc"}
+
+    await client.generate_response([{"role": "user", "content": "b"}])
+    assert client.llm_client.post.await_args.kwargs["headers"] is None
+    await client.close()
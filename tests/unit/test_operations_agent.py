@@ -0,0 +1,417 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the operations coordination agent.
+"""
+
+import asyncio
+import os
+import sys
+from dataclasses import asdict
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.agents.operations.operations_agent import (
+    OperationsCoordinationAgent,
+    OperationsQuery,
+    _parse_llm_json,
+)
+from src.api.services.agent_config import load_agent_config
+from src.api.utils.prompt_utils import query_identifiers
+from src.retrieval.structured.task_queries import Task
+
+
+def _agent(intent: str = "kpi") -> OperationsCoordinationAgent:
+    replies = {
+        0.1: f'{{"intent": "{intent}", "entities": {{}}, "context": {{}}}}',
+        0.2: '{"response_type": "kpi_report", "natural_language": "Throughput is on target."}',
+    }
+
+    async def generate_response(messages, temperature=None, **kwargs):
+        return SimpleNamespace(content=replies[temperature])
+
+    agent = OperationsCoordinationAgent()
+    agent.nim_client = SimpleNamespace(
+        generate_response=AsyncMock(side_effect=generate_response),
+        embed_query=AsyncMock(return_value=[1.0, 0.0]),
+    )
+    agent.hybrid_retriever = object()
+    agent._initialized = True
+    agent.config = SimpleNamespace(
+        persona=SimpleNamespace(
+            system_prompt="",
+            understanding_prompt="{query} {context}",
+            response_prompt="{user_query}",
+        )
+    )
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_repeated_read_only_queries_are_served_from_cache():
+    """Exact repeats skip both LLM calls; restatements skip the response call."""
+    agent = _agent()
+
+    first = await agent.process_query("Show KPIs", session_id="s1")
+    repeat = await agent.process_query("Show KPIs", session_id="s2")
+    restated = await agent.process_query("Show me the KPIs", session_id="s3")
+
+    assert first is repeat is restated
+    # Restatements resolve their intent before the semantic cache is consulted
+    assert agent.nim_client.generate_response.await_count == 3
+    history = agent.conversation_context.get("s3")["history"]
+    assert [turn["query"] for turn in history] == ["Show me the KPIs"]
+
+
+@pytest.mark.asyncio
+async def test_cached_responses_respect_context_chain_and_action_intents():
+    """A follow-up in a different conversation thread, or an action, is not replayed."""
+    agent = _agent()
+    await agent.process_query("Show KPIs", session_id="s1")
+    await agent.process_query("Show KPIs", session_id="s1")
+    assert agent.nim_client.generate_response.await_count == 4
+
+    agent = _agent(intent="publish_kpis")
+    await agent.process_query("Publish KPIs", session_id="s1")
+    await agent.process_query("Publish KPIs", session_id="s2")
+    # The parse is reused, but the action's response is regenerated
+    assert agent.nim_client.generate_response.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_unambiguous_read_only_queries_skip_the_understanding_call():
+    """A clear keyword match on a read-only intent needs only the response call."""
+    agent = _agent()
+
+    local = await agent._understand_query("Show equipment status", "s1", None)
+    ambiguous = await agent._understand_query("Show shift tasks", "s1", None)
+    with_ids = await agent._understand_query("Show equipment in zone B", "s1", None)
+
+    assert local.intent == "equipment"
+    assert ambiguous.intent == with_ids.intent == "kpi"  # from the LLM reply
+    assert agent.nim_client.generate_response.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_task_retrievals_run_concurrently():
+    """Task summary and task list queries overlap; equipment skips the summary."""
+    agent = OperationsCoordinationAgent()
+    started = []
+
+    async def query(name, result):
+        started.append(name)
+        # Each query only finishes once both have started
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        return result
+
+    task = Task(
+        id=1, kind="pick", status="pending", assignee=None, payload={},
+        created_at="", updated_at="",
+    )
+    agent.task_queries = SimpleNamespace(
+        get_task_summary=lambda: query("summary", {"total_tasks": 1}),
+        get_tasks_by_statuses=lambda statuses, limit: query(
+            "tasks", {"pending": [task], "in_progress": []}
+        ),
+    )
+
+    data = await asyncio.wait_for(
+        agent._retrieve_operations_data(
+            OperationsQuery("task_management", {}, {}, "Show pending tasks")
+        ),
+        timeout=1.0,
+    )
+
+    assert data["task_summary"] == {"total_tasks": 1}
+    assert data["pending_tasks"][0] == asdict(task)
+    assert data["in_progress_tasks"] == []
+    assert set(data) == {"task_summary", "pending_tasks", "in_progress_tasks"}
+
+    agent.telemetry_queries = SimpleNamespace(
+        get_equipment_health_status=AsyncMock(return_value=[{"status": "ok"}])
+    )
+    agent.task_queries = SimpleNamespace(get_task_summary=AsyncMock())
+    data = await agent._retrieve_operations_data(
+        OperationsQuery("equipment", {}, {}, "Show equipment health")
+    )
+    assert data == {"equipment_health": [{"status": "ok"}]}
+    agent.task_queries.get_task_summary.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_system_message_is_identical_across_queries():
+    """Static prompt text sits in the system message; per-query text comes last."""
+    agent = _agent(intent="pick_wave")
+    agent.config = load_agent_config("operations")
+
+    await agent._understand_query("Create a wave for orders ORD001, ORD002", "s1", None)
+    await agent._understand_query("Create a wave for orders ORD003", "s2", None)
+
+    first, second = [
+        call.args[0] for call in agent.nim_client.generate_response.await_args_list
+    ]
+    assert first[0] == second[0]
+    assert "Respond in JSON format" in first[0]["content"]
+    assert first[1]["content"].startswith('User Query: "Create a wave for orders ORD001')
+
+
+@pytest.mark.asyncio
+async def test_history_keeps_the_newest_turns():
+    """Session history is bounded and returned as a plain list."""
+    agent = _agent()
+    response = SimpleNamespace(response_type="kpi_report")
+
+    for i in range(15):
+        agent._update_context("s1", OperationsQuery("kpi", {}, {}, f"q{i}"), response)
+
+    context = await agent.get_conversation_context("s1")
+    assert [turn["query"] for turn in context["history"]] == [f"q{i}" for i in range(5, 15)]
+    assert isinstance(context["history"], list)
+    assert datetime.fromisoformat(context["history"][0]["timestamp"])
+    assert "q14" in agent._build_context_string(agent.conversation_context.get("s1")["history"], None)
+
+
+def test_llm_json_is_recovered_from_fences_and_prose():
+    """Fenced or prefaced replies parse; replies without JSON still raise."""
+    assert _parse_llm_json('```json\n{"intent": "kpi"}\n```') == {"intent": "kpi"}
+    assert _parse_llm_json('Sure! {"intent": "kpi"} Hope that helps.') == {"intent": "kpi"}
+    with pytest.raises(ValueError):
+        _parse_llm_json("I could not parse that query.")
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_queries_share_one_run():
+    """A duplicate submit in the same session waits for the first run."""
+    agent = _agent(intent="publish_kpis")
+
+    first, second, other = await asyncio.gather(
+        agent.process_query("Publish KPIs", session_id="s1"),
+        agent.process_query("Publish KPIs", session_id="s1"),
+        agent.process_query("Publish KPIs", session_id="s2"),
+    )
+
+    assert first is second
+    assert other is not first
+    assert len(agent.conversation_context.get("s1")["history"]) == 1
+    assert not agent._inflight_queries
+
+
+def test_simulated_workforce_is_built_and_rendered_once():
+    """Workforce queries share one data dict and its pre-rendered prompt block."""
+    agent = _agent()
+    workforce = agent._simulate_workforce_data()
+
+    assert workforce is agent._simulate_workforce_data()
+    context = agent._build_retrieved_context({"workforce_info": workforce})
+    assert "- Total Active Workers: 6" in context
+    assert "Amy Chen" in context
+
+
+def test_retrieved_context_is_compact_and_bounded():
+    """Large retrieved lists are trimmed and rendered as JSON, not Python repr."""
+    agent = _agent()
+    health = [{"equipment_id": f"FL-{i:03d}", "status": "ok", "note": "x" * 500} for i in range(200)]
+
+    context = agent._build_retrieved_context({"equipment_health": health})
+
+    assert context.startswith('Equipment Health: [{"equipment_id":"FL-000"')
+    assert "FL-199" not in context
+    assert len(context) < 2100
+
+    history = [{"query": "Show KPIs", "intent": "kpi", "response_type": "kpi_report",
+                "timestamp": "2025-01-01T00:00:00"}]
+    rendered = agent._build_context_string(history, {"zone": "A"})
+    assert "timestamp" not in rendered
+    assert rendered.endswith('Additional context: {"zone":"A"}')
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_requests_initialize_once(monkeypatch):
+    """Racing cold-start callers share one initialization."""
+    import src.api.agents.operations.operations_agent as module
+
+    calls = []
+
+    async def get_nim_client():
+        calls.append("nim")
+        await asyncio.sleep(0)
+        return SimpleNamespace()
+
+    async def get_none():
+        return None
+
+    monkeypatch.setattr(module, "get_nim_client", get_nim_client)
+    monkeypatch.setattr(module, "get_hybrid_retriever", get_none)
+    monkeypatch.setattr(module, "get_operations_action_tools", get_none)
+    monkeypatch.setattr(
+        "src.retrieval.structured.sql_retriever.get_sql_retriever", get_none
+    )
+
+    agent = OperationsCoordinationAgent()
+    await asyncio.gather(agent.initialize(), agent.initialize(), agent.initialize())
+
+    assert calls == ["nim"]
+    assert agent._initialized
+
+
+def test_fallback_intent_matches_whole_words():
+    """Keywords match query tokens, and multi-word phrases still match."""
+    agent = OperationsCoordinationAgent()
+
+    assert agent._fallback_intent_detection("Show the dock appointments").intent == "dock_scheduling"
+    assert agent._fallback_intent_detection("How many are on site?").intent == "workforce"
+    # "work" is no longer found inside "network"
+    assert agent._fallback_intent_detection("network status").intent == "general"
+
+
+@pytest.mark.parametrize(
+    "query,intent",
+    [
+        ("show shifts for tomorrow", "workforce"),
+        ("list employees on site", "workforce"),
+        ("list routes for today", "optimize_paths"),
+        ("which orders got assigned", "task_assignment"),
+        ("show open jobs", "task_management"),
+        ("count the picks", "task_management"),
+    ],
+)
+def test_fallback_intent_matches_plural_and_inflected_keywords(query, intent):
+    """Plural and inflected forms of a keyword select the same bucket."""
+    agent = _agent()
+    assert agent._fallback_intent_detection(query).intent == intent
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_expire():
+    """Session context is dropped once idle past the TTL, and can be cleared."""
+    agent = _agent("workforce")
+    agent.conversation_context.ttl_seconds = 0.05
+
+    await agent.process_query("who is on shift?", session_id="idle")
+    assert agent.conversation_context.get("idle") is not None
+
+    await asyncio.sleep(0.1)
+    assert agent.conversation_context.get("idle") is None
+    assert (await agent.get_conversation_context("idle"))["history"] == []
+
+    await agent.process_query("who is on shift?", session_id="cleared")
+    await agent.clear_conversation_context("cleared")
+    assert len(agent.conversation_context) == 0
+
+
+@pytest.mark.asyncio
+async def test_natural_language_is_streamed_to_on_text():
+    """With on_text, natural-language text is forwarded while the reply streams."""
+    agent = _agent()
+    chunks = ['{"response_type": "kpi_report", "natural_lang', 'uage": "Through', 'put is on target."}']
+
+    async def stream_response(messages, temperature=None, **kwargs):
+        for chunk in chunks:
+            yield chunk
+
+    agent.nim_client.stream_response = stream_response
+    received = []
+
+    async def on_text(text):
+        received.append(text)
+
+    response = await agent.process_query("Show KPIs", session_id="s1", on_text=on_text)
+
+    assert received == ["Through", "put is on target."]
+    assert response.natural_language == "Throughput is on target."
+    assert response.response_type == "kpi_report"
+    # Only the intent call went through the non-streaming path
+    assert agent.nim_client.generate_response.await_count == 1
+
+    received.clear()
+    await agent.process_query("Show KPIs", session_id="s2", on_text=on_text)
+    assert received == ["Throughput is on target."]
+
+
+def test_query_and_response_are_immutable():
+    """Cached OperationsQuery/OperationsResponse instances cannot be mutated."""
+    from dataclasses import FrozenInstanceError
+
+    query = OperationsQuery(intent="kpi", entities={}, context={}, user_query="Show KPIs")
+
+    with pytest.raises(FrozenInstanceError):
+        query.intent = "workforce"
+    assert not hasattr(query, "__dict__")
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_carry_stable_prompt_cache_key():
+    """Both LLM calls send a prompt ID that only depends on the system prompt."""
+    agent = _agent()
+
+    await agent.process_query("Show KPIs", session_id="s1")
+    await agent.process_query("Show workforce KPIs for zone A", session_id="s2")
+
+    keys = {
+        call.kwargs["prompt_cache_key"]
+        for call in agent.nim_client.generate_response.await_args_list
+    }
+    assert len(keys) == 1 and len(keys.pop()) == 16
+
+
+def test_retrieved_tasks_render_as_compact_table():
+    """Task lists reach the prompt as one pipe-delimited row per task."""
+    agent = OperationsCoordinationAgent()
+    tasks = [
+        {"id": i, "kind": "pick", "status": "pending", "assignee": None, "payload": {"priority": "high"}}
+        for i in range(5)
+    ]
+
+    context = agent._build_retrieved_context({"pending_tasks": tasks})
+
+    assert "Pending Tasks (5):\nid|kind|priority|assignee\n0|pick|high|-\n" in context
+    assert "2|pick|high|-\n... and 2 more" in context
+    assert "3|pick" not in context
+
+
+def test_query_identifiers_ignore_articles_and_pronouns():
+    """Single letters only count as identifiers after a location word."""
+    assert query_identifiers("Can I get a list of open tasks") == frozenset()
+    assert query_identifiers("Show tasks in Zone A") == frozenset({"zone a"})
+    assert query_identifiers("Is dock b free for T12") == frozenset({"dock b", "t12"})
+
+
+@pytest.mark.asyncio
+async def test_paraphrased_action_is_not_served_from_the_semantic_cache():
+    """An action query close to a cached lookup still runs its action tools."""
+    agent = _agent("workload_rebalance")
+    agent._understand_query = AsyncMock(
+        side_effect=lambda query, session_id, context: OperationsQuery(
+            intent="task_management" if query.endswith("?") else "workload_rebalance",
+            entities={},
+            context={},
+            user_query=query,
+        )
+    )
+    agent._execute_action_tools = AsyncMock(return_value=[])
+
+    await agent.process_query("How is the workload balanced?", session_id="s1")
+    await agent.process_query("Rebalance the workload", session_id="s2")
+
+    assert agent._execute_action_tools.await_args.args[0].intent == "workload_rebalance"
+    assert agent.nim_client.embed_query.await_count == 1
@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the in-memory semantic cache.
+"""
+
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.services.cache.semantic_cache import SemanticCache
+
+
+def test_lookup_matches_similar_embedding():
+    """A near-identical embedding returns the cached value."""
+    cache = SemanticCache(similarity_threshold=0.9)
+    cache.store([1.0, 0.0, 0.0], "forklift status")
+    assert cache.lookup([0.99, 0.05, 0.0]) == "forklift status"
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+
+
+def test_partitions_and_expiry_are_respected():
+    """Entries never match across partitions and vanish after their TTL."""
+    cache = SemanticCache(ttl_seconds=60.0)
+    cache.store([1.0, 0.0], "a", partition="equipment")
+    assert cache.lookup([1.0, 0.0], partition="safety") is None
+    assert cache.lookup([1.0, 0.0], partition="equipment") == "a"
+
+    cache.store([0.0, 1.0], "b", ttl_seconds=0.0)
+    assert cache.lookup([0.0, 1.0]) is None
+
+
+def test_oldest_entries_are_dropped_when_full():
+    """The cache keeps at most max_entries per partition."""
+    cache = SemanticCache(max_entries=2)
+    cache.store([1.0, 0.0, 0.0], "first")
+    cache.store([0.0, 1.0, 0.0], "second")
+    cache.store([0.0, 0.0, 1.0], "third")
+    assert len(cache) == 2
+    assert cache.lookup([1.0, 0.0, 0.0]) is None
+    assert cache.lookup([0.0, 0.0, 1.0]) == "third"
+
+
+def test_stalest_partition_is_dropped_when_too_many():
+    """The number of partitions is bounded as well as their size."""
+    cache = SemanticCache(max_partitions=2)
+    cache.store([1.0, 0.0], "a", partition="FL-01")
+    cache.store([1.0, 0.0], "b", partition="FL-02")
+    cache.store([1.0, 0.0], "c", partition="FL-03")
+    assert cache.lookup([1.0, 0.0], partition="FL-01") is None
+    assert cache.lookup([1.0, 0.0], partition="FL-03") == "c"
+
+
+def test_entries_survive_growth_and_wraparound():
+    """Rows keep their values as storage grows and then recycles the oldest slots."""
+    cache = SemanticCache(max_entries=16)
+    for i in range(20):
+        vector = [0.0] * 20
+        vector[i] = 1.0
+        cache.store(vector, i)
+
+    assert len(cache) == 16
+    for i in range(20):
+        vector = [0.0] * 20
+        vector[i] = 1.0
+        assert cache.lookup(vector) == (i if i >= 4 else None)
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the session history store's in-memory fallback.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.services.memory.session_history_store import SessionHistoryStore
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded_and_returned_oldest_first():
+    """Only the newest max_turns are kept; get_recent returns them in order."""
+    store = SessionHistoryStore("test", max_turns=3)
+    for i in range(5):
+        await store.append("session", {"query": f"q{i}"})
+
+    assert await store.get_recent("session", 10) == [
+        {"query": "q2"},
+        {"query": "q3"},
+        {"query": "q4"},
+    ]
+    assert await store.get_recent("session", 2) == [{"query": "q3"}, {"query": "q4"}]
+
+
+@pytest.mark.asyncio
+async def test_clear_drops_only_that_session():
+    """Clearing one session leaves other sessions untouched."""
+    store = SessionHistoryStore("test")
+    await store.append("a", {"query": "first"})
+    await store.append("b", {"query": "second"})
+
+    await store.clear("a")
+
+    assert await store.get_recent("a", 3) == []
+    assert await store.get_recent("b", 3) == [{"query": "second"}]
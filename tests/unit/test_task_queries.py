@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for task queries.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.retrieval.structured.task_queries import TaskQueries
+
+
+def _row(task_id: int, status: str) -> dict:
+    return {
+        "id": task_id, "kind": "pick", "status": status, "assignee": None,
+        "payload": {}, "created_at": "t", "updated_at": "t",
+    }
+
+
+@pytest.mark.asyncio
+async def test_tasks_for_several_statuses_use_one_query():
+    """Rows from one ANY($1) query are grouped per requested status."""
+    sql_retriever = AsyncMock()
+    sql_retriever.execute_query.return_value = [_row(1, "pending"), _row(2, "in_progress"), _row(3, "pending")]
+
+    tasks = await TaskQueries(sql_retriever).get_tasks_by_statuses(
+        ("pending", "in_progress", "blocked"), limit=20
+    )
+
+    assert [task.id for task in tasks["pending"]] == [1, 3]
+    assert [task.id for task in tasks["in_progress"]] == [2]
+    assert tasks["blocked"] == []
+    sql_retriever.execute_query.assert_awaited_once()
+    query, params = sql_retriever.execute_query.await_args.args
+    assert "ANY($1)" in query
+    assert params == (["pending", "in_progress", "blocked"], 20)
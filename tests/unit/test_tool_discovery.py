@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the MCP tool discovery service.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.services.mcp.tool_discovery import (
+    DiscoveredTool,
+    ToolCategory,
+    ToolDiscoveryService,
+)
+
+
+def _tool(name: str) -> DiscoveredTool:
+    return DiscoveredTool(
+        name=name,
+        description=f"Get {name} details",
+        category=ToolCategory.OPERATIONS,
+        source="operations_action_tools",
+        source_type="mcp_adapter",
+        parameters={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_all_tools_snapshot_is_reused_until_tools_change():
+    """get_all_tools() returns the same list until a tool is added."""
+    service = ToolDiscoveryService()
+    await service._register_discovered_tool(_tool("get_workforce_status"))
+
+    first = service.get_all_tools()
+    assert [t.name for t in first] == ["get_workforce_status"]
+    assert service.get_all_tools() is first
+
+    await service._register_discovered_tool(_tool("get_task_status"))
+    assert len(service.get_all_tools()) == 2
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Unit tests for the in-memory TTL cache.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.api.services.cache.ttl_cache import TTLCache
+
+
+def test_get_returns_default_after_expiry():
+    """Entries are dropped once their TTL has elapsed."""
+    cache = TTLCache(ttl_seconds=0.0)
+    cache.set("sku", 1)
+    assert cache.get("sku") is None
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used():
+    """The oldest untouched entry is evicted when the cache is full."""
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate_where_drops_matching_keys():
+    """Only entries whose key satisfies the predicate are dropped."""
+    cache = TTLCache(ttl_seconds=60)
+    cache.set(("a", 1), 1)
+    cache.set(("a", 2), 2)
+    cache.set(("b", 1), 3)
+
+    cache.invalidate_where(lambda key: key[0] == "a")
+
+    assert len(cache) == 1
+    assert cache.get(("b", 1)) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses():
+    """Concurrent misses on the same key share one loader call."""
+    cache = TTLCache(ttl_seconds=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+    assert results == ["value"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_failures():
+    """Loader errors propagate and leave the key uncached."""
+    cache = TTLCache(ttl_seconds=60)
+
+    async def failing_loader():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_load("k", failing_loader)
+    assert cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_survives_first_caller_cancellation():
+    """Cancelling the first caller does not cancel the load for other waiters."""
+    cache = TTLCache(ttl_seconds=60)
+    release = asyncio.Event()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(cache.get_or_load("k", loader))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(cache.get_or_load("k", loader))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    release.set()
+    assert await second == "value"
+    assert cache.get("k") == "value"
+    assert calls == 1